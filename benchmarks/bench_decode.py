@@ -0,0 +1,155 @@
+"""Benchmark decoding register values per entity against decoding per block.
+
+Stores random polls of the read plan of all numeric entities in a register
+snapshot and updates the native value of the entities after each poll. Entities
+either decode their own register, as they did before, or read the value the
+snapshot decoded along with the whole block when the poll was stored. Both
+include the time to store the polls.
+
+Run from the repository root in an environment with Home Assistant installed:
+
+    python benchmarks/bench_decode.py --units 10
+"""
+
+import argparse
+from pathlib import Path
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.clivet.register_map import REGISTERS  # noqa: E402
+from custom_components.clivet.registers import (  # noqa: E402
+    NO_VALUE,
+    RegisterSnapshot,
+    build_read_plan,
+)
+
+# Updates of the coordinator per minute
+UPDATES_PER_MINUTE = 6
+
+# Part of the registers the device reports as missing
+MISSING_RATIO = 0.02
+
+
+class Coordinator:
+    data: RegisterSnapshot
+
+
+class EntityDecode:
+    """Numeric entity decoding its register on every update, as before."""
+
+    def __init__(self, coordinator: Coordinator, address: int, encoding) -> None:
+        self.coordinator = coordinator
+        self.address = address
+        self.scale, self.signed = encoding
+
+    @staticmethod
+    def decode_number(register: int | None, scale: float, signed: bool):
+        if register is None or register == NO_VALUE:
+            return None
+        if signed and register >= 0x8000:
+            register -= 0x10000
+        if scale != 1:
+            return register * scale
+        return register
+
+    def decode_numeric_value(self, register: int | None):
+        return self.decode_number(
+            register=register, scale=self.scale, signed=self.signed
+        )
+
+    def update(self) -> None:
+        data = self.coordinator.data.get(self.address)
+        self.native_value = (
+            self.decode_numeric_value(data) if data is not None else None
+        )
+
+
+class BlockDecode(EntityDecode):
+    """Numeric entity reading the value decoded with the whole block."""
+
+    def update(self) -> None:
+        self.native_value = self.coordinator.data.decoded.get(self.address)
+
+
+def run(coordinator: Coordinator, polls, entities) -> tuple[float, float]:
+    """Store each poll and update all entities, return the time spent on each."""
+    store = update = 0.0
+    for poll in polls:
+        snapshot = coordinator.data
+        start = time.perf_counter()
+        for address, values in poll:
+            snapshot.update_block(address, values, 0.0)
+        stored = time.perf_counter()
+        for entity in entities:
+            entity.update()
+        store += stored - start
+        update += time.perf_counter() - stored
+    return store, update
+
+
+def random_poll(blocks) -> list[tuple[int, list[int]]]:
+    return [
+        (
+            block.address,
+            [
+                NO_VALUE
+                if random.random() < MISSING_RATIO
+                else random.randrange(0x10000)
+                for _ in range(block.count)
+            ],
+        )
+        for block in blocks
+    ]
+
+
+def main(units: int, polls: int, repeat: int) -> None:
+    encodings = REGISTERS.encodings
+    blocks = build_read_plan(
+        encodings, max_gap=10, max_count=100, tiers=REGISTERS.tiers
+    )
+    random.seed(0)
+    poll_values = [random_poll(blocks) for _ in range(polls)]
+
+    print(f"{units} unit(s), {len(encodings) * units} numeric entities, {polls} polls")
+    print(
+        f"{'decode':>8} {'store':>10} {'update':>10} {'total':>10} {'per minute':>12}"
+    )
+    totals = {}
+    for name, entity_class, snapshot_encodings in (
+        ("entity", EntityDecode, {}),
+        ("block", BlockDecode, encodings),
+    ):
+        durations = []
+        for _ in range(repeat):
+            store = update = 0.0
+            for _ in range(units):
+                coordinator = Coordinator()
+                coordinator.data = RegisterSnapshot(snapshot_encodings)
+                entities = [
+                    entity_class(coordinator, address, encoding)
+                    for address, encoding in encodings.items()
+                ]
+                unit_store, unit_update = run(coordinator, poll_values, entities)
+                store += unit_store
+                update += unit_update
+            durations.append((store + update, store, update))
+        total, store, update = min(durations)
+        totals[name] = total
+        print(
+            f"{name:>8} {store / polls * 1e6:>8.1f}us {update / polls * 1e6:>8.1f}us "
+            f"{total / polls * 1e6:>8.1f}us "
+            f"{total / polls * UPDATES_PER_MINUTE * 1000:>10.2f}ms"
+        )
+    print(f"Speedup: {totals['entity'] / totals['block']:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--units", type=int, default=1)
+    parser.add_argument("--polls", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.units, args.polls, args.repeat)
@@ -0,0 +1,141 @@
+"""Benchmark sequential against pipelined block reads.
+
+Starts a local Modbus TCP server that delays every response to simulate the
+round trip through a network gateway, then measures the refresh cycle time of
+the coordinator for several pipeline depths.
+
+Run from the repository root in an environment with Home Assistant installed:
+
+    python benchmarks/bench_pipelined_reads.py --latency 0.03
+"""
+
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+from types import MappingProxyType
+
+from pymodbus.datastore import (
+    ModbusDeviceContext,
+    ModbusSequentialDataBlock,
+    ModbusServerContext,
+)
+from pymodbus.server import ModbusTcpServer
+
+from homeassistant.config_entries import ConfigEntry, current_entry
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_PROTOCOL, CONF_SLAVE
+from homeassistant.core import HomeAssistant
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.clivet.const import CONF_PIPELINE_DEPTH, DOMAIN  # noqa: E402
+from custom_components.clivet.coordinator import ClivetCoordinator  # noqa: E402
+
+DEVICE_ID = 2
+
+# The register blocks read by the integration before the read planner existed
+ADDRESSES = [
+    *range(2600, 2618),
+    *range(2700, 2712),
+    *range(2800, 2807),
+    *range(3000, 3008),
+    *range(4200, 4279),
+    *range(4300, 4319),
+    *range(7000, 7006),
+]
+
+
+class LatencyDeviceContext(ModbusDeviceContext):
+    """Device context that delays every request."""
+
+    def __init__(self, latency: float) -> None:
+        super().__init__(
+            di=ModbusSequentialDataBlock.create(),
+            co=ModbusSequentialDataBlock.create(),
+            ir=ModbusSequentialDataBlock.create(),
+            hr=ModbusSequentialDataBlock(1, [0] * 10000),
+        )
+        self.latency = latency
+
+    async def async_getValues(self, fc_as_hex: int, address: int, count: int = 1):
+        await asyncio.sleep(self.latency)
+        return self.getValues(fc_as_hex, address, count)
+
+
+async def run_depth(
+    hass: HomeAssistant, port: int, depth: int, cycles: int
+) -> tuple[int, list[float]]:
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Clivet",
+        data={
+            CONF_HOST: "127.0.0.1",
+            CONF_PORT: port,
+            CONF_SLAVE: DEVICE_ID,
+            CONF_PROTOCOL: "tcp",
+        },
+        options={CONF_PIPELINE_DEPTH: depth},
+        source="user",
+        unique_id=None,
+        discovery_keys=MappingProxyType({}),
+        subentries_data=None,
+    )
+    current_entry.set(entry)
+    coordinator = ClivetCoordinator(
+        hass=hass, config_entry=entry, logger=logging.getLogger(__name__)
+    )
+    coordinator.async_add_listener(lambda: None, tuple(ADDRESSES))
+
+    # Connect all clients before measuring
+    await coordinator._async_update_data()
+
+    durations = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        await coordinator._async_update_data()
+        durations.append(time.perf_counter() - start)
+
+    await coordinator.async_shutdown()
+    return len(coordinator.read_plan), durations
+
+
+async def main(latency: float, cycles: int, depths: list[int], port: int) -> None:
+    context = LatencyDeviceContext(latency)
+    server = ModbusTcpServer(
+        ModbusServerContext(devices={DEVICE_ID: context}, single=False),
+        address=("127.0.0.1", port),
+    )
+    server_task = asyncio.create_task(server.serve_forever())
+    await asyncio.sleep(0.5)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        print(f"Injected latency per request: {latency * 1000:.0f} ms")
+        print(f"{'depth':>5} {'blocks':>6} {'median':>10} {'p95':>10}")
+        for depth in depths:
+            blocks, durations = await run_depth(hass, port, depth, cycles)
+            durations.sort()
+            p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+            print(
+                f"{depth:>5} {blocks:>6} "
+                f"{statistics.median(durations) * 1000:>8.1f}ms {p95 * 1000:>8.1f}ms"
+            )
+
+    await server.shutdown()
+    server_task.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.03)
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--port", type=int, default=15020)
+    args = parser.parse_args()
+    asyncio.run(main(args.latency, args.cycles, args.depths, args.port))
@@ -0,0 +1,269 @@
+"""Benchmark the refresh cycle and the fan-out of updates to the entities.
+
+Starts tools/simulator.py with 1, 10 and 50 heat pumps sharing a Modbus TCP,
+UDP or RTU connection, the latter over a pair of pseudo terminals. Every unit is
+added as a config entry, so the integration sets it up and its entities are
+added by the entity platforms, like in Home Assistant. Each cycle refreshes the
+coordinators of all units, which reads their due blocks and then updates the
+entities of the registers that changed.
+
+For each scenario, the cycle time, the Modbus transactions per cycle, the time
+spent updating entities and the number of state changes are printed as JSON,
+so the results of two commits can be compared. A scenario that cannot run, for
+example RTU without pyserial installed, reports its error instead.
+
+Run from the repository root in an environment with Home Assistant installed:
+
+    python benchmarks/bench_refresh.py --output results.json
+"""
+
+import argparse
+import asyncio
+from contextlib import AsyncExitStack
+import json
+import logging
+from pathlib import Path
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from types import MappingProxyType
+from typing import Any
+
+from homeassistant import loader
+from homeassistant.config_entries import ConfigEntries, ConfigEntry
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PORT,
+    CONF_PROTOCOL,
+    CONF_SLAVE,
+    EVENT_STATE_CHANGED,
+)
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+    floor_registry as fr,
+    issue_registry as ir,
+    label_registry as lr,
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.clivet.const import (  # noqa: E402
+    CONF_BAUDRATE,
+    CONF_PARITY,
+    DOMAIN,
+)
+from custom_components.clivet.coordinator import ClivetCoordinator  # noqa: E402
+from tools.simulator import PROFILES, Faults, Simulator, pty_pair  # noqa: E402
+
+FIRST_SLAVE = 1
+
+# Simulated seconds per second, so registers change between cycles
+SPEED = 20.0
+
+
+def build_entry(transport: str, port: int | str, slave: int) -> ConfigEntry:
+    if transport == "rtu":
+        data = {CONF_PORT: port, CONF_BAUDRATE: 9600, CONF_PARITY: "N"}
+    else:
+        data = {CONF_HOST: "127.0.0.1", CONF_PORT: port, CONF_PROTOCOL: transport}
+    return ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title=f"Clivet {slave}",
+        data={**data, CONF_SLAVE: slave},
+        options={},
+        source="user",
+        unique_id=None,
+        discovery_keys=MappingProxyType({}),
+        subentries_data=None,
+    )
+
+
+async def async_start_hass(config_dir: str) -> HomeAssistant:
+    """Start Home Assistant with what setting up config entries needs."""
+    hass = HomeAssistant(config_dir)
+    # pymodbus is installed already
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    await asyncio.gather(
+        ar.async_load(hass),
+        fr.async_load(hass),
+        lr.async_load(hass),
+        ir.async_load(hass),
+    )
+    await asyncio.gather(dr.async_load(hass), er.async_load(hass))
+    await hass.async_start()
+    return hass
+
+
+def _time_listener_updates(
+    coordinator: ClivetCoordinator, durations: list[float]
+) -> None:
+    """Add the time the coordinator spends updating its entities to durations."""
+    update_listeners = coordinator.async_update_listeners
+
+    @callback
+    def _async_update_listeners() -> None:
+        start = time.perf_counter()
+        update_listeners()
+        durations.append(time.perf_counter() - start)
+
+    coordinator.async_update_listeners = _async_update_listeners  # type: ignore[method-assign]
+
+
+def summarize(samples: list[float], scale: float) -> dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "median": round(statistics.median(samples) * scale, 3),
+        "p95": round(
+            samples[min(len(samples) - 1, int(len(samples) * 0.95))] * scale, 3
+        ),
+        "max": round(samples[-1] * scale, 3),
+    }
+
+
+async def run_scenario(
+    hass: HomeAssistant, transport: str, units: int, args: argparse.Namespace
+) -> dict[str, Any]:
+    simulator = Simulator(
+        PROFILES[args.profile],
+        Faults(latency=args.latency),
+        device_id=FIRST_SLAVE,
+        units=units,
+        speed=SPEED,
+        seed=0,
+    )
+    state_changes = 0
+
+    @callback
+    def _count_state_change(event: Event) -> None:
+        nonlocal state_changes
+        state_changes += 1
+
+    async with AsyncExitStack() as stack:
+        if transport == "rtu":
+            server_port, port = await stack.enter_async_context(pty_pair())
+        else:
+            server_port = port = args.port
+            # Leave the port of the previous scenario to close
+            args.port += 1
+        await simulator.start(transport, port=server_port)
+        stack.push_async_callback(simulator.stop)
+
+        coordinators: list[ClivetCoordinator] = []
+        for slave in simulator.contexts:
+            entry = build_entry(transport, port, slave)
+            await hass.config_entries.async_add(entry)
+            stack.push_async_callback(hass.config_entries.async_remove, entry.entry_id)
+            coordinators.append(entry.runtime_data)
+        # Let the refresh after the entities were added read all registers, so
+        # every cycle is an update of known values
+        await hass.async_block_till_done(wait_background_tasks=True)
+        entities = len(hass.states.async_all())
+        stack.callback(hass.bus.async_listen(EVENT_STATE_CHANGED, _count_state_change))
+
+        cycles: list[float] = []
+        fanouts: list[float] = []
+        fanout: list[float] = []
+        for coordinator in coordinators:
+            _time_listener_updates(coordinator, fanout)
+        requests = simulator.requests
+        state_changes = 0
+        for _ in range(args.cycles):
+            await asyncio.sleep(args.interval)
+            fanout.clear()
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(coordinator.async_refresh() for coordinator in coordinators)
+            )
+            cycles.append(time.perf_counter() - start)
+            fanouts.append(sum(fanout))
+        if failed := sum(not c.last_update_success for c in coordinators):
+            raise RuntimeError(f"The last refresh of {failed} units failed")
+
+        return {
+            "transport": transport,
+            "units": units,
+            "cycles": args.cycles,
+            "entities": entities,
+            "blocks": sum(len(coordinator.read_plan) for coordinator in coordinators),
+            "transactions_per_cycle": round(
+                (simulator.requests - requests) / args.cycles, 2
+            ),
+            "cycle_ms": summarize(cycles, 1000),
+            "fanout_ms": summarize(fanouts, 1000),
+            "fanout_us_per_entity": round(
+                statistics.median(fanouts) / entities * 1e6, 3
+            ),
+            "state_changes_per_cycle": round(state_changes / args.cycles, 2),
+        }
+
+
+async def main(args: argparse.Namespace) -> None:
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_start_hass(config_dir)
+        for transport in args.transports:
+            for units in args.units:
+                try:
+                    result = await run_scenario(hass, transport, units, args)
+                except Exception as err:
+                    result = {
+                        "transport": transport,
+                        "units": units,
+                        "error": repr(err),
+                    }
+                else:
+                    print(
+                        f"{transport:>4} {units:>3} units: "
+                        f"cycle {result['cycle_ms']['median']:>8.2f}ms, "
+                        f"{result['transactions_per_cycle']:>6} transactions, "
+                        f"fan-out {result['fanout_ms']['median']:>7.3f}ms",
+                        file=sys.stderr,
+                    )
+                results.append(result)
+        await hass.async_stop()
+
+    report = {
+        "python": platform.python_version(),
+        "profile": args.profile,
+        "latency": args.latency,
+        "scenarios": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--transports",
+        nargs="+",
+        choices=("tcp", "udp", "rtu"),
+        default=["tcp", "udp", "rtu"],
+    )
+    parser.add_argument("--units", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument(
+        "--interval", type=float, default=0.1, help="seconds between cycles"
+    )
+    parser.add_argument("--profile", choices=PROFILES, default="winter")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=15020)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    # The integration is loaded as a custom integration, which is warned about
+    logging.getLogger("homeassistant.loader").setLevel(logging.ERROR)
+    asyncio.run(main(args))
@@ -0,0 +1,347 @@
+"""Modbus connections shared by all devices on the same transport."""
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from enum import IntEnum
+import time
+from typing import Any
+
+from pymodbus import ModbusException
+from pymodbus.client import (
+    AsyncModbusSerialClient,
+    AsyncModbusTcpClient,
+    AsyncModbusUdpClient,
+)
+from pymodbus.client.base import ModbusBaseClient
+
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_PROTOCOL
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import CONF_BAUDRATE, CONF_PARITY, DOMAIN, ClivetNetworkModbusProtocol
+from .exceptions import DeferredException, OfflineException
+from .metrics import RollingSamples
+
+DATA_BUSES: HassKey[dict[str, "ModbusBus"]] = HassKey(f"{DOMAIN}_buses")
+
+# Timeout of the Modbus clients, used until enough round trips were measured
+REQUEST_TIMEOUT = 10.0
+
+# Requests with a deadline time out after a multiple of the 99th percentile of
+# the last round trip times, so a lost request does not hold up the bus.
+RTT_SAMPLES = 200
+RTT_MIN_SAMPLES = 20
+RTT_TIMEOUT_FACTOR = 3.0
+MIN_REQUEST_TIMEOUT = 0.5
+
+
+class TransactionPriority(IntEnum):
+    """Order in which waiting transactions get a client, lowest first."""
+
+    WRITE = 0
+    VERIFY = 1
+    POLL = 2
+
+
+@dataclass(slots=True)
+class QueueWait:
+    """Time transactions of a priority spent waiting for a client."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    last: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        """Return the mean wait in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, wait: float) -> None:
+        """Record the wait of a transaction."""
+        self.count += 1
+        self.total += wait
+        self.max = max(self.max, wait)
+        self.last = wait
+
+
+@dataclass(slots=True)
+class Traffic:
+    """Connections and bytes on the wire of a bus."""
+
+    reconnects: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+
+    def trace_packet(self, sending: bool, data: bytes) -> bytes:
+        """Count the bytes of a packet sent or received by a client."""
+        if sending:
+            self.bytes_sent += len(data)
+        else:
+            self.bytes_received += len(data)
+        return data
+
+
+def build_client(
+    data: Mapping[str, Any],
+    trace_packet: Callable[[bool, bytes], bytes] | None = None,
+) -> ModbusBaseClient:
+    """Create a new Modbus client."""
+    if CONF_PROTOCOL in data:
+        match data[CONF_PROTOCOL]:
+            case ClivetNetworkModbusProtocol.TCP:
+                return AsyncModbusTcpClient(
+                    host=data[CONF_HOST],
+                    port=data[CONF_PORT],
+                    timeout=REQUEST_TIMEOUT,
+                    trace_packet=trace_packet,
+                )
+            case ClivetNetworkModbusProtocol.UDP:
+                return AsyncModbusUdpClient(
+                    host=data[CONF_HOST],
+                    port=data[CONF_PORT],
+                    timeout=REQUEST_TIMEOUT,
+                    trace_packet=trace_packet,
+                )
+    if CONF_BAUDRATE in data:
+        return AsyncModbusSerialClient(
+            port=data[CONF_PORT],
+            baudrate=data[CONF_BAUDRATE],
+            parity=data[CONF_PARITY],
+            timeout=REQUEST_TIMEOUT,
+            trace_packet=trace_packet,
+        )
+    raise ValueError("Invalid Modbus client configuration")
+
+
+def build_bus_key(data: Mapping[str, Any]) -> str:
+    """Return the key of the transport a device is connected to."""
+    if CONF_PROTOCOL in data:
+        return f"{data[CONF_PROTOCOL]}://{data[CONF_HOST]}:{data[CONF_PORT]}"
+    return f"serial://{data[CONF_PORT]}"
+
+
+@callback
+def async_get_bus(
+    hass: HomeAssistant, data: Mapping[str, Any], owner: object, depth: int = 1
+) -> "ModbusBus":
+    """Return the bus of a device, creating it for the first device on it."""
+    buses = hass.data.setdefault(DATA_BUSES, {})
+    key = build_bus_key(data)
+    if (bus := buses.get(key)) is None:
+        bus = buses[key] = ModbusBus(key, data)
+    bus.add_owner(owner, depth)
+    return bus
+
+
+@callback
+def async_release_bus(hass: HomeAssistant, bus: "ModbusBus", owner: object) -> None:
+    """Stop using a bus, closing its connections when no device uses it anymore."""
+    if bus.remove_owner(owner):
+        return
+    bus.close()
+    if hass.data.get(DATA_BUSES, {}).get(bus.key) is bus:
+        del hass.data[DATA_BUSES][bus.key]
+
+
+class ModbusBus:
+    """Connections to a transport, shared by all devices connected to it.
+
+    pymodbus runs one transaction at a time per client, so the bus keeps a pool
+    of clients. Network transports can have more than one client to keep several
+    transactions in flight over extra connections to the gateway, serial ports
+    always have a single one. The pool grows to the largest pipeline depth of
+    the devices on the bus, but each device keeps at most as many transactions
+    in flight as its own depth.
+
+    Transactions waiting for a client are served by priority, so writes do not
+    wait behind a poll in progress. Within a priority, devices are served in
+    turn, one transaction each, so the read plans of all devices on the bus are
+    interleaved.
+    """
+
+    def __init__(self, key: str, data: Mapping[str, Any]) -> None:
+        self.key = key
+        self._data = data
+        self.traffic = Traffic()
+        self.clients: list[ModbusBaseClient] = [
+            build_client(data, self.traffic.trace_packet)
+        ]
+        # Clients that were connected before, whose next connect is a reconnect
+        self._connected_clients: set[ModbusBaseClient] = set()
+        self._idle: deque[ModbusBaseClient] = deque(self.clients)
+        self._waiting: dict[
+            TransactionPriority, dict[object, deque[asyncio.Future[ModbusBaseClient]]]
+        ] = {priority: {} for priority in TransactionPriority}
+        # Pipeline depth of each device, and its transactions in flight
+        self._owners: dict[object, int] = {}
+        self._in_flight: dict[object, int] = {}
+        self.queue_wait = {priority: QueueWait() for priority in TransactionPriority}
+        self.rtt = RollingSamples(RTT_SAMPLES, RTT_MIN_SAMPLES)
+
+    @property
+    def depth(self) -> int:
+        """Return the number of transactions that can be in flight at once."""
+        return len(self.clients)
+
+    def owner_depth(self, owner: object) -> int:
+        """Return the number of transactions a device can have in flight at once."""
+        return min(self._owners.get(owner, 1), self.depth)
+
+    def add_owner(self, owner: object, depth: int) -> None:
+        """Add a device to the bus and grow the pool to the depth it asks for."""
+        self._owners[owner] = depth
+        if CONF_PROTOCOL not in self._data:
+            return
+        while len(self.clients) < depth:
+            client = build_client(self._data, self.traffic.trace_packet)
+            self.clients.append(client)
+            self._release_client(client)
+
+    def remove_owner(self, owner: object) -> int:
+        """Remove a device from the bus and return the number of devices left."""
+        self._owners.pop(owner, None)
+        return len(self._owners)
+
+    def close(self) -> None:
+        """Close all connections."""
+        for client in self.clients:
+            client.close()
+
+    def request_timeout(self) -> float:
+        """Return the timeout of a request, derived from the measured round trips."""
+        if (p99 := self.rtt.quantile(0.99)) is None:
+            return REQUEST_TIMEOUT
+        return min(REQUEST_TIMEOUT, max(MIN_REQUEST_TIMEOUT, p99 * RTT_TIMEOUT_FACTOR))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the bus for diagnostics."""
+        return {
+            "key": self.key,
+            "depth": self.depth,
+            "devices": len(self._owners),
+            "rtt": self.rtt.as_dict(),
+            "traffic": asdict(self.traffic),
+            "request_timeout": self.request_timeout(),
+            "queue_wait": {
+                priority.name.lower(): {**asdict(wait), "mean": wait.mean}
+                for priority, wait in self.queue_wait.items()
+            },
+        }
+
+    @asynccontextmanager
+    async def transaction(
+        self,
+        owner: object,
+        priority: TransactionPriority = TransactionPriority.POLL,
+        deadline: float | None = None,
+    ) -> AsyncIterator[ModbusBaseClient]:
+        """Wait for the turn of a device and return a connected client.
+
+        The request times out based on the measured round trip times, so it
+        does not hold the client and the registers it writes for the retries of
+        pymodbus. When a deadline is given, the request never times out after
+        it, and when it is not expected to finish before the deadline,
+        DeferredException is raised without sending it.
+        """
+        queued_at = time.monotonic()
+        client = await self._acquire_client(owner, priority)
+        self.queue_wait[priority].add(time.monotonic() - queued_at)
+        try:
+            if not client.connected:
+                await self._connect(client, deadline)
+            request_timeout = self.request_timeout()
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or remaining < (self.rtt.quantile(0.99) or 0):
+                    raise DeferredException
+                request_timeout = min(request_timeout, remaining)
+            timeout = asyncio.timeout(request_timeout)
+            sent_at = time.monotonic()
+            try:
+                async with timeout:
+                    yield client
+            except (ModbusException, TimeoutError):
+                if timeout.expired():
+                    # Drop the connection, so the late response is not taken as
+                    # the response to the next request
+                    client.close()
+                raise
+            self.rtt.add(time.monotonic() - sent_at)
+        finally:
+            self._finish(owner, client)
+
+    async def _connect(self, client: ModbusBaseClient, deadline: float | None) -> None:
+        """Connect a client, giving up when the deadline passes."""
+        if deadline is None:
+            connected = await client.connect()
+        else:
+            if (remaining := deadline - time.monotonic()) <= 0:
+                raise DeferredException
+            try:
+                async with asyncio.timeout(remaining):
+                    connected = await client.connect()
+            except TimeoutError as e:
+                client.close()
+                raise OfflineException from e
+        if not connected:
+            raise OfflineException
+        if client in self._connected_clients:
+            self.traffic.reconnects += 1
+        self._connected_clients.add(client)
+
+    async def _acquire_client(
+        self, owner: object, priority: TransactionPriority
+    ) -> ModbusBaseClient:
+        # Clients are only idle while all waiting devices are at their depth
+        if self._idle and self._can_start(owner):
+            self._in_flight[owner] = self._in_flight.get(owner, 0) + 1
+            return self._idle.popleft()
+
+        future: asyncio.Future[ModbusBaseClient] = (
+            asyncio.get_running_loop().create_future()
+        )
+        waiting = self._waiting[priority]
+        waiting.setdefault(owner, deque()).append(future)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The client was handed over right before the cancellation
+                self._finish(owner, future.result())
+            elif (futures := waiting.get(owner)) is not None:
+                futures.remove(future)
+                if not futures:
+                    del waiting[owner]
+            raise
+
+    def _can_start(self, owner: object) -> bool:
+        """Return whether a device has fewer transactions in flight than its depth."""
+        return self._in_flight.get(owner, 0) < self.owner_depth(owner)
+
+    def _finish(self, owner: object, client: ModbusBaseClient) -> None:
+        """End a transaction of a device and release its client."""
+        if (in_flight := self._in_flight[owner] - 1) > 0:
+            self._in_flight[owner] = in_flight
+        else:
+            del self._in_flight[owner]
+        self._release_client(client)
+
+    def _release_client(self, client: ModbusBaseClient) -> None:
+        """Hand a client to the next transaction in line, or put it back."""
+        for waiting in self._waiting.values():
+            # Devices at their depth keep their place in line
+            while (owner := next(filter(self._can_start, waiting), None)) is not None:
+                futures = waiting.pop(owner)
+                future = futures.popleft()
+                if futures:
+                    # Move the device to the back of the line
+                    waiting[owner] = futures
+                if not future.done():
+                    self._in_flight[owner] = self._in_flight.get(owner, 0) + 1
+                    future.set_result(client)
+                    return
+        self._idle.append(client)
@@ -5,17 +5,26 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.const import CONF_PROTOCOL
+from homeassistant.core import HomeAssistant, callback
 
+from .bus import DATA_BUSES, build_bus_key, build_client
 from .const import (
     CONF_CONNECTION_TYPE,
     DOMAIN,
     MODBUS_NETWORK_SCHEMA,
     MODBUS_SELECTION_SCHEMA,
     MODBUS_SERIAL_SCHEMA,
+    NETWORK_OPTIONS_SCHEMA,
+    OPTIONS_SCHEMA,
     ClivetNetworkModbusConnectionType,
 )
-from .coordinator import ClivetCoordinator
 from .exceptions import CannotConnect
 
 _LOGGER = logging.getLogger(__name__)
@@ -27,8 +36,11 @@ _selection_map = {
 }
 
 
-async def validate_input(data: dict[str, Any]) -> None:
-    client = ClivetCoordinator.build_client(data)
+async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> None:
+    if build_bus_key(data) in hass.data.get(DATA_BUSES, {}):
+        # Another device is connected through the same transport
+        return
+    client = build_client(data)
     try:
         connected = await client.connect()
     except Exception as e:
@@ -45,6 +57,12 @@ class ClivetConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> ClivetOptionsFlow:
+        """Create the options flow."""
+        return ClivetOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -77,7 +95,7 @@ class ClivetConfigFlow(ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             self._async_abort_entries_match(user_input)
             try:
-                await validate_input(user_input)
+                await validate_input(self.hass, user_input)
                 return self.async_create_entry(title="Clivet", data=user_input)
             except CannotConnect:
                 errors["base"] = "cannot_connect"
@@ -110,3 +128,27 @@ class ClivetConfigFlow(ConfigFlow, domain=DOMAIN):
             MODBUS_SERIAL_SCHEMA,
             user_input,
         )
+
+
+class ClivetOptionsFlow(OptionsFlow):
+    """Handle the options for Clivet."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the polling options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        # Pipelined reads are only possible on network connections
+        schema = (
+            NETWORK_OPTIONS_SCHEMA
+            if CONF_PROTOCOL in self.config_entry.data
+            else OPTIONS_SCHEMA
+        )
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                schema, self.config_entry.options
+            ),
+        )
@@ -25,6 +25,23 @@ CONF_BYTESIZE = "bytesize"
 CONF_PARITY = "parity"
 CONF_STOPBITS = "stopbits"
 CONF_CONNECTION_TYPE = "connection_type"
+CONF_READ_MAX_GAP = "read_max_gap"
+CONF_READ_MAX_COUNT = "read_max_count"
+CONF_PIPELINE_DEPTH = "pipeline_depth"
+CONF_VERIFY_WRITES = "verify_writes"
+CONF_CACHE_MAX_AGE = "cache_max_age"
+CONF_MAX_VALUE_AGE = "max_value_age"
+CONF_STATE_FILTER = "state_filter"
+CONF_STATE_MAX_INTERVAL = "state_max_interval"
+
+DEFAULT_READ_MAX_GAP = 10
+DEFAULT_READ_MAX_COUNT = 100
+DEFAULT_PIPELINE_DEPTH = 1
+DEFAULT_VERIFY_WRITES = False
+DEFAULT_CACHE_MAX_AGE = 5
+DEFAULT_MAX_VALUE_AGE = 60
+DEFAULT_STATE_FILTER = True
+DEFAULT_STATE_MAX_INTERVAL = 900
 
 
 class ClivetNetworkModbusProtocol(StrEnum):
@@ -34,6 +51,25 @@ class ClivetNetworkModbusProtocol(StrEnum):
     UDP = "udp"
 
 
+class ClivetDevice(StrEnum):
+    HEAT_PUMP = "heat_pump"
+    DHW = "dhw"
+    COMPRESSOR = "compressor"
+
+    def device_name(self) -> str:
+        match self.value:
+            case ClivetDevice.HEAT_PUMP:
+                return "Heat Pump"
+            case ClivetDevice.DHW:
+                return "Domestic Hot Water"
+            case ClivetDevice.COMPRESSOR:
+                return "Compressor"
+            case _:
+                raise NotImplementedError(
+                    f"Device type {self.value} is not implemented"
+                )
+
+
 class ClivetNetworkModbusConnectionType(StrEnum):
     """Enum for Clivet Modbus connection types."""
 
@@ -66,3 +102,31 @@ MODBUS_SELECTION_SCHEMA = vol.Schema(
         ),
     }
 )
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_READ_MAX_GAP, default=DEFAULT_READ_MAX_GAP): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=50)
+        ),
+        vol.Required(CONF_READ_MAX_COUNT, default=DEFAULT_READ_MAX_COUNT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=125)
+        ),
+        vol.Required(CONF_VERIFY_WRITES, default=DEFAULT_VERIFY_WRITES): bool,
+        vol.Required(CONF_CACHE_MAX_AGE, default=DEFAULT_CACHE_MAX_AGE): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=60)
+        ),
+        vol.Required(CONF_MAX_VALUE_AGE, default=DEFAULT_MAX_VALUE_AGE): vol.All(
+            vol.Coerce(int), vol.Range(min=10, max=3600)
+        ),
+        vol.Required(CONF_STATE_FILTER, default=DEFAULT_STATE_FILTER): bool,
+        vol.Required(
+            CONF_STATE_MAX_INTERVAL, default=DEFAULT_STATE_MAX_INTERVAL
+        ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+    }
+)
+NETWORK_OPTIONS_SCHEMA = OPTIONS_SCHEMA.extend(
+    {
+        vol.Required(CONF_PIPELINE_DEPTH, default=DEFAULT_PIPELINE_DEPTH): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=8)
+        ),
+    }
+)
@@ -1,65 +1,219 @@
-from collections.abc import Mapping
-from datetime import timedelta
+import asyncio
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import datetime, timedelta
+from enum import StrEnum
+from functools import partial
 import logging
+import random
+import time
 from typing import Any
 
 from pymodbus import ModbusException
-from pymodbus.client import (
-    AsyncModbusSerialClient,
-    AsyncModbusTcpClient,
-    AsyncModbusUdpClient,
-)
-from pymodbus.client.base import ModbusBaseClient
+from pymodbus.exceptions import ModbusIOException
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PORT, CONF_PROTOCOL, CONF_SLAVE
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SLAVE
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import CONF_BAUDRATE, CONF_PARITY, DOMAIN, ClivetNetworkModbusProtocol
-from .exceptions import CommunicationException, OfflineException
+from .bus import TransactionPriority, async_get_bus, async_release_bus
+from .const import (
+    CONF_CACHE_MAX_AGE,
+    CONF_MAX_VALUE_AGE,
+    CONF_PIPELINE_DEPTH,
+    CONF_READ_MAX_COUNT,
+    CONF_READ_MAX_GAP,
+    CONF_STATE_FILTER,
+    CONF_STATE_MAX_INTERVAL,
+    CONF_VERIFY_WRITES,
+    DEFAULT_CACHE_MAX_AGE,
+    DEFAULT_MAX_VALUE_AGE,
+    DEFAULT_PIPELINE_DEPTH,
+    DEFAULT_READ_MAX_COUNT,
+    DEFAULT_READ_MAX_GAP,
+    DEFAULT_STATE_FILTER,
+    DEFAULT_STATE_MAX_INTERVAL,
+    DEFAULT_VERIFY_WRITES,
+    DOMAIN,
+)
+from .derived import DerivedMetrics
+from .exceptions import (
+    REJECTED_EXCEPTION_CODES,
+    CommunicationException,
+    DeferredException,
+    ErrorResponseException,
+    OfflineException,
+)
+from .history import PollHistory
+from .metrics import DeviceMetrics
+from .register_map import REGISTERS
+from .registers import (
+    ALL_BITS,
+    MODBUS_MAX_READ_COUNT,
+    MODEL_ADDRESSES,
+    SLOW_TIER_INTERVAL,
+    DeviceLayout,
+    ReadBlock,
+    RegisterBit,
+    RegisterSnapshot,
+    RegisterTier,
+    build_read_plan,
+    build_write_plan,
+)
+from .scanner import (
+    ScanResult,
+    learn_block_layout,
+    merge_ranges,
+    scan_registers,
+    subtract_range,
+)
+
+UPDATE_INTERVAL = timedelta(seconds=10)
+
+# Part of the update interval an update may take. Blocks that would not be read
+# before then are deferred to the next update, so updates stay on schedule.
+UPDATE_DEADLINE_RATIO = 0.8
+
+# Delay before blocks that failed are read again, instead of waiting for the next
+# update
+BLOCK_RETRY_DELAY = 2.0
+
+LAYOUT_STORAGE_VERSION = 1
+LAYOUT_SAVE_DELAY = 10
+
+# Successful updates after which the restrictions learned from rejected reads are
+# lifted, a day at the update interval. Reads the device still rejects are
+# learned again, so a restriction is not kept forever when the device only
+# rejected reads for a while.
+LAYOUT_RELEARN_UPDATES = 8640
+
+
+def layout_storage_key(entry_id: str) -> str:
+    """Return the storage key of the layout learned for a config entry."""
+    return f"{DOMAIN}.{entry_id}.layout"
+
+
+# Delay before the first reconnect attempt after the device went offline, doubled
+# after every failed attempt up to the maximum, with some jitter so devices that
+# went offline together do not all probe at the same time.
+OFFLINE_BACKOFF_MIN = 10.0
+OFFLINE_BACKOFF_MAX = 300.0
+OFFLINE_BACKOFF_JITTER = 0.2
+
+# Requests in a row without a response after which the device is considered
+# offline. A single lost response only fails its block, which keeps its last
+# values until it is read again.
+OFFLINE_UNANSWERED_REQUESTS = 3
+
+# Window in which bit changes to the same register are merged into a single write
+BIT_WRITE_WINDOW = 0.05
+
+# Delay before refreshing after entities were added, so all entities of a platform
+# setup are read and get their initial state in a single refresh.
+READ_PLAN_REFRESH_DELAY = 0.5
+
+
+def _listened_bits(register: int | RegisterBit) -> tuple[int, int]:
+    """Return the address and the bits used by a listener of a register."""
+    if isinstance(register, RegisterBit):
+        return register.address, 1 << register.bit
+    return register, ALL_BITS
+
+
+class ConnectionState(StrEnum):
+    """Whether the device answers Modbus requests."""
+
+    ONLINE = "online"
+    OFFLINE = "offline"
+
 
+class _PendingBitWrite:
+    """Bit changes to a register that are waiting to be written."""
 
-class ClivetCoordinator(DataUpdateCoordinator[dict[int, int | None]]):
+    __slots__ = ("clear_mask", "future", "set_mask")
+
+    def __init__(self, future: asyncio.Future[None]) -> None:
+        self.future = future
+        self.set_mask = 0
+        self.clear_mask = 0
+
+
+class ClivetCoordinator(DataUpdateCoordinator[RegisterSnapshot]):
     def __init__(
         self, hass: HomeAssistant, config_entry: ConfigEntry, logger: logging.Logger
     ) -> None:
-        self.client = self.build_client(config_entry.data)
         self.device_id = config_entry.data[CONF_SLAVE]
         self.unique_id = self.build_unique_id(config_entry.data)
+        self.read_max_gap: int = config_entry.options.get(
+            CONF_READ_MAX_GAP, DEFAULT_READ_MAX_GAP
+        )
+        self.read_max_count: int = config_entry.options.get(
+            CONF_READ_MAX_COUNT, DEFAULT_READ_MAX_COUNT
+        )
+        self.verify_writes: bool = config_entry.options.get(
+            CONF_VERIFY_WRITES, DEFAULT_VERIFY_WRITES
+        )
+        self.cache_max_age: float = config_entry.options.get(
+            CONF_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE
+        )
+        self.max_value_age: int = config_entry.options.get(
+            CONF_MAX_VALUE_AGE, DEFAULT_MAX_VALUE_AGE
+        )
+        self.state_filter: bool = config_entry.options.get(
+            CONF_STATE_FILTER, DEFAULT_STATE_FILTER
+        )
+        self.state_max_interval: int = config_entry.options.get(
+            CONF_STATE_MAX_INTERVAL, DEFAULT_STATE_MAX_INTERVAL
+        )
+        self._read_plan: list[ReadBlock] | None = None
+        self._block_read_at: dict[ReadBlock, float] = {}
+        # Listeners of each address, with the bits of the register they use
+        self._address_listeners: dict[int, list[tuple[CALLBACK_TYPE, int]]] = {}
+        self._pending_addresses: set[int] = set()
+        # Bits that flipped per address, whose listeners are updated next. None
+        # updates all listeners.
+        self._changed_bits: dict[int, int] | None = None
+        self._register_locks: defaultdict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._pending_bit_writes: dict[int, _PendingBitWrite] = {}
+        self.connection_state = ConnectionState.ONLINE
+        self._failed_probes = 0
+        # Requests in a row the device did not respond to
+        self._unanswered_requests = 0
+        self._stale_addresses: set[int] = set()
+        self._unsub_block_retry: CALLBACK_TYPE | None = None
+        self.layout = DeviceLayout()
+        self.metrics = DeviceMetrics()
+        self.history = PollHistory()
+        self.derived = DerivedMetrics()
+        self._layout_store: Store[dict[str, Any]] = Store(
+            hass, LAYOUT_STORAGE_VERSION, layout_storage_key(config_entry.entry_id)
+        )
+        self._learning_blocks: set[ReadBlock] = set()
+        self._updates_since_learned = 0
+        self._next_probe_at = 0.0
+        pipeline_depth = config_entry.options.get(
+            CONF_PIPELINE_DEPTH, DEFAULT_PIPELINE_DEPTH
+        )
+        self.bus = async_get_bus(hass, config_entry.data, self, pipeline_depth)
         super().__init__(
             hass,
-            update_interval=timedelta(seconds=10),
+            update_interval=UPDATE_INTERVAL,
             name=DOMAIN,
             logger=logger,
             config_entry=config_entry,
         )
-
-    @staticmethod
-    def build_client(data: Mapping[str, Any]) -> ModbusBaseClient:
-        """Create a new Modbus client."""
-        if CONF_PROTOCOL in data:
-            match data[CONF_PROTOCOL]:
-                case ClivetNetworkModbusProtocol.TCP:
-                    return AsyncModbusTcpClient(
-                        host=data[CONF_HOST],
-                        port=data[CONF_PORT],
-                        timeout=10,
-                    )
-                case ClivetNetworkModbusProtocol.UDP:
-                    return AsyncModbusUdpClient(
-                        host=data[CONF_HOST],
-                        port=data[CONF_PORT],
-                        timeout=10,
-                    )
-        if CONF_BAUDRATE in data:
-            return AsyncModbusSerialClient(
-                port=data[CONF_PORT],
-                baudrate=data[CONF_BAUDRATE],
-                parity=data[CONF_PARITY],
-                timeout=10,
-            )
-        raise ValueError("Invalid Modbus client configuration")
+        self._read_plan_refresh = Debouncer(
+            hass,
+            logger,
+            cooldown=READ_PLAN_REFRESH_DELAY,
+            immediate=False,
+            function=self.async_refresh,
+        )
 
     @staticmethod
     def build_unique_id(data: Mapping[str, Any]) -> str:
@@ -92,74 +246,774 @@ class ClivetCoordinator(DataUpdateCoordinator[dict[int, int | None]]):
                 model_name += " Monobloc"
         return model_name
 
+    @property
+    def read_plan(self) -> list[ReadBlock]:
+        """Return the blocks to read, built from the addresses entities listen to."""
+        if self._read_plan is None:
+            self._read_plan = self._build_read_plan(self.registered_addresses())
+            self._block_read_at = {
+                block: read_at
+                for block, read_at in self._block_read_at.items()
+                if block in self._read_plan
+            }
+            self.logger.debug(
+                "Read plan for %s: %s",
+                self.unique_id,
+                ", ".join(f"{b.address}/{b.count}" for b in self._read_plan),
+            )
+        return self._read_plan
+
+    def _build_read_plan(self, addresses: Iterable[int]) -> list[ReadBlock]:
+        return build_read_plan(
+            addresses,
+            max_gap=self.read_max_gap,
+            max_count=min(self.read_max_count, self.layout.max_count),
+            tiers=REGISTERS.tiers,
+            unreadable=self.layout,
+        )
+
+    def due_blocks(self, now: float) -> list[ReadBlock]:
+        """Return the blocks of the read plan that have to be read at `now`.
+
+        The blocks that were read the longest ago come first.
+        """
+        assert self.update_interval is not None
+        # Blocks that would become due before the next update are read now
+        slack = self.update_interval.total_seconds() / 2
+        due = []
+        for block in self.read_plan:
+            read_at = self._block_read_at.get(block)
+            if read_at is None:
+                due.append(block)
+            elif block.tier is RegisterTier.FAST or (
+                block.tier is RegisterTier.SLOW
+                and now + slack - read_at >= SLOW_TIER_INTERVAL.total_seconds()
+            ):
+                due.append(block)
+        # Blocks deferred by a previous update are read first
+        return sorted(due, key=lambda block: self._block_read_at.get(block, 0.0))
+
+    def registered_addresses(self) -> set[int]:
+        """Return all addresses used by the entities that are currently added."""
+        addresses = set(MODEL_ADDRESSES)
+        for context in self.async_contexts():
+            addresses.update(_listened_bits(register)[0] for register in context)
+        return addresses
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates of the registers in context.
+
+        The context holds addresses, or RegisterBit for listeners that only use
+        a single bit of a register. The registers are added to the read plan and
+        the listener is only called when one of them, or its bit, changes.
+        """
+        remove_listener = super().async_add_listener(update_callback, context)
+        if not context:
+            return remove_listener
+
+        listened = [_listened_bits(register) for register in context]
+        for address, bits in listened:
+            self._address_listeners.setdefault(address, []).append(
+                (update_callback, bits)
+            )
+            # New listeners get the current state on the next update
+            self._pending_addresses.add(address)
+        self._read_plan = None
+        if self.data is not None:
+            self._read_plan_refresh.async_schedule_call()
+
+        @callback
+        def remove_address_listener() -> None:
+            remove_listener()
+            for address, bits in listened:
+                self._address_listeners[address].remove((update_callback, bits))
+                if not self._address_listeners[address]:
+                    del self._address_listeners[address]
+            self._read_plan = None
+
+        return remove_address_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners of the registers and bits that changed."""
+        changed_bits = self._changed_bits
+        self._changed_bits = None
+        if changed_bits is None:
+            self._pending_addresses = set()
+            super().async_update_listeners()
+            return
+
+        update_callbacks: dict[CALLBACK_TYPE, None] = {}
+        for update_callback, context in self._listeners.values():
+            if context is None:
+                update_callbacks[update_callback] = None
+        for address, flipped in changed_bits.items():
+            for update_callback, bits in self._address_listeners.get(address, ()):
+                if flipped & bits:
+                    update_callbacks[update_callback] = None
+        for update_callback in update_callbacks:
+            update_callback()
+
     async def async_shutdown(self) -> None:
+        self._read_plan_refresh.async_shutdown()
+        self._schedule_block_retry([])
         await super().async_shutdown()
-        self.client.close()
+        async_release_bus(self.hass, self.bus, self)
 
     async def refresh_single_address(self, address: int) -> None:
-        result = await self._get_modbus_register(address)
-        if result:
-            self.data[address] = result[0]
+        await self.refresh_addresses([address])
+
+    async def refresh_addresses(self, addresses: Iterable[int]) -> None:
+        """Read the given addresses again, in as few requests as possible."""
+        addresses = set(addresses)
+        values: dict[int, int] = {}
+        for block in self._build_read_plan(addresses):
+            result = await self._get_modbus_register(
+                block.address, block.count, TransactionPriority.VERIFY
+            )
+            if not result:
+                continue
+            for address in addresses.intersection(range(block.address, block.end)):
+                values[address] = result[address - block.address]
+        self._store_registers(values)
+
+    @callback
+    def _store_registers(self, values: Mapping[int, int]) -> None:
+        """Store register values and update the listeners of the bits that flipped."""
+        changed_bits: dict[int, int] = {}
+        for address, value in values.items():
+            previous = self.data.get(address)
+            self.data[address] = value
+            if previous is None or address in self._stale_addresses:
+                # The register becomes available again
+                changed_bits[address] = ALL_BITS
+            elif previous != value:
+                changed_bits[address] = previous ^ value
+        self._changed_bits = changed_bits
         self.async_update_listeners()
 
-    async def _async_update_data(self) -> dict[int, int | None]:
-        data_dict: dict[int, int | None] = {}
+    async def _handle_registers_written(self, values: Mapping[int, int]) -> None:
+        """Update the snapshot with the values written to registers."""
+        if self.verify_writes:
+            await self.refresh_addresses(values)
+            return
+
+        self._store_registers(values)
+        # Verify the written values with the next update
+        for block in self.read_plan:
+            if any(address in block for address in values):
+                self._block_read_at.pop(block, None)
+
+    def _set_offline(self) -> None:
+        """Stop polling and schedule the next reconnect attempt."""
+        if self.connection_state is ConnectionState.ONLINE:
+            self.logger.warning("%s is offline", self.unique_id)
+            self.connection_state = ConnectionState.OFFLINE
+            self._failed_probes = 0
+            # Everything is read again once the device is back
+            self._block_read_at.clear()
+        else:
+            self._failed_probes += 1
+        delay = min(OFFLINE_BACKOFF_MAX, OFFLINE_BACKOFF_MIN * 2**self._failed_probes)
+        delay *= 1 + random.uniform(-OFFLINE_BACKOFF_JITTER, OFFLINE_BACKOFF_JITTER)
+        self._next_probe_at = time.monotonic() + delay
+        self.update_interval = timedelta(seconds=delay)
+
+    def _set_online(self) -> None:
+        """Resume polling after a successful reconnect attempt."""
+        self.logger.info("%s is back online", self.unique_id)
+        self.connection_state = ConnectionState.ONLINE
+        self.update_interval = UPDATE_INTERVAL
+
+    def connection_info(self) -> dict[str, Any]:
+        """Return the state of the connection to the device for diagnostics."""
+        return {
+            "state": self.connection_state,
+            "failed_probes": self._failed_probes,
+            "next_probe_in": max(0.0, self._next_probe_at - time.monotonic())
+            if self.connection_state is ConnectionState.OFFLINE
+            else None,
+            "stale_addresses": sorted(self._stale_addresses),
+        }
+
+    def _offline_message(self) -> str:
+        return (
+            f"{self.unique_id} is offline, next reconnect attempt in "
+            f"{max(0.0, self._next_probe_at - time.monotonic()):.0f} s"
+        )
+
+    def _raise_if_offline(self) -> None:
+        """Fail fast instead of waiting for a device that is known to be offline."""
+        if self.connection_state is ConnectionState.OFFLINE:
+            raise CommunicationException(self._offline_message())
+
+    async def _async_probe(self) -> None:
+        """Check with a single read whether an offline device is reachable again.
+
+        The backoff is applied through the update interval. The scheduler can
+        fire slightly before the probe is due, so a refresh always probes.
+        """
+        deadline = (
+            time.monotonic() + UPDATE_INTERVAL.total_seconds() * UPDATE_DEADLINE_RATIO
+        )
+        try:
+            await self._get_modbus_register(MODEL_ADDRESSES[0], deadline=deadline)
+        except (CommunicationException, DeferredException, OfflineException) as e:
+            self._set_offline()
+            raise UpdateFailed(self._offline_message()) from e
+        self._set_online()
+
+    async def _async_setup(self) -> None:
+        if (data := await self._layout_store.async_load()) is not None:
+            self.layout = DeviceLayout.from_dict(data)
+            self._read_plan = None
+
+    async def _async_update_data(self) -> RegisterSnapshot:
+        # Listeners are all updated unless the update succeeds after a successful one
+        self._changed_bits = None
+        if self.connection_state is ConnectionState.OFFLINE:
+            await self._async_probe()
+        if self._updates_since_learned >= LAYOUT_RELEARN_UPDATES:
+            self._relearn_layout()
+        # Blocks that are not due keep their values from the previous update
+        snapshot = (
+            self.data
+            if self.data is not None
+            else RegisterSnapshot(REGISTERS.encodings)
+        )
+        # Listeners added while reading are updated by the next update
+        pending, self._pending_addresses = self._pending_addresses, set()
+        changed_bits = dict.fromkeys(pending, ALL_BITS)
+        now = time.monotonic()
+        blocks = self.due_blocks(now)
+        assert self.update_interval is not None
+        deadline = now + self.update_interval.total_seconds() * UPDATE_DEADLINE_RATIO
+
+        try:
+            if self.bus.owner_depth(self) > 1:
+                results = await self._read_blocks_pipelined(blocks, deadline)
+            else:
+                results = await self._read_blocks_sequential(blocks, deadline)
+        except BaseException:
+            self._pending_addresses |= pending
+            raise
+
+        failed_blocks = [
+            block
+            for block, values in zip(blocks, results, strict=True)
+            if isinstance(values, Exception)
+        ]
+        self._add_to_history(blocks, results)
+        if error := self._unreachable_error(results):
+            self._pending_addresses |= pending
+            self._set_offline()
+            raise UpdateFailed("Could not retrieve data from Modbus client") from error
+        self._store_blocks(snapshot, blocks, results, now, changed_bits)
+        for address in self._update_stale_addresses(now):
+            changed_bits[address] = ALL_BITS
+        self.derived.update(snapshot, now, self._stale_addresses)
+        self._schedule_block_retry(failed_blocks)
+        self.metrics.update_duration.add(time.monotonic() - now)
+        self._updates_since_learned += 1
+
+        if self.data is not None and self.last_update_success:
+            self._changed_bits = changed_bits
+        return snapshot
 
-        async def _retrieve_multiple_values(address: int, count: int) -> None:
-            values = await self._get_modbus_register(address, count)
+    def _unreachable_error(
+        self, results: list[list[int] | Exception | None]
+    ) -> Exception | None:
+        """Return why the device is unreachable, if the results of reading show it.
+
+        The device is unreachable when no block was read, and either the
+        connection failed, several requests in a row got no response, or
+        waiting for a request that got no response left no time for the other
+        blocks. The latter is how a device that does not respond shows before
+        round trips were measured, as the first request times out at the
+        deadline of the update.
+        """
+        if any(isinstance(values, list) for values in results):
+            return None
+        for values in results:
+            if isinstance(values, OfflineException):
+                return values
+        if any(isinstance(values, ErrorResponseException) for values in results):
+            # The device answered
+            return None
+        unanswered = next(
+            (
+                values
+                for values in results
+                if isinstance(values, CommunicationException)
+            ),
+            None,
+        )
+        if self._unanswered_requests >= OFFLINE_UNANSWERED_REQUESTS or None in results:
+            return unanswered
+        return None
+
+    def _add_to_history(
+        self,
+        blocks: list[ReadBlock],
+        results: list[list[int] | Exception | None],
+        *,
+        retry: bool = False,
+    ) -> None:
+        """Record the raw result of reading blocks, and why blocks failed."""
+        errors: dict[ReadBlock, str] = {}
+        for block, values in zip(blocks, results, strict=True):
+            if isinstance(values, list):
+                continue
             if values is None:
-                return
-            for i in range(count):
-                data_dict[address + i] = values[i]
+                errors[block] = "deferred"
+            elif isinstance(values, ErrorResponseException):
+                errors[block] = f"exception code {values.exception_code}"
+            else:
+                errors[block] = type(values.__cause__ or values).__name__
+        self.history.add(time.time(), blocks, results, errors, retry=retry)
+
+    def _store_blocks(
+        self,
+        snapshot: RegisterSnapshot,
+        blocks: list[ReadBlock],
+        results: list[list[int] | Exception | None],
+        read_at: float,
+        changed_bits: dict[int, int],
+    ) -> None:
+        """Store the blocks that were read and add the bits that flipped."""
+        for block, values in zip(blocks, results, strict=True):
+            if isinstance(values, list):
+                self._block_read_at[block] = read_at
+                for address, flipped in snapshot.update_block(
+                    block.address, values, read_at
+                ).items():
+                    changed_bits[address] = changed_bits.get(address, 0) | flipped
 
+    def is_stale(self, address: int, now: float | None = None) -> bool:
+        """Return whether a register has not been read for too long.
+
+        A register is stale when its value is older than the polling interval of
+        its tier plus the maximum value age.
+        """
+        if self.data is None or (age := self.data.age(address, now)) is None:
+            return False
+        match REGISTERS.tier(address):
+            case RegisterTier.FAST:
+                interval = UPDATE_INTERVAL.total_seconds()
+            case RegisterTier.SLOW:
+                interval = SLOW_TIER_INTERVAL.total_seconds()
+            case RegisterTier.STATIC:
+                return False
+        return age > interval + self.max_value_age
+
+    def _update_stale_addresses(self, now: float) -> set[int]:
+        """Return the addresses that became stale or fresh again."""
+        stale_addresses = {
+            address
+            for address in self._address_listeners
+            if self.is_stale(address, now)
+        }
+        changed_addresses = stale_addresses ^ self._stale_addresses
+        self._stale_addresses = stale_addresses
+        return changed_addresses
+
+    def _schedule_block_retry(self, blocks: list[ReadBlock]) -> None:
+        """Read blocks that failed again, before the next update."""
+        if self._unsub_block_retry is not None:
+            self._unsub_block_retry()
+            self._unsub_block_retry = None
+        if blocks:
+            self._unsub_block_retry = async_call_later(
+                self.hass,
+                BLOCK_RETRY_DELAY,
+                partial(self._async_retry_blocks, blocks),
+            )
+
+    async def _async_retry_blocks(
+        self, blocks: list[ReadBlock], _now: datetime
+    ) -> None:
+        self._unsub_block_retry = None
+        blocks = [block for block in blocks if block in self.read_plan]
+        if not blocks or self.connection_state is ConnectionState.OFFLINE:
+            return
+        now = time.monotonic()
+        deadline = now + BLOCK_RETRY_DELAY
+        self.metrics.block_retries += len(blocks)
+        results = await self._read_blocks_sequential(blocks, deadline)
+        self._add_to_history(blocks, results, retry=True)
+        changed_bits: dict[int, int] = {}
+        self._store_blocks(self.data, blocks, results, now, changed_bits)
+        for address in self._update_stale_addresses(now):
+            changed_bits[address] = ALL_BITS
+        self.derived.update(self.data, now, self._stale_addresses)
+        if changed_bits:
+            self._changed_bits = changed_bits
+            self.async_update_listeners()
+
+    async def _read_blocks_sequential(
+        self, blocks: list[ReadBlock], deadline: float
+    ) -> list[list[int] | Exception | None]:
+        """Read the blocks one after another.
+
+        A block the device does not answer is skipped. When the connection fails,
+        or several requests in a row are not answered, the device is probably not
+        reachable and the other blocks are not read.
+        """
+        results: list[list[int] | Exception | None] = []
+        for block in blocks:
+            try:
+                results.append(await self._read_block(block, deadline))
+            except ErrorResponseException as e:
+                results.append(e)
+            except OfflineException as e:
+                results.append(e)
+                break
+            except CommunicationException as e:
+                results.append(e)
+                if self._unanswered_requests >= OFFLINE_UNANSWERED_REQUESTS:
+                    break
+        results.extend(None for _ in range(len(blocks) - len(results)))
+        return results
+
+    async def _read_blocks_pipelined(
+        self, blocks: list[ReadBlock], deadline: float
+    ) -> list[list[int] | Exception | None]:
+        """Read the blocks concurrently, one transaction in flight per client."""
+
+        async def _read_block(
+            block: ReadBlock,
+        ) -> list[int] | Exception | None:
+            try:
+                return await self._read_block(block, deadline)
+            except (CommunicationException, OfflineException) as e:
+                return e
+
+        return await asyncio.gather(*(_read_block(block) for block in blocks))
+
+    async def _read_block(self, block: ReadBlock, deadline: float) -> list[int] | None:
+        """Read a block of the read plan, unless it would overrun the update.
+
+        Returns None when the block is deferred to the next update.
+        """
         try:
-            await _retrieve_multiple_values(2600, 18)
-            await _retrieve_multiple_values(2700, 12)
-            await _retrieve_multiple_values(2800, 7)
-            await _retrieve_multiple_values(3000, 6)
-            await _retrieve_multiple_values(4200, 79)
-            await _retrieve_multiple_values(4300, 19)
-            await _retrieve_multiple_values(7000, 6)
-        except CommunicationException as e:
-            raise UpdateFailed("Could not retrieve data from Modbus client") from e
-
-        return data_dict
+            return await self._read_registers(
+                block.address, block.count, deadline=deadline
+            )
+        except DeferredException:
+            self.logger.debug(
+                "Deferred reading %s registers at %s to the next update",
+                block.count,
+                block.address,
+            )
+            return None
+        except ErrorResponseException as e:
+            # Only a rejection of the registers says something about the layout
+            if e.rejected and block.count > 1 and block not in self._learning_blocks:
+                self._learning_blocks.add(block)
+                self.config_entry.async_create_background_task(
+                    self.hass,
+                    self._async_learn_block_layout(block),
+                    f"{DOMAIN} split block {block.address}/{block.count}",
+                )
+            raise
+
+    async def async_scan_registers(
+        self, start: int, end: int, pace: float = 0.0
+    ) -> ScanResult:
+        """Find the readable holding registers in [start, end).
+
+        The result is added to the layout of the device, so the read plan leaves
+        out the registers that cannot be read. Ranges that were skipped, as their
+        requests kept failing without being rejected, are not added.
+        """
+        self._raise_if_offline()
+
+        async def _read(address: int, count: int) -> list[int] | None:
+            try:
+                async with self.bus.transaction(self) as client:
+                    result = await client.read_holding_registers(
+                        address, count=count, device_id=self.device_id
+                    )
+            except (ModbusException, TimeoutError) as e:
+                raise CommunicationException from e
+            if not result.isError():
+                return result.registers
+            code = getattr(result, "exception_code", None)
+            if code in REJECTED_EXCEPTION_CODES:
+                return None
+            raise ErrorResponseException(
+                f"Error response reading {count} registers at {address}", code
+            )
+
+        result = await scan_registers(
+            _read, start, end, max_count=self.layout.max_count, pace=pace
+        )
+        readable = result.readable
+        self.logger.info(
+            "Readable registers of %s in %s-%s: %s",
+            self.unique_id,
+            start,
+            end - 1,
+            readable,
+        )
+        if result.skipped:
+            self.logger.warning(
+                "Could not scan registers %s of %s, they are still read",
+                result.skipped,
+                self.unique_id,
+            )
+
+        # Replace what an earlier scan found in the same range
+        self.layout.readable = merge_ranges(
+            [
+                *subtract_range(self.layout.readable, start, end),
+                *readable,
+            ]
+        )
+        # Nothing is known about the skipped ranges, like before any scan
+        scanned = [*self.layout.scanned, (start, end - start)]
+        for address, count in result.skipped:
+            scanned = subtract_range(scanned, address, address + count)
+        self.layout.scanned = merge_ranges(scanned)
+        self._save_layout()
+        return result
+
+    async def _async_learn_block_layout(self, block: ReadBlock) -> None:
+        """Find out why the device rejects a block and adapt the read plan.
+
+        Only rejections of the registers are learned from. When another error
+        occurs while splitting the block, nothing is learned.
+        """
+
+        async def _read(address: int, count: int) -> list[int] | None:
+            try:
+                return await self._read_registers(address, count)
+            except ErrorResponseException as e:
+                if e.rejected:
+                    return None
+                raise
+
+        try:
+            layout = await learn_block_layout(_read, block.address, block.count)
+        except (CommunicationException, OfflineException) as e:
+            self.logger.debug("Could not split block %s: %s", block, e)
+            return
+        finally:
+            self._learning_blocks.discard(block)
+
+        if layout.unreadable:
+            self.logger.info(
+                "Registers %s of %s cannot be read, leaving them out",
+                layout.unreadable,
+                self.unique_id,
+            )
+            self.layout.unreadable.update(layout.unreadable)
+        elif layout.max_count is not None:
+            self.logger.info(
+                "%s accepts at most %s registers per request",
+                self.unique_id,
+                layout.max_count,
+            )
+            self.layout.max_count = min(self.layout.max_count, layout.max_count)
+        else:
+            self.logger.debug("Block %s can be read after all", block)
+            return
+
+        self._updates_since_learned = 0
+        self._save_layout()
+
+    def _relearn_layout(self) -> None:
+        """Try reading what the device rejected before, in the plan of this update."""
+        self._updates_since_learned = 0
+        if not self.layout.learned:
+            return
+        self.logger.info(
+            "Reading registers %s of %s again, up to %s per request",
+            sorted(self.layout.unreadable),
+            self.unique_id,
+            MODBUS_MAX_READ_COUNT,
+        )
+        self.layout.forget_learned()
+        self._layout_store.async_delay_save(self.layout.as_dict, LAYOUT_SAVE_DELAY)
+        self._read_plan = None
+
+    def _save_layout(self) -> None:
+        """Store the layout and read by the read plan it results in."""
+        self._layout_store.async_delay_save(self.layout.as_dict, LAYOUT_SAVE_DELAY)
+        self._read_plan = None
+        self._read_plan_refresh.async_schedule_call()
 
     async def _get_modbus_register(
-        self, address: int, count: int = 1
+        self,
+        address: int,
+        count: int = 1,
+        priority: TransactionPriority = TransactionPriority.POLL,
+        deadline: float | None = None,
     ) -> list[int] | None:
-        """Fetch value from Modbus."""
+        """Fetch value from Modbus, None when the device answers with an error."""
         try:
-            if not self.client.connected:
-                connected = await self.client.connect()
-                if not connected:
-                    raise OfflineException
-            result = await self.client.read_holding_registers(
-                address, count=count, slave=self.device_id
-            )
+            return await self._read_registers(address, count, priority, deadline)
+        except ErrorResponseException:
+            return None
+
+    async def _read_registers(
+        self,
+        address: int,
+        count: int = 1,
+        priority: TransactionPriority = TransactionPriority.POLL,
+        deadline: float | None = None,
+    ) -> list[int]:
+        """Read holding registers, raising ErrorResponseException on an error."""
+        try:
+            async with self.bus.transaction(self, priority, deadline) as client:
+                sent_at = time.monotonic()
+                result = await client.read_holding_registers(
+                    address, count=count, device_id=self.device_id
+                )
+                self.metrics.add_read(address, count, time.monotonic() - sent_at)
+            self._unanswered_requests = 0
             if result.isError():
+                code = getattr(result, "exception_code", None)
+                self.metrics.add_error_response(address, count, code)
                 self.logger.error(
                     "Error reading Modbus register at address %s: %s",
                     address,
                     result,
                 )
-                return None
-        except ModbusException as e:
+                raise ErrorResponseException(
+                    f"Error response reading {count} registers at {address}", code
+                )
+        except (ModbusException, TimeoutError) as e:
+            self._unanswered_requests += 1
+            if isinstance(e, TimeoutError | ModbusIOException):
+                # No response was received in time
+                self.metrics.timeouts += 1
             self.logger.error("Error fetching data for address %s: %s", address, e)
             raise CommunicationException from e
         else:
             return result.registers
 
+    async def get_modbus_register_for_update(self, address: int) -> int:
+        """Get the current value of a register that is about to be modified.
+
+        The value from the last update is used when it is recent enough, otherwise
+        the register is read again.
+        """
+        self._raise_if_offline()
+        age = self.data.age(address) if self.data is not None else None
+        if age is not None and age < self.cache_max_age:
+            return self.data[address]
+
+        current_value = await self._get_modbus_register(
+            address, priority=TransactionPriority.WRITE
+        )
+        if current_value is None:
+            raise CommunicationException(
+                f"Could not read current value from register {address}"
+            )
+        return current_value[0]
+
     async def set_modbus_register(self, address: int, value: int) -> None:
         """Set value to Modbus."""
+        self._raise_if_offline()
+        async with self._register_locks[address]:
+            written = await self._write_modbus_registers(address, [value])
+            await self._handle_registers_written(written)
+
+    async def set_modbus_registers(self, values: Mapping[int, int]) -> None:
+        """Set the values of several registers as a single operation.
+
+        Contiguous registers are written in a single request. When one of the
+        writes fails, the registers that were already written are restored to
+        the values they had before.
+        """
+        self._raise_if_offline()
+        async with self._lock_registers(values):
+            previous = {
+                address: await self.get_modbus_register_for_update(address)
+                for address in values
+            }
+            await self._write_register_values(values, previous)
+
+    async def set_modbus_bits(self, bits: Mapping[int, Mapping[int, bool]]) -> None:
+        """Set bits of several registers as a single read-modify-write.
+
+        All registers are locked while they are read and written, so bits set in
+        the meantime, like by set_modbus_bit, are not overwritten with the values
+        read before.
+        """
+        self._raise_if_offline()
+        async with self._lock_registers(bits):
+            previous: dict[int, int] = {}
+            values: dict[int, int] = {}
+            for address, register_bits in bits.items():
+                current_value = await self.get_modbus_register_for_update(address)
+                new_value = current_value
+                for bit, value in register_bits.items():
+                    if value:
+                        new_value |= 1 << bit
+                    else:
+                        new_value &= ~(1 << bit)
+                if new_value != current_value:
+                    previous[address] = current_value
+                    values[address] = new_value
+            if values:
+                await self._write_register_values(values, previous)
+
+    @asynccontextmanager
+    async def _lock_registers(self, addresses: Iterable[int]) -> AsyncIterator[None]:
+        """Lock registers in ascending order, so two operations cannot deadlock."""
+        async with AsyncExitStack() as stack:
+            for address in sorted(addresses):
+                await stack.enter_async_context(self._register_locks[address])
+            yield
+
+    async def _write_register_values(
+        self, values: Mapping[int, int], previous: Mapping[int, int]
+    ) -> None:
+        """Write registers, restoring the ones written when a write fails.
+
+        The registers written are restored to their values in `previous`, which
+        were read while the registers were locked.
+        """
+        written: dict[int, int] = {}
         try:
-            if not self.client.connected:
-                connected = await self.client.connect()
-                if not connected:
-                    raise OfflineException
-            result = await self.client.write_register(
-                address, value, slave=self.device_id
+            for address, run in build_write_plan(values):
+                written.update(await self._write_modbus_registers(address, run))
+        except (CommunicationException, OfflineException):
+            await self._restore_modbus_registers(
+                {address: previous[address] for address in written}
             )
+            raise
+        await self._handle_registers_written(written)
+
+    async def _restore_modbus_registers(self, previous: Mapping[int, int]) -> None:
+        """Write back the previous values of registers after a failed write."""
+        for address, value in previous.items():
+            try:
+                await self._write_modbus_registers(address, [value])
+            except (CommunicationException, OfflineException) as e:
+                self.logger.error("Error restoring register %s: %s", address, e)
+        if previous:
+            await self.refresh_addresses(previous)
+
+    async def _write_modbus_registers(
+        self, address: int, values: list[int]
+    ) -> dict[int, int]:
+        """Write contiguous registers and return the written values."""
+        try:
+            async with self.bus.transaction(self, TransactionPriority.WRITE) as client:
+                if len(values) == 1:
+                    result = await client.write_register(
+                        address, values[0], device_id=self.device_id
+                    )
+                else:
+                    result = await client.write_registers(
+                        address, values, device_id=self.device_id
+                    )
             if result.isError():
                 self.logger.error(
                     "Error writing Modbus register at address %s: %s",
@@ -169,48 +1023,73 @@ class ClivetCoordinator(DataUpdateCoordinator[dict[int, int | None]]):
                 raise CommunicationException(
                     f"Error writing to Modbus register {address}"
                 )
-
-            await self.refresh_single_address(address)
-        except ModbusException as e:
+        except (ModbusException, TimeoutError) as e:
             self.logger.error("Error setting data for address %s: %s", address, e)
             raise CommunicationException from e
 
+        if len(values) == 1:
+            # The response to a single register write echoes the written value
+            return {address: result.registers[0]}
+        return {address + i: value for i, value in enumerate(values)}
+
     async def set_modbus_bit(self, address: int, bit: int, value: bool) -> None:
-        """Set a specific bit in a Modbus register."""
-        try:
-            if not self.client.connected:
-                connected = await self.client.connect()
-                if not connected:
-                    raise OfflineException
-            current_value = await self._get_modbus_register(address)
-            if current_value is None:
-                raise CommunicationException(
-                    f"Could not read current value from register {address}"
-                )
+        """Set a specific bit in a Modbus register.
 
-            # Modify the specific bit
-            if value:
-                new_value = current_value[0] | (1 << bit)
-            else:
-                new_value = current_value[0] & ~(1 << bit)
+        Bit changes to the same register that arrive within a short window are
+        written together in a single read-modify-write.
+        """
+        self._raise_if_offline()
+        if (pending := self._pending_bit_writes.get(address)) is None:
+            pending = self._pending_bit_writes[address] = _PendingBitWrite(
+                self.hass.loop.create_future()
+            )
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self._write_pending_bits(address, pending),
+                f"{DOMAIN} write bits of register {address}",
+            )
 
-            if new_value == current_value[0]:
-                return
+        if value:
+            pending.set_mask |= 1 << bit
+            pending.clear_mask &= ~(1 << bit)
+        else:
+            pending.clear_mask |= 1 << bit
+            pending.set_mask &= ~(1 << bit)
+        await asyncio.shield(pending.future)
 
-            result = await self.client.write_register(
-                address, new_value, slave=self.device_id
-            )
-            if result.isError():
-                self.logger.error(
-                    "Error writing Modbus register at address %s: %s",
-                    address,
-                    result,
-                )
-                raise CommunicationException(
-                    f"Failed to write Modbus register {address}"
+    async def _write_pending_bits(
+        self, address: int, pending: _PendingBitWrite
+    ) -> None:
+        """Write the bit changes to a register, and resolve their waiting callers.
+
+        The callers are always resolved: with the error when the write fails,
+        and cancelled when the write is, like when the entry is unloaded.
+        """
+        try:
+            await asyncio.sleep(BIT_WRITE_WINDOW)
+            async with self._register_locks[address]:
+                # Bit changes from now on are written after this write
+                del self._pending_bit_writes[address]
+                await self._write_modbus_bits(
+                    address, pending.set_mask, pending.clear_mask
                 )
+        except Exception as e:
+            pending.future.set_exception(e)
+        else:
+            pending.future.set_result(None)
+        finally:
+            if self._pending_bit_writes.get(address) is pending:
+                del self._pending_bit_writes[address]
+            if not pending.future.done():
+                pending.future.cancel()
 
-            await self.refresh_single_address(address)
-        except ModbusException as e:
-            self.logger.error("Error setting bit for address %s: %s", address, e)
-            raise CommunicationException from e
+    async def _write_modbus_bits(
+        self, address: int, set_mask: int, clear_mask: int
+    ) -> None:
+        current_value = await self.get_modbus_register_for_update(address)
+        new_value = (current_value | set_mask) & ~clear_mask
+        if new_value == current_value:
+            return
+
+        written = await self._write_modbus_registers(address, [new_value])
+        await self._handle_registers_written(written)
@@ -0,0 +1,145 @@
+"""Performance of the heat pump, derived from its registers once per poll."""
+
+from collections import deque
+from collections.abc import Container
+
+from .registers import RegisterBit, RegisterSnapshot
+
+# Registers the performance is derived from
+CURRENT_ADDRESS = 4309
+VOLTAGE_ADDRESS = 4310
+FLOW_RATE_ADDRESS = 4273
+INLET_TEMPERATURE_ADDRESS = 4210
+OUTLET_TEMPERATURE_ADDRESS = 4211
+# Set while heating, cleared while cooling
+HEATING_MODE_BIT = RegisterBit(4263, 1)
+
+INPUT_REGISTERS: tuple[int | RegisterBit, ...] = (
+    CURRENT_ADDRESS,
+    VOLTAGE_ADDRESS,
+    FLOW_RATE_ADDRESS,
+    INLET_TEMPERATURE_ADDRESS,
+    OUTLET_TEMPERATURE_ADDRESS,
+    HEATING_MODE_BIT,
+)
+
+# Heat capacity of a liter of water at the temperatures of a heating circuit, in
+# kJ/(l K)
+WATER_HEAT_CAPACITY = 4.18
+
+# Electrical power in kW below which the compressor is considered off, and the
+# COP is unknown
+MIN_ELECTRICAL_POWER = 0.05
+
+# Seconds of operation the rolling COP is computed over
+ROLLING_COP_WINDOW = 3600.0
+
+# Electrical energy in kWh the rolling COP needs, so it is not the ratio of two
+# tiny numbers right after the compressor started
+ROLLING_COP_MIN_ENERGY = 0.01
+
+# Polls further apart than this in seconds are not integrated, so an outage does
+# not count as running at the power of the poll before it
+MAX_INTEGRATION_STEP = 60.0
+
+
+class DerivedMetrics:
+    """Electrical power, thermal output and COP of the heat pump.
+
+    The values are computed from the register snapshot after each poll, instead
+    of by templates on every state change of the registers they depend on. The
+    rolling COP is the thermal energy over the electrical energy of the last
+    hour, so the energy lost to defrosting counts against it.
+    """
+
+    def __init__(self, window: float = ROLLING_COP_WINDOW) -> None:
+        self._window = window
+        # Electrical and thermal power in kW
+        self.electrical_power: float | None = None
+        self.thermal_power: float | None = None
+        self.cop: float | None = None
+        self.rolling_cop: float | None = None
+        # Monotonic time, and thermal and electrical energy in kWh since the
+        # previous poll
+        self._energy: deque[tuple[float, float, float]] = deque()
+        self._updated_at: float | None = None
+
+    def update(
+        self, snapshot: RegisterSnapshot, now: float, stale: Container[int] = ()
+    ) -> None:
+        """Compute the metrics from the registers of a poll."""
+        values = {
+            address: None if address in stale else snapshot.decoded.get(address)
+            for address in (
+                CURRENT_ADDRESS,
+                VOLTAGE_ADDRESS,
+                FLOW_RATE_ADDRESS,
+                INLET_TEMPERATURE_ADDRESS,
+                OUTLET_TEMPERATURE_ADDRESS,
+            )
+        }
+        # Energy in the previous step was produced at the previous power
+        if (
+            self._updated_at is not None
+            and now - self._updated_at <= MAX_INTEGRATION_STEP
+            and self.electrical_power is not None
+            and self.thermal_power is not None
+        ):
+            hours = (now - self._updated_at) / 3600
+            self._energy.append(
+                (now, self.thermal_power * hours, self.electrical_power * hours)
+            )
+        self._updated_at = now
+        while self._energy and self._energy[0][0] <= now - self._window:
+            self._energy.popleft()
+
+        current = values[CURRENT_ADDRESS]
+        voltage = values[VOLTAGE_ADDRESS]
+        self.electrical_power = (
+            current * voltage / 1000
+            if current is not None and voltage is not None
+            else None
+        )
+
+        flow_rate = values[FLOW_RATE_ADDRESS]
+        inlet = values[INLET_TEMPERATURE_ADDRESS]
+        outlet = values[OUTLET_TEMPERATURE_ADDRESS]
+        if flow_rate is None or inlet is None or outlet is None:
+            self.thermal_power = None
+        else:
+            # Cooling takes heat out of the water, which is its output
+            status = (
+                None
+                if HEATING_MODE_BIT.address in stale
+                else snapshot.get(HEATING_MODE_BIT.address)
+            )
+            cooling = status is not None and not status >> HEATING_MODE_BIT.bit & 1
+            delta = inlet - outlet if cooling else outlet - inlet
+            self.thermal_power = flow_rate / 60 * WATER_HEAT_CAPACITY * delta
+
+        if (
+            self.electrical_power is None
+            or self.thermal_power is None
+            or self.electrical_power < MIN_ELECTRICAL_POWER
+        ):
+            self.cop = None
+        else:
+            # The water is cooled down while defrosting, which is no output
+            self.cop = max(0.0, self.thermal_power) / self.electrical_power
+
+        thermal_energy = sum(thermal for _, thermal, _ in self._energy)
+        electrical_energy = sum(electrical for _, _, electrical in self._energy)
+        self.rolling_cop = (
+            thermal_energy / electrical_energy
+            if electrical_energy >= ROLLING_COP_MIN_ENERGY
+            else None
+        )
+
+    def as_dict(self) -> dict[str, float | None]:
+        """Return the metrics for diagnostics."""
+        return {
+            "electrical_power": self.electrical_power,
+            "thermal_power": self.thermal_power,
+            "cop": self.cop,
+            "rolling_cop": self.rolling_cop,
+        }
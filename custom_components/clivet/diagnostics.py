@@ -8,4 +8,17 @@ async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: ConfigEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
-    return entry.runtime_data.data
+    coordinator = entry.runtime_data
+    return {
+        "registers": coordinator.data.as_dict(),
+        "decoded": dict(sorted(coordinator.data.decoded.items())),
+        "read_plan": [
+            [block.address, block.count, block.tier] for block in coordinator.read_plan
+        ],
+        "connection": coordinator.connection_info(),
+        "bus": coordinator.bus.as_dict(),
+        "metrics": coordinator.metrics.as_dict(),
+        "derived": coordinator.derived.as_dict(),
+        "layout": coordinator.layout.as_dict(),
+        "history": coordinator.history.as_dict(),
+    }
@@ -1,29 +1,21 @@
-from enum import StrEnum
-
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, ClivetDevice
 from .coordinator import ClivetCoordinator
+from .registers import RegisterBit, compile_decoder
 
 
-class ClivetDevice(StrEnum):
-    HEAT_PUMP = "heat_pump"
-    DHW = "dhw"
-    COMPRESSOR = "compressor"
-
-    def device_name(self) -> str:
-        match self.value:
-            case ClivetDevice.HEAT_PUMP:
-                return "Heat Pump"
-            case ClivetDevice.DHW:
-                return "Domestic Hot Water"
-            case ClivetDevice.COMPRESSOR:
-                return "Compressor"
-            case _:
-                raise NotImplementedError(
-                    f"Device type {self.value} is not implemented"
-                )
+def build_device_info(
+    coordinator: ClivetCoordinator, device: ClivetDevice
+) -> DeviceInfo:
+    """Return the info of a device of the heat pump."""
+    return DeviceInfo(
+        manufacturer="Clivet",
+        name=device.device_name(),
+        model=coordinator.model_name(),
+        identifiers={(DOMAIN, f"{coordinator.unique_id}_{device}")},
+    )
 
 
 class ClivetBaseEntity(CoordinatorEntity[ClivetCoordinator]):
@@ -40,18 +32,27 @@ class ClivetBaseEntity(CoordinatorEntity[ClivetCoordinator]):
         self._attr_name = name
         self._attr_unique_id = f"{coordinator.unique_id}_{address}"
 
-        self._attr_device_info = DeviceInfo(
-            manufacturer="Clivet",
-            name=device.device_name(),
-            model=coordinator.model_name(),
-            identifiers={(DOMAIN, f"{coordinator.unique_id}_{device}")},
-        )
-        super().__init__(coordinator)
+        self._attr_device_info = build_device_info(coordinator, device)
+        super().__init__(coordinator, context=self.registers)
+
+    @property
+    def addresses(self) -> tuple[int, ...]:
+        """Return the register addresses this entity reads."""
+        return (self.address,)
+
+    @property
+    def registers(self) -> tuple[int | RegisterBit, ...]:
+        """Return the registers, or bits of registers, the state depends on."""
+        return self.addresses
 
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return super().available and self.address in self.coordinator.data
+        return (
+            super().available
+            and self.address in self.coordinator.data
+            and not self.coordinator.is_stale(self.address)
+        )
 
     @staticmethod
     def set_bit_value(current_value: int, bit: int, value: bool) -> int:
@@ -89,6 +90,13 @@ class ClivetBooleanBaseEntity(ClivetBaseEntity):
         )
         self._attr_unique_id += f"{'_inverted' if invert else ''}"
 
+    @property
+    def registers(self) -> tuple[int | RegisterBit, ...]:
+        """Return the bit of the register the state depends on."""
+        if self.bit is None:
+            return self.addresses
+        return (RegisterBit(self.address, self.bit),)
+
     @staticmethod
     def decode_bool(
         register: int | None, bit: int | None = None, invert: bool = False
@@ -118,6 +126,7 @@ class ClivetNumericBaseEntity(ClivetBaseEntity):
     ) -> None:
         self.signed = signed
         self.scale = scale
+        self._decode = compile_decoder(scale, signed)
         super().__init__(
             address=address, name=name, device=device, coordinator=coordinator
         )
@@ -133,19 +142,5 @@ class ClivetNumericBaseEntity(ClivetBaseEntity):
     def encode_numeric_value(self, value: float) -> int:
         return self.encode_number(value=value, scale=self.scale, signed=self.signed)
 
-    @staticmethod
-    def decode_number(
-        register: int | None, scale: float, signed: bool
-    ) -> int | float | None:
-        if register is None or register == 0x7FFE:
-            return None
-        if signed and register >= 0x8000:
-            register -= 0x10000  # convert 16-bit two's complement to negative value
-        if scale != 1:
-            return register * scale
-        return register
-
     def decode_numeric_value(self, register: int | None) -> int | float | None:
-        return self.decode_number(
-            register=register, scale=self.scale, signed=self.signed
-        )
+        return self._decode(register) if register is not None else None
@@ -1,5 +1,10 @@
 from homeassistant.exceptions import HomeAssistantError
 
+# Modbus exception codes with which a device rejects the registers of a request:
+# illegal data address and illegal data value. Other codes, like those of a
+# gateway that got no response, say nothing about which registers can be read.
+REJECTED_EXCEPTION_CODES = frozenset({0x02, 0x03})
+
 
 class OfflineException(Exception):
     """Exception raised when the Modbus client is offline."""
@@ -15,5 +20,29 @@ class CommunicationException(Exception):
         super().__init__(message)
 
 
+class ErrorResponseException(CommunicationException):
+    """Exception raised when the device answers a request with an error."""
+
+    def __init__(
+        self,
+        message: str = "Error response from Modbus device",
+        exception_code: int | None = None,
+    ) -> None:
+        super().__init__(message)
+        self.exception_code = exception_code
+
+    @property
+    def rejected(self) -> bool:
+        """Return whether the device cannot read the registers of the request."""
+        return self.exception_code in REJECTED_EXCEPTION_CODES
+
+
+class DeferredException(Exception):
+    """Exception raised when a request would not finish before its deadline."""
+
+    def __init__(self, message: str = "Request deferred to the next update") -> None:
+        super().__init__(message)
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
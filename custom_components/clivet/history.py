@@ -0,0 +1,107 @@
+"""History of the last raw polls of a device, for diagnostics."""
+
+from array import array
+from collections import deque
+from collections.abc import Iterable, Mapping
+from itertools import compress
+from operator import ne
+from typing import Any, NamedTuple
+
+from homeassistant.util import dt as dt_util
+
+from .registers import ReadBlock
+
+# Number of polls kept, 10 minutes of updates
+HISTORY_POLLS = 60
+
+
+class _Poll(NamedTuple):
+    # Unix time of the poll
+    at: float
+    # Registers whose value changed, and their new values
+    addresses: array
+    values: array
+    # Blocks that could not be read, with the reason
+    errors: tuple[tuple[int, int, str], ...]
+    retry: bool
+
+
+class PollHistory:
+    """Ring buffer of the last polls of a device.
+
+    Each poll only stores the registers that changed since the previous poll,
+    in two arrays of unsigned 16-bit values, and the blocks that failed. The
+    values from before the oldest poll are kept as a base, so every poll can be
+    reconstructed.
+    """
+
+    def __init__(self, maxlen: int = HISTORY_POLLS) -> None:
+        self._polls: deque[_Poll] = deque()
+        self._maxlen = maxlen
+        # Register values before the oldest poll
+        self._base: dict[int, int] = {}
+        # Register values of the last read of each block
+        self._blocks: dict[tuple[int, int], array] = {}
+
+    def __len__(self) -> int:
+        return len(self._polls)
+
+    def add(
+        self,
+        at: float,
+        blocks: Iterable[ReadBlock],
+        results: Iterable[list[int] | Exception | None],
+        errors: Mapping[ReadBlock, str],
+        *,
+        retry: bool = False,
+    ) -> None:
+        """Record the blocks read by a poll."""
+        addresses = array("H")
+        values = array("H")
+        for block, result in zip(blocks, results, strict=True):
+            if not isinstance(result, list):
+                continue
+            block_values = array("H", result)
+            previous = self._blocks.get((block.address, block.count))
+            self._blocks[block.address, block.count] = block_values
+            if previous is None:
+                offsets: Iterable[int] = range(block.count)
+            else:
+                offsets = compress(range(block.count), map(ne, previous, block_values))
+            for offset in offsets:
+                addresses.append(block.address + offset)
+                values.append(block_values[offset])
+
+        if len(self._polls) == self._maxlen:
+            oldest = self._polls.popleft()
+            self._base.update(zip(oldest.addresses, oldest.values, strict=True))
+        self._polls.append(
+            _Poll(
+                at,
+                addresses,
+                values,
+                tuple(
+                    (block.address, block.count, error)
+                    for block, error in errors.items()
+                ),
+                retry,
+            )
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the history, each poll with the registers that changed."""
+        return {
+            "base": dict(sorted(self._base.items())),
+            "polls": [
+                {
+                    "at": dt_util.utc_from_timestamp(poll.at).isoformat(),
+                    "retry": poll.retry,
+                    "changed": dict(zip(poll.addresses, poll.values, strict=True)),
+                    "errors": {
+                        f"{address}/{count}": error
+                        for address, count, error in poll.errors
+                    },
+                }
+                for poll in self._polls
+            ],
+        }
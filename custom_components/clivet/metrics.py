@@ -0,0 +1,85 @@
+"""Rolling statistics of the requests of a device."""
+
+from collections import deque
+from typing import Any
+
+# Number of most recent samples the statistics are computed over
+SAMPLES = 200
+
+
+class RollingSamples:
+    """The most recent samples of a measurement, like round trip times."""
+
+    def __init__(self, maxlen: int = SAMPLES, min_samples: int = 1) -> None:
+        self._samples: deque[float] = deque(maxlen=maxlen)
+        self._min_samples = min_samples
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, sample: float) -> None:
+        """Record a sample."""
+        self._samples.append(sample)
+
+    def quantile(self, q: float) -> float | None:
+        """Return a quantile of the samples, if enough were recorded."""
+        if len(self._samples) < self._min_samples:
+            return None
+        samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the number of samples and their percentiles."""
+        return {
+            "samples": len(self._samples),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class DeviceMetrics:
+    """Timing and failures of the requests and updates of a device."""
+
+    def __init__(self) -> None:
+        # Seconds between sending a read request and receiving its response
+        self.read_rtt = RollingSamples()
+        self.block_rtt: dict[tuple[int, int], RollingSamples] = {}
+        # Seconds an update of the coordinator took
+        self.update_duration = RollingSamples()
+        self.timeouts = 0
+        self.error_responses = 0
+        # Exception code of the last error response to each request range
+        self.error_codes: dict[tuple[int, int], int | None] = {}
+        # Blocks read again after they failed during an update
+        self.block_retries = 0
+
+    def add_read(self, address: int, count: int, rtt: float) -> None:
+        """Record the round trip time of a read request."""
+        self.read_rtt.add(rtt)
+        if (samples := self.block_rtt.get((address, count))) is None:
+            samples = self.block_rtt[address, count] = RollingSamples()
+        samples.add(rtt)
+
+    def add_error_response(self, address: int, count: int, code: int | None) -> None:
+        """Record an error response to a read request."""
+        self.error_responses += 1
+        self.error_codes[address, count] = code
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {
+            "read_rtt": self.read_rtt.as_dict(),
+            "block_rtt": {
+                f"{address}/{count}": samples.as_dict()
+                for (address, count), samples in sorted(self.block_rtt.items())
+            },
+            "update_duration": self.update_duration.as_dict(),
+            "timeouts": self.timeouts,
+            "error_responses": self.error_responses,
+            "error_codes": {
+                f"{address}/{count}": code
+                for (address, count), code in sorted(self.error_codes.items())
+            },
+            "block_retries": self.block_retries,
+        }
@@ -0,0 +1,765 @@
+"""Register table of Clivet heat pumps.
+
+Every entity of the sensor, binary sensor, number and switch platforms is
+described by a row of the table. The table is compiled once into the entity
+descriptions of each platform, the encoding of each numeric register and the
+polling tier of each register, so platforms, the read planner and diagnostics all
+derive from it.
+"""
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+import math
+
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass
+from homeassistant.components.number import NumberDeviceClass, NumberMode
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import (
+    PERCENTAGE,
+    Platform,
+    UnitOfElectricCurrent,
+    UnitOfElectricPotential,
+    UnitOfFrequency,
+    UnitOfPower,
+    UnitOfPressure,
+    UnitOfTemperature,
+    UnitOfTime,
+    UnitOfVolume,
+    UnitOfVolumeFlowRate,
+)
+
+from .const import ClivetDevice
+from .registers import (
+    MODEL_ADDRESSES,
+    Encoding,
+    RegisterTier,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class StateFilter:
+    """Which new values of a sensor are significant enough to be written.
+
+    A value is significant when it differs from the last written one by more
+    than `absolute`, or by more than `relative` times the last written value.
+    Significant values are written at most once every `min_interval` seconds.
+    """
+
+    absolute: float = 0.0
+    relative: float = 0.0
+    min_interval: float = 0.0
+
+    def is_significant(
+        self, previous: int | float | None, value: int | float | None
+    ) -> bool:
+        """Return whether a value has to be written over the previous one."""
+        if previous is None or value is None:
+            return previous != value
+        deadband = max(self.absolute, self.relative * abs(previous))
+        delta = abs(value - previous)
+        # Scaled registers are not exact, so a change of exactly the deadband
+        # must not count as exceeding it
+        return delta > deadband and not math.isclose(delta, deadband)
+
+
+# Changes that are within the resolution or the noise of a measurement. Values
+# of sensors with other device classes, enums and counters are always written.
+STATE_FILTERS: dict[SensorDeviceClass, StateFilter] = {
+    SensorDeviceClass.TEMPERATURE: StateFilter(absolute=0.1),
+    SensorDeviceClass.PRESSURE: StateFilter(absolute=0.05),
+    SensorDeviceClass.FREQUENCY: StateFilter(absolute=1, min_interval=30),
+    SensorDeviceClass.POWER: StateFilter(absolute=0.1),
+    SensorDeviceClass.CURRENT: StateFilter(absolute=0.1),
+    SensorDeviceClass.VOLTAGE: StateFilter(absolute=2),
+    SensorDeviceClass.VOLUME_FLOW_RATE: StateFilter(relative=0.02),
+    SensorDeviceClass.DURATION: StateFilter(min_interval=60),
+}
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class RegisterDescription:
+    """An entity exposing a register, or a single bit of it."""
+
+    platform: Platform
+    address: int
+    name: str
+    device: ClivetDevice
+    # Bit of the register, the whole register is used when None
+    bit: int | None = None
+    invert: bool = False
+    # Binary sensors that are on when the bit has this value
+    bit_value: bool | None = None
+    scale: float = 1
+    signed: bool = False
+    unit: str | None = None
+    device_class: str | None = None
+    state_class: SensorStateClass | None = None
+    # Names of the values of enum sensors
+    options: Mapping[int, str] | None = None
+    min_value: float = 0
+    max_value: float = 100
+    mode: NumberMode = NumberMode.AUTO
+    tier: RegisterTier = RegisterTier.FAST
+    # Sensors that write every new value when None
+    state_filter: StateFilter | None = None
+
+    @property
+    def numeric(self) -> bool:
+        """Return whether the entity shows the decoded number of the register."""
+        return (
+            self.platform in (Platform.NUMBER, Platform.SENSOR) and self.options is None
+        )
+
+
+def _sensor(
+    address: int,
+    name: str,
+    device: ClivetDevice,
+    *,
+    unit: str | None = None,
+    scale: float = 1,
+    device_class: SensorDeviceClass | None = None,
+    state_class: SensorStateClass = SensorStateClass.MEASUREMENT,
+    tier: RegisterTier = RegisterTier.FAST,
+) -> RegisterDescription:
+    # Counters are always written, so no increment is lost in the statistics
+    state_filter = (
+        STATE_FILTERS.get(device_class)
+        if device_class is not None and state_class is SensorStateClass.MEASUREMENT
+        else None
+    )
+    return RegisterDescription(
+        platform=Platform.SENSOR,
+        address=address,
+        name=name,
+        device=device,
+        unit=unit,
+        scale=scale,
+        device_class=device_class,
+        state_class=state_class,
+        tier=tier,
+        state_filter=state_filter,
+    )
+
+
+def _temperature_sensor(
+    address: int, name: str, device: ClivetDevice
+) -> RegisterDescription:
+    return RegisterDescription(
+        platform=Platform.SENSOR,
+        address=address,
+        name=name,
+        device=device,
+        unit=UnitOfTemperature.CELSIUS,
+        scale=0.1,
+        signed=True,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        state_filter=STATE_FILTERS[SensorDeviceClass.TEMPERATURE],
+    )
+
+
+def _status_sensor(
+    address: int, name: str, device: ClivetDevice, options: Mapping[int, str]
+) -> RegisterDescription:
+    return RegisterDescription(
+        platform=Platform.SENSOR,
+        address=address,
+        name=name,
+        device=device,
+        device_class=SensorDeviceClass.ENUM,
+        options=options,
+    )
+
+
+def _status_bits(
+    address: int,
+    device: ClivetDevice,
+    status_map: Mapping[int, str | tuple[str, BinarySensorDeviceClass]],
+) -> list[RegisterDescription]:
+    """Return a binary sensor for each bit of a status register."""
+    return [
+        RegisterDescription(
+            platform=Platform.BINARY_SENSOR,
+            address=address,
+            name=status if isinstance(status, str) else status[0],
+            device=device,
+            bit=bit,
+            device_class=None if isinstance(status, str) else status[1],
+        )
+        for bit, status in status_map.items()
+    ]
+
+
+def _switch(
+    address: int, bit: int, name: str, device: ClivetDevice, *, invert: bool = False
+) -> RegisterDescription:
+    return RegisterDescription(
+        platform=Platform.SWITCH,
+        address=address,
+        name=name,
+        device=device,
+        bit=bit,
+        invert=invert,
+    )
+
+
+def _number(
+    address: int,
+    name: str,
+    device: ClivetDevice,
+    *,
+    unit: str,
+    device_class: NumberDeviceClass,
+    min_value: float,
+    max_value: float,
+    scale: float = 1,
+    mode: NumberMode = NumberMode.AUTO,
+) -> RegisterDescription:
+    return RegisterDescription(
+        platform=Platform.NUMBER,
+        address=address,
+        name=name,
+        device=device,
+        unit=unit,
+        scale=scale,
+        signed=min_value < 0,
+        device_class=device_class,
+        min_value=min_value,
+        max_value=max_value,
+        mode=mode,
+    )
+
+
+def _temperature_number(
+    address: int, name: str, device: ClivetDevice, min_value: float, max_value: float
+) -> RegisterDescription:
+    return _number(
+        address,
+        name,
+        device,
+        unit=UnitOfTemperature.CELSIUS,
+        device_class=NumberDeviceClass.TEMPERATURE,
+        min_value=min_value,
+        max_value=max_value,
+        scale=0.1,
+    )
+
+
+OPERATING_MODES = {
+    0: "Off",
+    2: "Cooling",
+    3: "Heating",
+    4: "Forced Cooling",
+    5: "Water Heating",
+}
+
+REGISTER_DESCRIPTIONS: tuple[RegisterDescription, ...] = (
+    # Control
+    _switch(2600, 0, "System status", ClivetDevice.HEAT_PUMP),
+    _switch(2600, 2, "Heat/cool mode", ClivetDevice.HEAT_PUMP),
+    _switch(2600, 2, "Cool/heat mode", ClivetDevice.HEAT_PUMP, invert=True),
+    _switch(2600, 4, "DHW only mode", ClivetDevice.HEAT_PUMP),
+    _switch(2600, 9, "Room thermoregulation request", ClivetDevice.HEAT_PUMP),
+    _switch(2601, 2, "Enable remote unit mode", ClivetDevice.HEAT_PUMP),
+    _switch(2601, 4, "Enable remote DHW only", ClivetDevice.HEAT_PUMP),
+    _switch(2601, 5, "Enable remote unit state", ClivetDevice.HEAT_PUMP),
+    _switch(2601, 15, "Enable remote demand limit", ClivetDevice.HEAT_PUMP),
+    _switch(2602, 1, "Enable thermoregulation request", ClivetDevice.HEAT_PUMP),
+    _switch(2602, 3, "Enable remote DHW control", ClivetDevice.HEAT_PUMP),
+    _number(
+        2614,
+        "Demand limit",
+        ClivetDevice.HEAT_PUMP,
+        unit=UnitOfPower.KILO_WATT,
+        device_class=NumberDeviceClass.POWER,
+        min_value=0,
+        max_value=10,
+    ),
+    # Domestic hot water
+    _temperature_number(2702, "Sanitary band", ClivetDevice.DHW, 0, 20),
+    _temperature_number(2704, "Anti-legionella setpoint", ClivetDevice.DHW, 55, 70),
+    _number(
+        2706,
+        "Anti-legionella interval",
+        ClivetDevice.DHW,
+        unit=UnitOfTime.MINUTES,
+        device_class=NumberDeviceClass.DURATION,
+        min_value=0,
+        max_value=86400,
+        mode=NumberMode.BOX,
+    ),
+    _switch(2709, 0, "Enable remote DHW control", ClivetDevice.DHW),
+    _switch(2709, 1, "Enable remote storage tank setpoint", ClivetDevice.DHW),
+    _switch(2709, 2, "Enable remote DHW range", ClivetDevice.DHW),
+    _switch(2709, 3, "Enable remote maintenance setpoint", ClivetDevice.DHW),
+    _switch(2709, 4, "Enable remote anti-legionella setpoint", ClivetDevice.DHW),
+    _switch(2709, 6, "Enable remote anti-legionionella interval", ClivetDevice.DHW),
+    *_status_bits(
+        2801,
+        ClivetDevice.DHW,
+        {3: ("Anti-legionella", BinarySensorDeviceClass.RUNNING)},
+    ),
+    *_status_bits(
+        2803,
+        ClivetDevice.DHW,
+        {0: "Resistance", 1: ("Pump", BinarySensorDeviceClass.RUNNING)},
+    ),
+    _temperature_sensor(2804, "Current setpoint", ClivetDevice.DHW),
+    _sensor(
+        2805,
+        "Resistance operation",
+        ClivetDevice.DHW,
+        unit=UnitOfTime.HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        tier=RegisterTier.SLOW,
+    ),
+    _sensor(2806, "Resistance starts", ClivetDevice.DHW, tier=RegisterTier.SLOW),
+    # Alarms
+    *_status_bits(
+        3000,
+        ClivetDevice.HEAT_PUMP,
+        {
+            0: ("Alarm: ALL_TIMEOUT_TAST_e00", BinarySensorDeviceClass.PROBLEM),
+            1: ("Alarm: ERR_SONDA_IN_E01", BinarySensorDeviceClass.PROBLEM),
+            2: ("Alarm: ERR_SONDA_OUT_E02", BinarySensorDeviceClass.PROBLEM),
+            3: ("Alarm: ERR_SONDA_EXT_E03", BinarySensorDeviceClass.PROBLEM),
+            4: ("Alarm: ERR_SONDA_BATTERIA_E04", BinarySensorDeviceClass.PROBLEM),
+            8: ("Alarm: ERR_SONDA_PRESS1_E08", BinarySensorDeviceClass.PROBLEM),
+            14: ("Alarm: ALL_HP1_CIRC1_F01", BinarySensorDeviceClass.PROBLEM),
+            15: ("Alarm: ALL_LP1_CIRC1_F02", BinarySensorDeviceClass.PROBLEM),
+        },
+    ),
+    *_status_bits(
+        3001,
+        ClivetDevice.HEAT_PUMP,
+        {
+            0: ("Alarm: ALL_TERMICA1_E26", BinarySensorDeviceClass.PROBLEM),
+            4: ("Alarm: ALL_TERMICO_VENTIL_CIRC1_E23", BinarySensorDeviceClass.PROBLEM),
+            15: ("Alarm: ALL_FLUSSO_POMPA_UT_I01", BinarySensorDeviceClass.PROBLEM),
+        },
+    ),
+    *_status_bits(
+        3002,
+        ClivetDevice.HEAT_PUMP,
+        {
+            3: ("Alarm: ALL_GELO_UT_I03", BinarySensorDeviceClass.PROBLEM),
+            6: ("Alarm: ALL_CARICO_I06", BinarySensorDeviceClass.PROBLEM),
+            7: ("Alarm: ALL_DELTA_T_INC_I07", BinarySensorDeviceClass.PROBLEM),
+            9: ("Alarm: PREALL_ANTIGELO_i09", BinarySensorDeviceClass.PROBLEM),
+            11: ("Alarm: ALL_TIN_FUORI_NORM_i11", BinarySensorDeviceClass.PROBLEM),
+            12: (
+                "Alarm: SCAMB_INS_SEC/PRIM (LATO ACS)_i12",
+                BinarySensorDeviceClass.PROBLEM,
+            ),
+            13: ("Alarm: ALL_GELO_AMBIENTE_I13", BinarySensorDeviceClass.PROBLEM),
+            15: ("Alarm: ALL_TIMEOUT_POTENZA_e14", BinarySensorDeviceClass.PROBLEM),
+        },
+    ),
+    *_status_bits(
+        3003,
+        ClivetDevice.HEAT_PUMP,
+        {1: ("Alarm: ALL_MAX_TS_F10", BinarySensorDeviceClass.PROBLEM)},
+    ),
+    *_status_bits(
+        3004,
+        ClivetDevice.HEAT_PUMP,
+        {
+            0: ("Alarm: ERR_SONDA_SOLARE_E15", BinarySensorDeviceClass.PROBLEM),
+            2: ("Alarm: ERR_SONDA_ACS_SUP_E16", BinarySensorDeviceClass.PROBLEM),
+            6: ("Alarm: ERR_SONDA_SCARICO_E18", BinarySensorDeviceClass.PROBLEM),
+            7: ("Alarm: ERR_SONDA_ASP_E19", BinarySensorDeviceClass.PROBLEM),
+            14: ("Alarm: ALL_CARICO_ACS_I15", BinarySensorDeviceClass.PROBLEM),
+        },
+    ),
+    *_status_bits(
+        3006,
+        ClivetDevice.HEAT_PUMP,
+        {
+            2: ("Alarm: ALLARME_INVERTER_E32", BinarySensorDeviceClass.PROBLEM),
+            3: (
+                "Alarm: ERR_SONDA_IN_SCA_ACS_IMP_Sol_E58",
+                BinarySensorDeviceClass.PROBLEM,
+            ),
+            6: ("Alarm: ALL_CALDAIA_E46", BinarySensorDeviceClass.PROBLEM),
+            7: ("Alarm: ALL_TIMEOUT_IO_E47", BinarySensorDeviceClass.PROBLEM),
+            9: ("Alarm: ALL_HT_IMPIANTO (I22)", BinarySensorDeviceClass.PROBLEM),
+            10: ("Alarm: ALL_OUT_ENVELOPE (F22)", BinarySensorDeviceClass.PROBLEM),
+        },
+    ),
+    *_status_bits(
+        3007,
+        ClivetDevice.HEAT_PUMP,
+        {
+            0: (
+                "Alarm: CONDENSER_OUTLET_HT_PROTECTION_E59",
+                BinarySensorDeviceClass.PROBLEM,
+            ),
+            1: ("Alarm: ERR_ODU_POWER_SUPPLY_E60", BinarySensorDeviceClass.PROBLEM),
+            2: (
+                "Alarm: FAN_SPEED_IN_A_AREA_10MIN_F22",
+                BinarySensorDeviceClass.PROBLEM,
+            ),
+            3: ("Alarm: ERR_ODU_EEPROM_E61", BinarySensorDeviceClass.PROBLEM),
+            4: ("Alarm: ALL_FAN_E62", BinarySensorDeviceClass.PROBLEM),
+            5: ("Alarm: LP_PROTECTION_F23", BinarySensorDeviceClass.PROBLEM),
+            6: ("Alarm: DC_GEN_VOLT_TOO_LOW_E63", BinarySensorDeviceClass.PROBLEM),
+        },
+    ),
+    # Heat pump
+    _temperature_sensor(4200, "Current setpoint", ClivetDevice.HEAT_PUMP),
+    _temperature_sensor(
+        4201,
+        "Actual temperature difference (including compensation)",
+        ClivetDevice.HEAT_PUMP,
+    ),
+    _sensor(
+        4202,
+        "Timer relative to resource insertion ",
+        ClivetDevice.HEAT_PUMP,
+        unit=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+    ),
+    _sensor(
+        4203,
+        "Dynamic TimeScan relative to resource insertion ",
+        ClivetDevice.HEAT_PUMP,
+        unit=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+    ),
+    _temperature_sensor(4204, "External T compensation", ClivetDevice.HEAT_PUMP),
+    _temperature_sensor(4205, "Ambient T Compensation", ClivetDevice.HEAT_PUMP),
+    _temperature_sensor(4207, "Charge compensation", ClivetDevice.HEAT_PUMP),
+    _temperature_sensor(4208, "Duty Cycle compensation", ClivetDevice.HEAT_PUMP),
+    _temperature_sensor(4209, "Compensation on duration", ClivetDevice.HEAT_PUMP),
+    _temperature_sensor(
+        4210, "Exchanger water inlet temperature (Return)", ClivetDevice.HEAT_PUMP
+    ),
+    _temperature_sensor(
+        4211, "Exchanger water outlet temperature (Supply)", ClivetDevice.HEAT_PUMP
+    ),
+    _temperature_sensor(4213, "Outdoor air temperature", ClivetDevice.HEAT_PUMP),
+    _temperature_sensor(
+        4215, "DHW accumulation temperature (high probe)", ClivetDevice.HEAT_PUMP
+    ),
+    _sensor(4216, "Utility pump", ClivetDevice.HEAT_PUMP, unit=PERCENTAGE, scale=0.1),
+    _sensor(
+        4219,
+        "Condensing pressure C1",
+        ClivetDevice.HEAT_PUMP,
+        unit=UnitOfPressure.BAR,
+        scale=0.01,
+        device_class=SensorDeviceClass.PRESSURE,
+    ),
+    _sensor(
+        4220,
+        "Evaporating pressure C1",
+        ClivetDevice.HEAT_PUMP,
+        unit=UnitOfPressure.BAR,
+        scale=0.01,
+        device_class=SensorDeviceClass.PRESSURE,
+    ),
+    _sensor(
+        4221,
+        "Auxiliary heater control signal (0-10V)",
+        ClivetDevice.HEAT_PUMP,
+        unit=PERCENTAGE,
+        scale=0.1,
+    ),
+    RegisterDescription(
+        platform=Platform.BINARY_SENSOR,
+        address=4222,
+        name="Boiler control / Auxiliary heater",
+        device=ClivetDevice.HEAT_PUMP,
+    ),
+    _temperature_sensor(
+        4223,
+        "boiler modulating (set)/ Boiler valves control",
+        ClivetDevice.HEAT_PUMP,
+    ),
+    _sensor(
+        4225,
+        "Thermoregulator request",
+        ClivetDevice.HEAT_PUMP,
+        unit=PERCENTAGE,
+        scale=0.1,
+    ),
+    _sensor(
+        4226,
+        "Variable speed compressor (0-10V)",
+        ClivetDevice.HEAT_PUMP,
+        unit=PERCENTAGE,
+        scale=0.1,
+    ),
+    _sensor(
+        4227,
+        "Compressor operating hours",
+        ClivetDevice.HEAT_PUMP,
+        unit=UnitOfTime.HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        tier=RegisterTier.SLOW,
+    ),
+    _sensor(
+        4228,
+        "Compressor starts",
+        ClivetDevice.HEAT_PUMP,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        tier=RegisterTier.SLOW,
+    ),
+    _sensor(
+        4235,
+        "Electrical power absorbed",
+        ClivetDevice.COMPRESSOR,
+        unit=UnitOfPower.KILO_WATT,
+        scale=0.1,
+        device_class=SensorDeviceClass.POWER,
+    ),
+    _sensor(
+        4236,
+        "Current M-ODU",
+        ClivetDevice.COMPRESSOR,
+        unit=UnitOfElectricCurrent.AMPERE,
+        scale=0.1,
+        device_class=SensorDeviceClass.CURRENT,
+    ),
+    _sensor(
+        4237,
+        "Voltage M-ODU",
+        ClivetDevice.COMPRESSOR,
+        unit=UnitOfElectricPotential.VOLT,
+        device_class=SensorDeviceClass.VOLTAGE,
+    ),
+    _sensor(
+        4238,
+        "Frequency M-ODU",
+        ClivetDevice.COMPRESSOR,
+        unit=UnitOfFrequency.HERTZ,
+        scale=0.1,
+        device_class=SensorDeviceClass.FREQUENCY,
+    ),
+    _temperature_sensor(4248, "Return temperature", ClivetDevice.HEAT_PUMP),
+    _temperature_sensor(4249, "Discharge temperature", ClivetDevice.HEAT_PUMP),
+    _sensor(
+        4252,
+        "Regolation valve opening percentage",
+        ClivetDevice.HEAT_PUMP,
+        unit=PERCENTAGE,
+        scale=0.1,
+    ),
+    _sensor(4262, "Fan", ClivetDevice.HEAT_PUMP, scale=0.1),
+    RegisterDescription(
+        platform=Platform.BINARY_SENSOR,
+        address=4263,
+        name="Cooling mode",
+        device=ClivetDevice.HEAT_PUMP,
+        bit=1,
+        bit_value=False,
+        device_class=BinarySensorDeviceClass.COLD,
+    ),
+    RegisterDescription(
+        platform=Platform.BINARY_SENSOR,
+        address=4263,
+        name="Heating mode",
+        device=ClivetDevice.HEAT_PUMP,
+        bit=1,
+        bit_value=True,
+        device_class=BinarySensorDeviceClass.HEAT,
+    ),
+    *_status_bits(
+        4263,
+        ClivetDevice.HEAT_PUMP,
+        {
+            0: "Status",
+            3: "Only boiler",
+            4: "Only DHW",
+            5: "Defrosting",
+            6: "Cycle reverse",
+            7: ("Any alarm", BinarySensorDeviceClass.PROBLEM),
+            8: "DHW valve",
+            10: "Boiler / additional heating element",
+            11: "Oil return",
+        },
+    ),
+    *_status_bits(
+        4264,
+        ClivetDevice.DHW,
+        {
+            4: "Production (HP)",
+            5: "Production (boiler)",
+            7: "In anti-legionella",
+            8: "Pump status",
+        },
+    ),
+    _temperature_sensor(4266, "DHW setpoint", ClivetDevice.HEAT_PUMP),
+    _sensor(
+        4273,
+        "Primary flow rate",
+        ClivetDevice.HEAT_PUMP,
+        unit=UnitOfVolumeFlowRate.LITERS_PER_MINUTE,
+        scale=0.1,
+        device_class=SensorDeviceClass.VOLUME_FLOW_RATE,
+    ),
+    _sensor(
+        4275,
+        "DHW circuit flow rate",
+        ClivetDevice.HEAT_PUMP,
+        unit=UnitOfVolumeFlowRate.LITERS_PER_MINUTE,
+        scale=0.1,
+        device_class=SensorDeviceClass.VOLUME_FLOW_RATE,
+    ),
+    _sensor(
+        4276,
+        "DHW total consumption",
+        ClivetDevice.HEAT_PUMP,
+        unit=UnitOfVolume.LITERS,
+        scale=0.1,
+        device_class=SensorDeviceClass.WATER,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        tier=RegisterTier.SLOW,
+    ),
+    # Compressor
+    _status_sensor(
+        4300, "Set operating mode", ClivetDevice.COMPRESSOR, OPERATING_MODES
+    ),
+    _sensor(
+        4301,
+        "Requested work frequency",
+        ClivetDevice.COMPRESSOR,
+        unit=UnitOfFrequency.HERTZ,
+        device_class=SensorDeviceClass.FREQUENCY,
+    ),
+    _sensor(
+        4302,
+        "Operating work frequency",
+        ClivetDevice.COMPRESSOR,
+        unit=UnitOfFrequency.HERTZ,
+        device_class=SensorDeviceClass.FREQUENCY,
+    ),
+    _status_sensor(
+        4303, "M-ODU operating mode", ClivetDevice.COMPRESSOR, OPERATING_MODES
+    ),
+    _sensor(4304, "Fan speed", ClivetDevice.COMPRESSOR, scale=0.1),
+    _temperature_sensor(
+        4305, "Condenser output temperature T3", ClivetDevice.COMPRESSOR
+    ),
+    _temperature_sensor(4306, "Outdoor Temperature T4", ClivetDevice.COMPRESSOR),
+    _temperature_sensor(
+        4307, "Compressor discharge temperature Tp", ClivetDevice.COMPRESSOR
+    ),
+    _sensor(4308, "Inverter protection code", ClivetDevice.COMPRESSOR),
+    _sensor(
+        4309,
+        "M-ODU absorbed current",
+        ClivetDevice.COMPRESSOR,
+        unit=UnitOfElectricCurrent.AMPERE,
+        device_class=SensorDeviceClass.CURRENT,
+    ),
+    _sensor(
+        4310,
+        "M-ODU voltage",
+        ClivetDevice.COMPRESSOR,
+        unit=UnitOfElectricPotential.VOLT,
+        device_class=SensorDeviceClass.VOLTAGE,
+    ),
+    _temperature_sensor(4311, "Thermostatic opening degrees", ClivetDevice.COMPRESSOR),
+    _sensor(4313, "Error code", ClivetDevice.COMPRESSOR),
+    *_status_bits(
+        4314,
+        ClivetDevice.COMPRESSOR,
+        {0: "Status", 1: "Defrosting", 3: "Oil return", 5: "Test mode"},
+    ),
+    _temperature_sensor(4315, "Extraction temperature", ClivetDevice.COMPRESSOR),
+    _sensor(
+        4316,
+        "Pressure transducer 1",
+        ClivetDevice.COMPRESSOR,
+        unit=UnitOfPressure.BAR,
+        scale=0.01,
+        device_class=SensorDeviceClass.PRESSURE,
+    ),
+    _sensor(
+        4317,
+        "Pressure transducer 2",
+        ClivetDevice.COMPRESSOR,
+        unit=UnitOfPressure.BAR,
+        scale=0.01,
+        device_class=SensorDeviceClass.PRESSURE,
+    ),
+    # Frequency limits
+    _sensor(
+        7000,
+        "Lower frequency limit",
+        ClivetDevice.HEAT_PUMP,
+        unit=UnitOfFrequency.HERTZ,
+        device_class=SensorDeviceClass.FREQUENCY,
+    ),
+    _sensor(
+        7001,
+        "Upper frequency limit",
+        ClivetDevice.HEAT_PUMP,
+        unit=UnitOfFrequency.HERTZ,
+        device_class=SensorDeviceClass.FREQUENCY,
+    ),
+    _sensor(
+        7002,
+        "Thermoregulator requested frequency",
+        ClivetDevice.HEAT_PUMP,
+        unit=UnitOfFrequency.HERTZ,
+        device_class=SensorDeviceClass.FREQUENCY,
+    ),
+    _sensor(
+        7003,
+        "Requested outdoor unit frequency",
+        ClivetDevice.HEAT_PUMP,
+        unit=UnitOfFrequency.HERTZ,
+        device_class=SensorDeviceClass.FREQUENCY,
+    ),
+    _sensor(
+        7004,
+        "Current outdoor unit frequency",
+        ClivetDevice.HEAT_PUMP,
+        unit=UnitOfFrequency.HERTZ,
+        device_class=SensorDeviceClass.FREQUENCY,
+    ),
+    _sensor(
+        7005,
+        "Defrost mode frequency",
+        ClivetDevice.HEAT_PUMP,
+        unit=UnitOfFrequency.HERTZ,
+        device_class=SensorDeviceClass.FREQUENCY,
+    ),
+)
+
+
+class RegisterTable:
+    """The register table, compiled for lookups by platform and by address."""
+
+    def __init__(self, descriptions: Iterable[RegisterDescription]) -> None:
+        self.descriptions = tuple(descriptions)
+        self.platforms: dict[Platform, list[RegisterDescription]] = {}
+        self.encodings: dict[int, Encoding] = {}
+        # The model is needed before any entity is added, and never changes
+        self.tiers: dict[int, RegisterTier] = dict.fromkeys(
+            MODEL_ADDRESSES, RegisterTier.STATIC
+        )
+
+        for description in self.descriptions:
+            self.platforms.setdefault(description.platform, []).append(description)
+            if description.tier is not RegisterTier.FAST:
+                self.tiers[description.address] = description.tier
+            if not description.numeric:
+                continue
+            encoding = (description.scale, description.signed)
+            if self.encodings.setdefault(description.address, encoding) != encoding:
+                raise ValueError(
+                    f"Register {description.address} is decoded in different ways"
+                )
+
+    def tier(self, address: int) -> RegisterTier:
+        """Return the polling tier of a register."""
+        return self.tiers.get(address, RegisterTier.FAST)
+
+
+REGISTERS = RegisterTable(REGISTER_DESCRIPTIONS)
@@ -0,0 +1,417 @@
+from array import array
+from collections.abc import Callable, Container, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import timedelta
+from enum import StrEnum
+from functools import cache
+from itertools import compress
+from operator import ne
+import time
+from typing import Any, NamedTuple
+
+
+class RegisterTier(StrEnum):
+    """How often a group of registers has to be polled."""
+
+    FAST = "fast"
+    SLOW = "slow"
+    STATIC = "static"
+
+
+# Registers that are always read, as they are needed to build the device info
+# before any entity has been added.
+MODEL_ADDRESSES = (4312, 4318)
+
+# Maximum number of registers a single Modbus read request can return.
+MODBUS_MAX_READ_COUNT = 125
+
+# Maximum number of registers a single Modbus write request can set.
+MODBUS_MAX_WRITE_COUNT = 123
+
+# Registers in the fast tier are read on every update of the coordinator, static
+# registers are only read once.
+SLOW_TIER_INTERVAL = timedelta(minutes=5)
+
+# Value of registers the device has no reading for
+NO_VALUE = 0x7FFE
+
+# Bits of a register
+ALL_BITS = 0xFFFF
+
+type Decoder = Callable[[int], int | float | None]
+
+# Scale and signedness of a numeric register
+type Encoding = tuple[float, bool]
+
+
+@cache
+def compile_decoder(scale: float, signed: bool) -> Decoder:
+    """Return a function decoding the raw value of a register.
+
+    The checks on the encoding are done once here, so the returned function
+    only does the arithmetic its encoding needs.
+    """
+    if signed and scale != 1:
+
+        def _decode(register: int) -> int | float | None:
+            if register == NO_VALUE:
+                return None
+            return (register - 0x10000 if register >= 0x8000 else register) * scale
+
+    elif signed:
+
+        def _decode(register: int) -> int | float | None:
+            if register == NO_VALUE:
+                return None
+            return register - 0x10000 if register >= 0x8000 else register
+
+    elif scale != 1:
+
+        def _decode(register: int) -> int | float | None:
+            return None if register == NO_VALUE else register * scale
+
+    else:
+
+        def _decode(register: int) -> int | float | None:
+            return None if register == NO_VALUE else register
+
+    return _decode
+
+
+# Offset in its block, scale and signedness of a numeric register
+type DecodeEntry = tuple[int, float, bool]
+
+
+def build_decode_plan(
+    address: int, count: int, encodings: Mapping[int, Encoding]
+) -> tuple[tuple[int, ...], tuple[DecodeEntry, ...]]:
+    """Return the numeric registers of a block and how to decode them."""
+    addresses = tuple(
+        register
+        for register in range(address, address + count)
+        if register in encodings
+    )
+    return addresses, tuple(
+        (register - address, *encodings[register]) for register in addresses
+    )
+
+
+def decode_registers(
+    values: array, plan: Iterable[DecodeEntry]
+) -> list[int | float | None]:
+    """Decode the numeric registers of a block at once.
+
+    The block is reinterpreted as signed 16-bit values in a single copy, so each
+    register only costs picking the value of its signedness and a
+    multiplication by its scale.
+    """
+    signed_values = array("h", values.tobytes())
+    return [
+        None
+        if (raw := values[offset]) == NO_VALUE
+        else (signed_values[offset] if signed else raw) * scale
+        for offset, scale, signed in plan
+    ]
+
+
+class RegisterBit(NamedTuple):
+    """A single bit of a register, used by entities of bitfield registers."""
+
+    address: int
+    bit: int
+
+
+@dataclass(frozen=True, slots=True)
+class ReadBlock:
+    """A contiguous range of holding registers read in a single request."""
+
+    address: int
+    count: int
+    tier: RegisterTier = RegisterTier.FAST
+
+    @property
+    def end(self) -> int:
+        """Return the address right after the last register of the block."""
+        return self.address + self.count
+
+    def __contains__(self, address: object) -> bool:
+        return isinstance(address, int) and self.address <= address < self.end
+
+
+def build_read_plan(
+    addresses: Iterable[int],
+    *,
+    max_gap: int,
+    max_count: int,
+    tiers: Mapping[int, RegisterTier],
+    unreadable: Container[int] = (),
+) -> list[ReadBlock]:
+    """Merge register addresses into the fewest read requests.
+
+    Addresses are grouped by their tier in `tiers`, FAST when they have none.
+    Two addresses of the same tier end up in the same block when there are at
+    most `max_gap` unused registers between them and the resulting block does
+    not exceed `max_count` registers. Addresses that already fall within a block
+    of a faster tier are read along with that block, so blocks never overlap.
+    Registers the device refuses to read are left out, and blocks never span
+    them.
+    """
+    blocks: list[ReadBlock] = []
+    addresses = sorted(
+        address for address in set(addresses) if address not in unreadable
+    )
+    for tier in RegisterTier:
+        start: int | None = None
+        last = 0
+        for address in addresses:
+            if tiers.get(address, RegisterTier.FAST) != tier or any(
+                address in block for block in blocks
+            ):
+                continue
+            if (
+                start is not None
+                and address - last - 1 <= max_gap
+                and address - start < max_count
+                and not any(
+                    block.address <= address and block.end > start for block in blocks
+                )
+                and not any(
+                    skipped in unreadable for skipped in range(last + 1, address)
+                )
+            ):
+                last = address
+                continue
+            if start is not None:
+                blocks.append(ReadBlock(start, last - start + 1, tier))
+            start = last = address
+        if start is not None:
+            blocks.append(ReadBlock(start, last - start + 1, tier))
+    return sorted(blocks, key=lambda block: block.address)
+
+
+@dataclass(slots=True)
+class DeviceLayout:
+    """What a device accepts to read, learned from the requests it rejected.
+
+    An address is in the layout when it cannot be read.
+    """
+
+    # Registers that cannot be read, even on their own
+    unreadable: set[int] = field(default_factory=set)
+    # Largest number of registers accepted in a single read request
+    max_count: int = MODBUS_MAX_READ_COUNT
+    # (address, count) ranges that were scanned, and the readable ranges in them
+    scanned: list[tuple[int, int]] = field(default_factory=list)
+    readable: list[tuple[int, int]] = field(default_factory=list)
+
+    def __contains__(self, address: object) -> bool:
+        if not isinstance(address, int):
+            return False
+        if address in self.unreadable:
+            return True
+        return any(
+            start <= address < start + count for start, count in self.scanned
+        ) and not any(
+            start <= address < start + count for start, count in self.readable
+        )
+
+    @property
+    def learned(self) -> bool:
+        """Return whether reads are restricted because the device rejected them."""
+        return bool(self.unreadable) or self.max_count < MODBUS_MAX_READ_COUNT
+
+    def forget_learned(self) -> None:
+        """Lift the restrictions learned from rejected reads, keeping scan results."""
+        self.unreadable.clear()
+        self.max_count = MODBUS_MAX_READ_COUNT
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "DeviceLayout":
+        """Create a layout from its stored form."""
+        return cls(
+            unreadable=set(data.get("unreadable", ())),
+            max_count=data.get("max_count", MODBUS_MAX_READ_COUNT),
+            scanned=[(start, count) for start, count in data.get("scanned", ())],
+            readable=[(start, count) for start, count in data.get("readable", ())],
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the layout in a form that can be stored."""
+        return {
+            "unreadable": sorted(self.unreadable),
+            "max_count": self.max_count,
+            "scanned": [list(r) for r in self.scanned],
+            "readable": [list(r) for r in self.readable],
+        }
+
+
+def build_write_plan(values: Mapping[int, int]) -> list[tuple[int, list[int]]]:
+    """Split register values into runs of contiguous registers to write at once."""
+    runs: list[tuple[int, list[int]]] = []
+    for address in sorted(values):
+        if runs:
+            start, run = runs[-1]
+            if start + len(run) == address and len(run) < MODBUS_MAX_WRITE_COUNT:
+                run.append(values[address])
+                continue
+        runs.append((address, [values[address]]))
+    return runs
+
+
+class _Segment:
+    """Values of a range of registers, stored in a single array."""
+
+    __slots__ = (
+        "address",
+        "decode_plan",
+        "numeric_addresses",
+        "read_at",
+        "valid",
+        "values",
+    )
+
+    def __init__(
+        self, address: int, count: int, encodings: Mapping[int, Encoding]
+    ) -> None:
+        self.address = address
+        self.numeric_addresses, self.decode_plan = build_decode_plan(
+            address, count, encodings
+        )
+        self.values = array("H", bytes(2 * count))
+        # Monotonic time at which each register was last read or written
+        self.read_at = array("d", bytes(8 * count))
+        # Bitmap of the registers that hold a value
+        self.valid = 0
+
+
+class RegisterSnapshot(Mapping[int, int]):
+    """Register values of the read plan, stored per read block.
+
+    Each block is backed by one contiguous array of unsigned 16-bit values and a
+    bitmap of the registers that hold a value, so a read can replace the whole
+    block at once. Numeric registers, those with an encoding, are decoded per
+    block when it is stored, and entities read the decoded values.
+    """
+
+    __slots__ = ("_encodings", "_index", "_segments", "decoded")
+
+    def __init__(self, encodings: Mapping[int, Encoding] | None = None) -> None:
+        self._encodings = encodings or {}
+        # Decoded values of the numeric registers that hold a value
+        self.decoded: dict[int, int | float | None] = {}
+        self._segments: dict[tuple[int, int], _Segment] = {}
+        # Address to the segment holding its value, and the offset in that segment
+        self._index: dict[int, tuple[_Segment, int]] = {}
+
+    def __getitem__(self, address: int) -> int:
+        if (value := self.get(address)) is None:
+            raise KeyError(address)
+        return value
+
+    def __setitem__(self, address: int, value: int) -> None:
+        if address not in self._index:
+            self._add_segment(address, 1)
+        segment, offset = self._index[address]
+        segment.values[offset] = value
+        segment.read_at[offset] = time.monotonic()
+        segment.valid |= 1 << offset
+        if (encoding := self._encodings.get(address)) is not None:
+            self.decoded[address] = compile_decoder(*encoding)(value)
+
+    def __contains__(self, address: object) -> bool:
+        if (entry := self._index.get(address)) is None:  # type: ignore[arg-type]
+            return False
+        segment, offset = entry
+        return bool(segment.valid >> offset & 1)
+
+    def __iter__(self) -> Iterator[int]:
+        return (address for address in sorted(self._index) if address in self)
+
+    def __len__(self) -> int:
+        return sum(segment.valid.bit_count() for segment in self._segments.values())
+
+    def get(self, address: int, default: Any = None) -> Any:
+        if (entry := self._index.get(address)) is None:
+            return default
+        segment, offset = entry
+        if not segment.valid >> offset & 1:
+            return default
+        return segment.values[offset]
+
+    def age(self, address: int, now: float | None = None) -> float | None:
+        """Return the seconds since a register was last read or written."""
+        if address not in self:
+            return None
+        segment, offset = self._index[address]
+        return (now or time.monotonic()) - segment.read_at[offset]
+
+    def as_dict(self) -> dict[int, int]:
+        """Return the values as a dictionary."""
+        return {address: self[address] for address in self}
+
+    def update_block(
+        self, address: int, registers: list[int], read_at: float
+    ) -> dict[int, int]:
+        """Store the registers read from a block.
+
+        Return the changed addresses, with the bits that flipped in each. All
+        bits are reported for registers that had no value yet.
+        """
+        count = len(registers)
+        if (segment := self._segments.get((address, count))) is None:
+            segment = self._add_segment(address, count)
+        segment.read_at = array("d", (read_at,)) * count
+        values = array("H", registers)
+        full = (1 << count) - 1
+        old_values = segment.values
+        if segment.valid == full and old_values == values:
+            return {}
+
+        if segment.valid == full:
+            # Compare the whole block without running Python code per register
+            changed = {
+                changed_address: old_values[changed_address - address]
+                ^ values[changed_address - address]
+                for changed_address in compress(
+                    range(address, address + count), map(ne, old_values, values)
+                )
+            }
+        else:
+            changed = {
+                address + offset: old ^ new if segment.valid >> offset & 1 else ALL_BITS
+                for offset, (old, new) in enumerate(
+                    zip(old_values, values, strict=True)
+                )
+                if old != new or not segment.valid >> offset & 1
+            }
+        segment.values = values
+        segment.valid = full
+        self.decoded.update(
+            zip(
+                segment.numeric_addresses,
+                decode_registers(values, segment.decode_plan),
+                strict=True,
+            )
+        )
+        return changed
+
+    def _add_segment(self, address: int, count: int) -> _Segment:
+        segment = _Segment(address, count, self._encodings)
+        for offset in range(count):
+            if (entry := self._index.get(address + offset)) is not None:
+                # Keep the last known value of registers that move to a new block
+                old_segment, old_offset = entry
+                if old_segment.valid >> old_offset & 1:
+                    segment.values[offset] = old_segment.values[old_offset]
+                    segment.read_at[offset] = old_segment.read_at[old_offset]
+                    segment.valid |= 1 << offset
+            self._index[address + offset] = (segment, offset)
+        self._segments[address, count] = segment
+        # Drop the blocks of a previous read plan once all their registers moved
+        in_use = {id(segment) for segment, _ in self._index.values()}
+        self._segments = {
+            key: segment
+            for key, segment in self._segments.items()
+            if id(segment) in in_use
+        }
+        return segment
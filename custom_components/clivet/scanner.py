@@ -0,0 +1,169 @@
+"""Discovery of the holding registers a device can read."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from typing import NamedTuple
+
+from .exceptions import CommunicationException
+from .registers import MODBUS_MAX_READ_COUNT
+
+# Attempts of a scan request that fails for another reason than a rejection,
+# like a timeout, before the registers it reads are skipped
+SCAN_ATTEMPTS = 3
+
+# Requests in a row that can be skipped before the scan is given up, as the
+# device is probably not reachable anymore
+SCAN_MAX_SKIPPED = 3
+
+# Reads `count` registers from `address` and returns None when the device
+# rejects the registers. Other failures, like timeouts, raise.
+type ReadRegisters = Callable[[int, int], Awaitable[list[int] | None]]
+
+
+class ScanResult(NamedTuple):
+    """The (address, count) ranges found by a scan."""
+
+    readable: list[tuple[int, int]]
+    # Ranges that could not be scanned, which are neither readable nor unreadable
+    skipped: list[tuple[int, int]]
+
+
+class BlockLayout(NamedTuple):
+    """Why a device rejects reading a block."""
+
+    # Registers of the block that cannot be read, even on their own
+    unreadable: list[int]
+    # Largest number of registers the device reads at once, None when the
+    # number of registers is not why the block was rejected
+    max_count: int | None
+
+
+def merge_ranges(ranges: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Merge (address, count) ranges that overlap or touch each other."""
+    merged: list[tuple[int, int]] = []
+    for address, count in sorted(ranges):
+        if merged and address <= merged[-1][0] + merged[-1][1]:
+            last_address, last_count = merged[-1]
+            end = max(last_address + last_count, address + count)
+            merged[-1] = (last_address, end - last_address)
+        else:
+            merged.append((address, count))
+    return merged
+
+
+def subtract_range(
+    ranges: Iterable[tuple[int, int]], start: int, end: int
+) -> list[tuple[int, int]]:
+    """Return the parts of (address, count) ranges outside of [start, end)."""
+    remaining: list[tuple[int, int]] = []
+    for address, count in ranges:
+        if address < start:
+            remaining.append((address, min(count, start - address)))
+        if address + count > end:
+            remaining.append((max(address, end), address + count - max(address, end)))
+    return remaining
+
+
+async def scan_registers(
+    read: ReadRegisters,
+    start: int,
+    end: int,
+    *,
+    max_count: int = MODBUS_MAX_READ_COUNT,
+    pace: float = 0.0,
+) -> ScanResult:
+    """Return the (address, count) ranges of readable registers in [start, end).
+
+    The range is probed in requests of `max_count` registers. A request that is
+    rejected is split in halves until the parts can be read or consist of a
+    single register, so sparse register maps cost more requests than dense
+    ones. `pace` seconds are left between requests to leave room for others on
+    the bus.
+
+    A request that fails otherwise is tried again, and its registers are skipped
+    when it keeps failing, instead of being taken for unreadable. When several
+    requests in a row are skipped, the last error is raised.
+    """
+    readable: list[tuple[int, int]] = []
+    skipped: list[tuple[int, int]] = []
+    skipped_in_a_row = 0
+
+    async def _probe(address: int, count: int) -> None:
+        nonlocal skipped_in_a_row
+        values: list[int] | None = None
+        for attempt in range(1, SCAN_ATTEMPTS + 1):
+            if pace:
+                await asyncio.sleep(pace)
+            try:
+                values = await read(address, count)
+            except CommunicationException:
+                if attempt < SCAN_ATTEMPTS:
+                    continue
+                skipped_in_a_row += 1
+                if skipped_in_a_row >= SCAN_MAX_SKIPPED:
+                    raise
+                skipped.append((address, count))
+                return
+            break
+        skipped_in_a_row = 0
+        if values is not None:
+            readable.append((address, count))
+            return
+        if count == 1:
+            return
+        half = count // 2
+        await _probe(address, half)
+        await _probe(address + half, count - half)
+
+    for address in range(start, end, max_count):
+        await _probe(address, min(max_count, end - address))
+    return ScanResult(merge_ranges(readable), merge_ranges(skipped))
+
+
+async def learn_block_layout(
+    read: ReadRegisters, address: int, count: int
+) -> BlockLayout:
+    """Find out why a device rejects reading `count` registers at `address`.
+
+    The block is split in halves until every part can be read, which finds the
+    registers that cannot be read at all. When every part can be read, the block
+    was too large and the largest accepted size is searched for. Before it is
+    returned, the result is checked with another read, so a single bad response
+    is not taken for the layout of the device. When the block turns out to be
+    readable after all, the result is empty.
+    """
+    unreadable: list[int] = []
+    largest_readable = 0
+
+    async def _split(address: int, count: int) -> None:
+        nonlocal largest_readable
+        if count == 1:
+            unreadable.append(address)
+            return
+        half = count // 2
+        for part_address, part_count in (
+            (address, half),
+            (address + half, count - half),
+        ):
+            if await read(part_address, part_count) is None:
+                await _split(part_address, part_count)
+            else:
+                largest_readable = max(largest_readable, part_count)
+
+    await _split(address, count)
+    if unreadable:
+        return BlockLayout(
+            [register for register in unreadable if await read(register, 1) is None],
+            None,
+        )
+
+    low, high = largest_readable, count
+    while high - low > 1:
+        mid = (low + high) // 2
+        if await read(address, mid) is None:
+            high = mid
+        else:
+            low = mid
+    if await read(address, low + 1) is not None:
+        return BlockLayout([], None)
+    return BlockLayout([], low)
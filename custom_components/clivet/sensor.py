@@ -1,22 +1,158 @@
-from homeassistant.components.sensor import SensorEntity
-from homeassistant.components.sensor.const import SensorDeviceClass, SensorStateClass
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+import time
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
-    UnitOfElectricCurrent,
-    UnitOfElectricPotential,
-    UnitOfFrequency,
+    EntityCategory,
+    Platform,
+    UnitOfInformation,
     UnitOfPower,
-    UnitOfPressure,
-    UnitOfTemperature,
     UnitOfTime,
-    UnitOfVolume,
-    UnitOfVolumeFlowRate,
 )
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .const import ClivetDevice
 from .coordinator import ClivetCoordinator
-from .entity import ClivetDevice, ClivetNumericBaseEntity
+from .derived import INPUT_REGISTERS, DerivedMetrics
+from .entity import ClivetNumericBaseEntity, build_device_info
+from .metrics import RollingSamples
+from .register_map import REGISTERS, RegisterDescription
+
+
+@dataclass(frozen=True, kw_only=True)
+class ClivetMetricSensorEntityDescription(SensorEntityDescription):
+    """A metric of the requests to the heat pump."""
+
+    value_fn: Callable[[ClivetCoordinator], float | None]
+
+
+@dataclass(frozen=True, kw_only=True)
+class ClivetDerivedSensorEntityDescription(SensorEntityDescription):
+    """A performance metric of the heat pump, derived from its registers."""
+
+    value_fn: Callable[[DerivedMetrics], float | None]
+    # Metrics over a window of time change as old samples drop out of it, also
+    # when none of the registers they are derived from changes
+    windowed: bool = False
+
+
+DERIVED_SENSORS: tuple[ClivetDerivedSensorEntityDescription, ...] = (
+    ClivetDerivedSensorEntityDescription(
+        key="electrical_power",
+        name="Electrical power (M-ODU)",
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda derived: derived.electrical_power,
+    ),
+    ClivetDerivedSensorEntityDescription(
+        key="thermal_power",
+        name="Thermal power",
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda derived: derived.thermal_power,
+    ),
+    ClivetDerivedSensorEntityDescription(
+        key="cop",
+        name="COP",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda derived: derived.cop,
+    ),
+    ClivetDerivedSensorEntityDescription(
+        key="rolling_cop",
+        name="COP (last hour)",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda derived: derived.rolling_cop,
+        windowed=True,
+    ),
+)
+
+
+def _milliseconds(samples: RollingSamples, q: float) -> float | None:
+    if (seconds := samples.quantile(q)) is None:
+        return None
+    return round(seconds * 1000, 1)
+
+
+def _duration_sensor(
+    key: str, name: str, samples_fn: Callable[[ClivetCoordinator], RollingSamples]
+) -> list[ClivetMetricSensorEntityDescription]:
+    return [
+        ClivetMetricSensorEntityDescription(
+            key=f"{key}_p{percentile}",
+            name=f"{name} (p{percentile})",
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            value_fn=lambda coordinator, q=percentile / 100: _milliseconds(
+                samples_fn(coordinator), q
+            ),
+        )
+        for percentile in (50, 95, 99)
+    ]
+
+
+def _counter_sensor(
+    key: str,
+    name: str,
+    value_fn: Callable[[ClivetCoordinator], int],
+    unit: str | None = None,
+) -> ClivetMetricSensorEntityDescription:
+    return ClivetMetricSensorEntityDescription(
+        key=key,
+        name=name,
+        native_unit_of_measurement=unit,
+        device_class=SensorDeviceClass.DATA_SIZE if unit is not None else None,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=value_fn,
+    )
+
+
+# Counters of the bus are shared by all heat pumps on it
+METRIC_SENSORS: tuple[ClivetMetricSensorEntityDescription, ...] = (
+    *_duration_sensor("read_rtt", "Read round trip time", lambda c: c.metrics.read_rtt),
+    *_duration_sensor(
+        "update_duration", "Update duration", lambda c: c.metrics.update_duration
+    ),
+    _counter_sensor("timeouts", "Request timeouts", lambda c: c.metrics.timeouts),
+    _counter_sensor(
+        "error_responses", "Error responses", lambda c: c.metrics.error_responses
+    ),
+    _counter_sensor(
+        "block_retries", "Block retries", lambda c: c.metrics.block_retries
+    ),
+    _counter_sensor(
+        "bus_reconnects", "Bus reconnects", lambda c: c.bus.traffic.reconnects
+    ),
+    _counter_sensor(
+        "bus_bytes_sent",
+        "Bus bytes sent",
+        lambda c: c.bus.traffic.bytes_sent,
+        UnitOfInformation.BYTES,
+    ),
+    _counter_sensor(
+        "bus_bytes_received",
+        "Bus bytes received",
+        lambda c: c.bus.traffic.bytes_received,
+        UnitOfInformation.BYTES,
+    ),
+)
 
 
 async def async_setup_entry(
@@ -26,457 +162,19 @@ async def async_setup_entry(
 ) -> None:
     coordinator = config_entry.runtime_data
     entities = [
-        ClivetTemperatureSensorEntity(
-            address=2804,
-            name="Current setpoint",
-            coordinator=coordinator,
-            device=ClivetDevice.DHW,
-        ),
-        ClivetSensorEntity(
-            address=2805,
-            name="Resistance operation",
-            unit=UnitOfTime.HOURS,
-            coordinator=coordinator,
-            device=ClivetDevice.DHW,
-            state_class=SensorStateClass.TOTAL_INCREASING,
-            device_class=SensorDeviceClass.DURATION,
-        ),
-        ClivetSensorEntity(
-            address=2806,
-            name="Resistance starts",
-            unit=None,
-            coordinator=coordinator,
-            device=ClivetDevice.DHW,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4200,
-            name="Current setpoint",
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4201,
-            name="Actual temperature difference (including compensation)",
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetSensorEntity(
-            address=4202,
-            name="Timer relative to resource insertion ",
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-            unit=UnitOfTime.SECONDS,
-            device_class=SensorDeviceClass.DURATION,
-        ),
-        ClivetSensorEntity(
-            address=4203,
-            name="Dynamic TimeScan relative to resource insertion ",
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-            unit=UnitOfTime.SECONDS,
-            device_class=SensorDeviceClass.DURATION,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4204,
-            name="External T compensation",
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4205,
-            name="Ambient T Compensation",
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4207,
-            name="Charge compensation",
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4208,
-            name="Duty Cycle compensation",
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4209,
-            name="Compensation on duration",
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4210,
-            name="Exchanger water inlet temperature (Return)",
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4211,
-            name="Exchanger water outlet temperature (Supply)",
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4213,
-            name="Outdoor air temperature",
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4215,
-            name="DHW accumulation temperature (high probe)",
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetSensorEntity(
-            address=4216,
-            name="Utility pump",
-            unit="%",
-            scale=0.1,
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetSensorEntity(
-            address=4219,
-            name="Condensing pressure C1",
-            unit=UnitOfPressure.BAR,
-            scale=0.01,
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-            device_class=SensorDeviceClass.PRESSURE,
-        ),
-        ClivetSensorEntity(
-            address=4220,
-            name="Evaporating pressure C1",
-            unit=UnitOfPressure.BAR,
-            scale=0.01,
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-            device_class=SensorDeviceClass.PRESSURE,
-        ),
-        ClivetSensorEntity(
-            address=4221,
-            name="Auxiliary heater control signal (0-10V)",
-            unit="%",
-            scale=0.1,
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4223,
-            name="boiler modulating (set)/ Boiler valves control",
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetSensorEntity(
-            address=4225,
-            name="Thermoregulator request",
-            unit="%",
-            scale=0.1,
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetSensorEntity(
-            address=4226,
-            name="Variable speed compressor (0-10V)",
-            unit="%",
-            scale=0.1,
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetSensorEntity(
-            address=4227,
-            name="Compressor operating hours",
-            unit=UnitOfTime.HOURS,
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-            state_class=SensorStateClass.TOTAL_INCREASING,
-            device_class=SensorDeviceClass.DURATION,
-        ),
-        ClivetSensorEntity(
-            address=4228,
-            name="Compressor starts",
-            unit=None,
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-            state_class=SensorStateClass.TOTAL_INCREASING,
-        ),
-        ClivetSensorEntity(
-            address=4235,
-            name="Electrical power absorbed",
-            unit=UnitOfPower.KILO_WATT,
-            coordinator=coordinator,
-            device=ClivetDevice.COMPRESSOR,
-            device_class=SensorDeviceClass.POWER,
-            scale=0.1,
-        ),
-        ClivetSensorEntity(
-            address=4236,
-            name="Current M-ODU",
-            unit=UnitOfElectricCurrent.AMPERE,
-            coordinator=coordinator,
-            device=ClivetDevice.COMPRESSOR,
-            device_class=SensorDeviceClass.CURRENT,
-            scale=0.1,
-        ),
-        ClivetSensorEntity(
-            address=4237,
-            name="Voltage M-ODU",
-            unit=UnitOfElectricPotential.VOLT,
-            coordinator=coordinator,
-            device=ClivetDevice.COMPRESSOR,
-            device_class=SensorDeviceClass.VOLTAGE,
-        ),
-        ClivetSensorEntity(
-            address=4238,
-            name="Frequency M-ODU",
-            unit=UnitOfFrequency.HERTZ,
-            coordinator=coordinator,
-            device=ClivetDevice.COMPRESSOR,
-            device_class=SensorDeviceClass.FREQUENCY,
-            scale=0.1,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4248,
-            name="Return temperature",
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4249,
-            name="Discharge temperature",
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetSensorEntity(
-            address=4252,
-            name="Regolation valve opening percentage",
-            unit="%",
-            scale=0.1,
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetSensorEntity(
-            address=4262,
-            name="Fan",
-            unit=None,
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-            scale=0.1,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4266,
-            name="DHW setpoint",
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-        ),
-        ClivetSensorEntity(
-            address=4273,
-            name="Primary flow rate",
-            unit=UnitOfVolumeFlowRate.LITERS_PER_MINUTE,
-            scale=0.1,
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-            device_class=SensorDeviceClass.VOLUME_FLOW_RATE,
-        ),
-        ClivetSensorEntity(
-            address=4275,
-            name="DHW circuit flow rate",
-            unit=UnitOfVolumeFlowRate.LITERS_PER_MINUTE,
-            scale=0.1,
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-            device_class=SensorDeviceClass.VOLUME_FLOW_RATE,
-        ),
-        ClivetSensorEntity(
-            address=4276,
-            name="DHW total consumption",
-            unit=UnitOfVolume.LITERS,
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-            device_class=SensorDeviceClass.WATER,
-            state_class=SensorStateClass.TOTAL_INCREASING,
-            scale=0.1,
-        ),
-        ClivetStatusSensorEntity(
-            address=4300,
-            name="Set operating mode",
-            device=ClivetDevice.COMPRESSOR,
-            coordinator=coordinator,
-            status_map={
-                0: "Off",
-                2: "Cooling",
-                3: "Heating",
-                4: "Forced Cooling",
-                5: "Water Heating",
-            },
-        ),
-        ClivetSensorEntity(
-            address=4301,
-            name="Requested work frequency",
-            unit=UnitOfFrequency.HERTZ,
-            coordinator=coordinator,
-            device=ClivetDevice.COMPRESSOR,
-            device_class=SensorDeviceClass.FREQUENCY,
-        ),
-        ClivetSensorEntity(
-            address=4302,
-            name="Operating work frequency",
-            unit=UnitOfFrequency.HERTZ,
-            coordinator=coordinator,
-            device=ClivetDevice.COMPRESSOR,
-            device_class=SensorDeviceClass.FREQUENCY,
-        ),
-        ClivetStatusSensorEntity(
-            address=4303,
-            name="M-ODU operating mode",
-            device=ClivetDevice.COMPRESSOR,
-            coordinator=coordinator,
-            status_map={
-                0: "Off",
-                2: "Cooling",
-                3: "Heating",
-                4: "Forced Cooling",
-                5: "Water Heating",
-            },
-        ),
-        ClivetSensorEntity(
-            address=4304,
-            name="Fan speed",
-            unit=None,
-            coordinator=coordinator,
-            device=ClivetDevice.COMPRESSOR,
-            scale=0.1,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4305,
-            name="Condenser output temperature T3",
-            coordinator=coordinator,
-            device=ClivetDevice.COMPRESSOR,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4306,
-            name="Outdoor Temperature T4",
-            coordinator=coordinator,
-            device=ClivetDevice.COMPRESSOR,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4307,
-            name="Compressor discharge temperature Tp",
-            coordinator=coordinator,
-            device=ClivetDevice.COMPRESSOR,
-        ),
-        ClivetSensorEntity(
-            address=4308,
-            name="Inverter protection code",
-            unit=None,
-            coordinator=coordinator,
-            device=ClivetDevice.COMPRESSOR,
-        ),
-        ClivetSensorEntity(
-            address=4309,
-            name="M-ODU absorbed current",
-            unit=UnitOfElectricCurrent.AMPERE,
-            coordinator=coordinator,
-            device=ClivetDevice.COMPRESSOR,
-            device_class=SensorDeviceClass.CURRENT,
-        ),
-        ClivetSensorEntity(
-            address=4310,
-            name="M-ODU voltage",
-            unit=UnitOfElectricPotential.VOLT,
-            coordinator=coordinator,
-            device=ClivetDevice.COMPRESSOR,
-            device_class=SensorDeviceClass.VOLTAGE,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4311,
-            name="Thermostatic opening degrees",
-            coordinator=coordinator,
-            device=ClivetDevice.COMPRESSOR,
-        ),
-        ClivetSensorEntity(
-            address=4313,
-            name="Error code",
-            unit=None,
-            coordinator=coordinator,
-            device=ClivetDevice.COMPRESSOR,
-        ),
-        ClivetTemperatureSensorEntity(
-            address=4315,
-            name="Extraction temperature",
-            coordinator=coordinator,
-            device=ClivetDevice.COMPRESSOR,
-        ),
-        ClivetSensorEntity(
-            address=4316,
-            name="Pressure transducer 1",
-            unit=UnitOfPressure.BAR,
-            scale=0.01,
-            coordinator=coordinator,
-            device=ClivetDevice.COMPRESSOR,
-            device_class=SensorDeviceClass.PRESSURE,
-        ),
-        ClivetSensorEntity(
-            address=4317,
-            name="Pressure transducer 2",
-            unit=UnitOfPressure.BAR,
-            scale=0.01,
-            coordinator=coordinator,
-            device=ClivetDevice.COMPRESSOR,
-            device_class=SensorDeviceClass.PRESSURE,
-        ),
-        ClivetSensorEntity(
-            address=7000,
-            name="Lower frequency limit",
-            unit=UnitOfFrequency.HERTZ,
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-            device_class=SensorDeviceClass.FREQUENCY,
-        ),
-        ClivetSensorEntity(
-            address=7001,
-            name="Upper frequency limit",
-            unit=UnitOfFrequency.HERTZ,
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-            device_class=SensorDeviceClass.FREQUENCY,
-        ),
-        ClivetSensorEntity(
-            address=7002,
-            name="Thermoregulator requested frequency",
-            unit=UnitOfFrequency.HERTZ,
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-            device_class=SensorDeviceClass.FREQUENCY,
-        ),
-        ClivetSensorEntity(
-            address=7003,
-            name="Requested outdoor unit frequency",
-            unit=UnitOfFrequency.HERTZ,
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-            device_class=SensorDeviceClass.FREQUENCY,
-        ),
-        ClivetSensorEntity(
-            address=7004,
-            name="Current outdoor unit frequency",
-            unit=UnitOfFrequency.HERTZ,
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-            device_class=SensorDeviceClass.FREQUENCY,
-        ),
-        ClivetSensorEntity(
-            address=7005,
-            name="Defrost mode frequency",
-            unit=UnitOfFrequency.HERTZ,
-            coordinator=coordinator,
-            device=ClivetDevice.HEAT_PUMP,
-            device_class=SensorDeviceClass.FREQUENCY,
-        ),
+        ClivetStatusSensorEntity(description=description, coordinator=coordinator)
+        if description.options is not None
+        else ClivetSensorEntity(description=description, coordinator=coordinator)
+        for description in REGISTERS.platforms[Platform.SENSOR]
     ]
+    entities.extend(
+        ClivetDerivedSensorEntity(description=description, coordinator=coordinator)
+        for description in DERIVED_SENSORS
+    )
+    entities.extend(
+        ClivetMetricSensorEntity(description=description, coordinator=coordinator)
+        for description in METRIC_SENSORS
+    )
     async_add_entities(entities, True)
 
 
@@ -484,87 +182,157 @@ class ClivetSensorEntity(ClivetNumericBaseEntity, SensorEntity):
     def __init__(
         self,
         *,
-        address: int,
-        name: str,
-        unit: str | None,
-        device: ClivetDevice,
-        scale: float = 1,
-        signed: bool = False,
+        description: RegisterDescription,
         coordinator: ClivetCoordinator,
-        state_class: SensorStateClass | None = SensorStateClass.MEASUREMENT,
-        device_class: SensorDeviceClass | None = None,
     ) -> None:
-        self._attr_native_unit_of_measurement = unit
-        self._attr_state_class = state_class
-        self._attr_device_class = device_class
-        self.scale = scale
-        self.signed = signed
+        self._attr_native_unit_of_measurement = description.unit
+        self._attr_state_class = description.state_class
+        self._attr_device_class = description.device_class
+        self.state_filter = description.state_filter
+        # Monotonic time and availability of the last written state
+        self._written_at = 0.0
+        self._written_available: bool | None = None
+        self._delayed_write_at = 0.0
+        self._unsub_delayed_write: CALLBACK_TYPE | None = None
         super().__init__(
-            address=address,
-            name=name,
-            device=device,
+            address=description.address,
+            name=description.name,
+            device=description.device,
             coordinator=coordinator,
-            signed=signed,
-            scale=scale,
+            signed=description.signed,
+            scale=description.scale,
         )
 
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a delayed state write."""
+        await super().async_will_remove_from_hass()
+        self._cancel_delayed_write()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        value = self.coordinator.data.decoded.get(self.address)
+        if self.state_filter is None or not self.coordinator.state_filter:
+            self._write_value(value)
+            return
+
+        # Values within the deadband are only written as a heartbeat, so the
+        # state does not drift from the register for too long
+        now = time.monotonic()
+        if self.available != self._written_available:
+            delay = 0.0
+        elif self.state_filter.is_significant(self._attr_native_value, value):
+            delay = self._written_at + self.state_filter.min_interval - now
+        else:
+            delay = self._written_at + self.coordinator.state_max_interval - now
+        if delay <= 0:
+            self._write_value(value)
+        elif self._unsub_delayed_write is None or now + delay < self._delayed_write_at:
+            self._cancel_delayed_write()
+            self._delayed_write_at = now + delay
+            self._unsub_delayed_write = async_call_later(
+                self.hass, delay, self._handle_delayed_write
+            )
+
+    @callback
+    def _handle_delayed_write(self, _now: datetime) -> None:
+        self._unsub_delayed_write = None
+        self._write_value(self.coordinator.data.decoded.get(self.address))
+
+    @callback
+    def _cancel_delayed_write(self) -> None:
+        if self._unsub_delayed_write is not None:
+            self._unsub_delayed_write()
+            self._unsub_delayed_write = None
+
+    @callback
+    def _write_value(self, value: int | float | None) -> None:
+        self._cancel_delayed_write()
+        self._attr_native_value = value
+        self._written_at = time.monotonic()
+        self._written_available = self.available
+        self.async_write_ha_state()
+
+
+class ClivetStatusSensorEntity(ClivetSensorEntity):
+    def __init__(
+        self,
+        *,
+        description: RegisterDescription,
+        coordinator: ClivetCoordinator,
+    ) -> None:
+        assert description.options is not None
+        self._attr_options = list(description.options.values())
+        self.status_map = description.options
+        super().__init__(description=description, coordinator=coordinator)
+
     @callback
     def _handle_coordinator_update(self) -> None:
         data = self.coordinator.data.get(self.address)
         self._attr_native_value = (
-            self.decode_numeric_value(data) if data is not None else None
+            self.status_map.get(data, None) if data is not None else None
         )
         self.async_write_ha_state()
 
 
-class ClivetTemperatureSensorEntity(ClivetSensorEntity):
+class ClivetDerivedSensorEntity(CoordinatorEntity[ClivetCoordinator], SensorEntity):
+    """Sensor of a metric the coordinator derives from the registers of a poll.
+
+    The registers the metric is derived from are read along with the others, and
+    the state is written when one of them changes. The state of metrics over a
+    window of time is written after every update.
+    """
+
+    _attr_has_entity_name = True
+    entity_description: ClivetDerivedSensorEntityDescription
+
     def __init__(
         self,
         *,
-        address: int,
-        name: str,
-        device: ClivetDevice,
+        description: ClivetDerivedSensorEntityDescription,
         coordinator: ClivetCoordinator,
     ) -> None:
-        super().__init__(
-            address=address,
-            name=name,
-            scale=0.1,
-            signed=True,
-            device=device,
-            unit=UnitOfTemperature.CELSIUS,
-            coordinator=coordinator,
-            state_class=SensorStateClass.MEASUREMENT,
-            device_class=SensorDeviceClass.TEMPERATURE,
-        )
+        super().__init__(coordinator, context=INPUT_REGISTERS)
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.unique_id}_{description.key}"
+        self._attr_device_info = build_device_info(coordinator, ClivetDevice.HEAT_PUMP)
 
+    async def async_added_to_hass(self) -> None:
+        """Also write the state of a windowed metric after every update."""
+        await super().async_added_to_hass()
+        if self.entity_description.windowed:
+            self.async_on_remove(
+                self.coordinator.async_add_listener(self._handle_coordinator_update)
+            )
+
+    @property
+    def native_value(self) -> float | None:
+        return self.entity_description.value_fn(self.coordinator.derived)
+
+
+class ClivetMetricSensorEntity(CoordinatorEntity[ClivetCoordinator], SensorEntity):
+    """Diagnostic sensor showing how the requests to the heat pump perform."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    entity_description: ClivetMetricSensorEntityDescription
 
-class ClivetStatusSensorEntity(ClivetSensorEntity):
     def __init__(
         self,
         *,
-        address: int,
-        name: str,
-        status_map: dict[int, str],
-        device: ClivetDevice,
+        description: ClivetMetricSensorEntityDescription,
         coordinator: ClivetCoordinator,
     ) -> None:
-        self._attr_options = list(status_map.values())
-        self.status_map = status_map
-        super().__init__(
-            address=address,
-            name=name,
-            unit=None,
-            device=device,
-            coordinator=coordinator,
-            state_class=None,
-            device_class=SensorDeviceClass.ENUM,
-        )
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.unique_id}_{description.key}"
+        self._attr_device_info = build_device_info(coordinator, ClivetDevice.HEAT_PUMP)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        data = self.coordinator.data.get(self.address)
-        self._attr_native_value = (
-            self.status_map.get(data, None) if data is not None else None
-        )
-        self.async_write_ha_state()
+    @property
+    def available(self) -> bool:
+        """Return True, the metrics are most useful when updates fail."""
+        return True
+
+    @property
+    def native_value(self) -> float | None:
+        return self.entity_description.value_fn(self.coordinator)
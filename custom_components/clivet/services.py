@@ -0,0 +1,72 @@
+"""Services of the Clivet integration."""
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .const import DOMAIN
+from .exceptions import CommunicationException, OfflineException
+
+SERVICE_SCAN_REGISTERS = "scan_registers"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_PACE = "pace"
+
+SCAN_REGISTERS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_START, default=0): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=65535)
+        ),
+        vol.Optional(ATTR_END, default=10000): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=65536)
+        ),
+        vol.Optional(ATTR_PACE, default=0.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=10)
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def _async_scan_registers(call: ServiceCall) -> ServiceResponse:
+        entry = hass.config_entries.async_get_entry(call.data[ATTR_CONFIG_ENTRY_ID])
+        if entry is None or entry.domain != DOMAIN:
+            raise ServiceValidationError("Unknown Clivet config entry")
+        if entry.state is not ConfigEntryState.LOADED:
+            raise ServiceValidationError(f"{entry.title} is not loaded")
+        if call.data[ATTR_START] >= call.data[ATTR_END]:
+            raise ServiceValidationError("The start address must be below the end")
+
+        try:
+            result = await entry.runtime_data.async_scan_registers(
+                call.data[ATTR_START], call.data[ATTR_END], call.data[ATTR_PACE]
+            )
+        except (CommunicationException, OfflineException) as e:
+            raise HomeAssistantError(f"Scanning registers failed: {e}") from e
+        return {
+            "readable": [[address, count] for address, count in result.readable],
+            "skipped": [[address, count] for address, count in result.skipped],
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SCAN_REGISTERS,
+        _async_scan_registers,
+        schema=SCAN_REGISTERS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -2,10 +2,13 @@ from typing import Any
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from .entity import ClivetBooleanBaseEntity, ClivetDevice
+from .coordinator import ClivetCoordinator
+from .entity import ClivetBooleanBaseEntity
+from .register_map import REGISTERS, RegisterDescription
 
 
 async def async_setup_entry(
@@ -14,132 +17,29 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     coordinator = config_entry.runtime_data
-    entities: list[ClivetSwitchEntity] = [
-        ClivetSwitchEntity(
-            address=2600,
-            bit=0,
-            name="System status",
-            device=ClivetDevice.HEAT_PUMP,
-            coordinator=coordinator,
-        ),
-        ClivetSwitchEntity(
-            address=2600,
-            bit=2,
-            name="Heat/cool mode",
-            device=ClivetDevice.HEAT_PUMP,
-            coordinator=coordinator,
-        ),
-        ClivetSwitchEntity(
-            address=2600,
-            bit=2,
-            name="Cool/heat mode",
-            device=ClivetDevice.HEAT_PUMP,
-            coordinator=coordinator,
-            invert=True,
-        ),
-        ClivetSwitchEntity(
-            address=2600,
-            bit=4,
-            name="DHW only mode",
-            device=ClivetDevice.HEAT_PUMP,
-            coordinator=coordinator,
-        ),
-        ClivetSwitchEntity(
-            address=2600,
-            bit=9,
-            name="Room thermoregulation request",
-            device=ClivetDevice.HEAT_PUMP,
-            coordinator=coordinator,
-        ),
-        ClivetSwitchEntity(
-            address=2601,
-            bit=2,
-            name="Enable remote unit mode",
-            device=ClivetDevice.HEAT_PUMP,
-            coordinator=coordinator,
-        ),
-        ClivetSwitchEntity(
-            address=2601,
-            bit=4,
-            name="Enable remote DHW only",
-            device=ClivetDevice.HEAT_PUMP,
-            coordinator=coordinator,
-        ),
-        ClivetSwitchEntity(
-            address=2601,
-            bit=5,
-            name="Enable remote unit state",
-            device=ClivetDevice.HEAT_PUMP,
-            coordinator=coordinator,
-        ),
-        ClivetSwitchEntity(
-            address=2601,
-            bit=15,
-            name="Enable remote demand limit",
-            device=ClivetDevice.HEAT_PUMP,
-            coordinator=coordinator,
-        ),
-        ClivetSwitchEntity(
-            address=2602,
-            bit=1,
-            name="Enable thermoregulation request",
-            device=ClivetDevice.HEAT_PUMP,
-            coordinator=coordinator,
-        ),
-        ClivetSwitchEntity(
-            address=2602,
-            bit=3,
-            name="Enable remote DHW control",
-            device=ClivetDevice.HEAT_PUMP,
-            coordinator=coordinator,
-        ),
-        ClivetSwitchEntity(
-            address=2709,
-            bit=0,
-            name="Enable remote DHW control",
-            device=ClivetDevice.DHW,
-            coordinator=coordinator,
-        ),
-        ClivetSwitchEntity(
-            address=2709,
-            bit=1,
-            name="Enable remote storage tank setpoint",
-            device=ClivetDevice.DHW,
-            coordinator=coordinator,
-        ),
-        ClivetSwitchEntity(
-            address=2709,
-            bit=2,
-            name="Enable remote DHW range",
-            device=ClivetDevice.DHW,
-            coordinator=coordinator,
-        ),
-        ClivetSwitchEntity(
-            address=2709,
-            bit=3,
-            name="Enable remote maintenance setpoint",
-            device=ClivetDevice.DHW,
-            coordinator=coordinator,
-        ),
-        ClivetSwitchEntity(
-            address=2709,
-            bit=4,
-            name="Enable remote anti-legionella setpoint",
-            device=ClivetDevice.DHW,
-            coordinator=coordinator,
-        ),
-        ClivetSwitchEntity(
-            address=2709,
-            bit=6,
-            name="Enable remote anti-legionionella interval",
-            device=ClivetDevice.DHW,
-            coordinator=coordinator,
-        ),
+    entities = [
+        ClivetSwitchEntity(description=description, coordinator=coordinator)
+        for description in REGISTERS.platforms[Platform.SWITCH]
     ]
     async_add_entities(entities, True)
 
 
 class ClivetSwitchEntity(ClivetBooleanBaseEntity, SwitchEntity):
+    def __init__(
+        self,
+        *,
+        description: RegisterDescription,
+        coordinator: ClivetCoordinator,
+    ) -> None:
+        super().__init__(
+            address=description.address,
+            name=description.name,
+            device=description.device,
+            coordinator=coordinator,
+            bit=description.bit,
+            invert=description.invert,
+        )
+
     @callback
     def _handle_coordinator_update(self) -> None:
         data = self.coordinator.data.get(self.address)
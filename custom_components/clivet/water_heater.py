@@ -15,8 +15,9 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
+from .const import ClivetDevice
 from .coordinator import ClivetCoordinator
-from .entity import ClivetBooleanBaseEntity, ClivetDevice, ClivetNumericBaseEntity
+from .entity import ClivetBooleanBaseEntity, ClivetNumericBaseEntity
 from .exceptions import CommunicationException
 
 
@@ -68,10 +69,21 @@ class ClivetWaterHeater(ClivetNumericBaseEntity, WaterHeaterEntity):
             STATE_ECO,
         ]
 
+    @property
+    def addresses(self) -> tuple[int, ...]:
+        """Return the register addresses this entity reads."""
+        return (2700, 2701, 2702, 2707, 2709, 2800, 4264)
+
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return self._attr_current_operation is not None
+        return (
+            self.coordinator.last_update_success
+            and self._attr_current_operation is not None
+            and not any(
+                self.coordinator.is_stale(address) for address in self.addresses
+            )
+        )
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -171,37 +183,23 @@ class ClivetWaterHeater(ClivetNumericBaseEntity, WaterHeaterEntity):
             await self.async_turn_off()
             return
 
-        current_2700 = self.coordinator.data.get(2700)
-        current_2709 = self.coordinator.data.get(2709)
-        if current_2700 is None or current_2709 is None:
-            raise HomeAssistantError("Failed to retrieve current operation mode")
-
-        new_2709 = self.set_bit_values(
-            current_2709, {0: True, 1: True, 2: True, 3: False}
-        )
-
         if operation_mode == STATE_ELECTRIC:
             # set storage mode on, resistance only on, boost mode off
-            new_2700 = self.set_bit_values(
-                current_2700, {0: True, 2: True, 5: True, 6: False}
-            )
+            bits_2700 = {0: True, 2: True, 5: True, 6: False}
         elif operation_mode == STATE_HEAT_PUMP:
-            new_2700 = self.set_bit_values(
-                current_2700, {0: True, 2: True, 5: False, 6: False}
-            )
+            bits_2700 = {0: True, 2: True, 5: False, 6: False}
         elif operation_mode == STATE_PERFORMANCE:
-            new_2700 = self.set_bit_values(
-                current_2700, {0: True, 2: True, 5: False, 6: True}
-            )
+            bits_2700 = {0: True, 2: True, 5: False, 6: True}
         elif operation_mode == STATE_ECO:
-            new_2700 = self.set_bit_values(
-                current_2700, {0: True, 2: False, 5: False, 6: False}
-            )
+            bits_2700 = {0: True, 2: False, 5: False, 6: False}
         else:
             raise HomeAssistantError(f"Unsupported operation mode: {operation_mode}")
 
+        # Both registers are locked from reading to writing them, so bits switched
+        # at the same time are not lost
         try:
-            await self.coordinator.set_modbus_register(2700, new_2700)
-            await self.coordinator.set_modbus_register(2709, new_2709)
+            await self.coordinator.set_modbus_bits(
+                {2700: bits_2700, 2709: {0: True, 1: True, 2: True, 3: False}}
+            )
         except CommunicationException as e:
             raise HomeAssistantError from e
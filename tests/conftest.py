@@ -0,0 +1,157 @@
+"""Fixtures of the coordinator tests: Home Assistant and a fake Modbus device."""
+
+import asyncio
+from collections.abc import AsyncIterator, Container
+import logging
+from types import MappingProxyType
+
+from pymodbus.constants import ExcCodes
+from pymodbus.pdu import ExceptionResponse, ModbusPDU
+from pymodbus.pdu.register_message import (
+    ReadHoldingRegistersResponse,
+    WriteMultipleRegistersResponse,
+    WriteSingleRegisterResponse,
+)
+import pytest
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_PROTOCOL, CONF_SLAVE
+from homeassistant.core import HomeAssistant
+
+from custom_components.clivet import bus
+from custom_components.clivet.const import DOMAIN
+from custom_components.clivet.coordinator import ClivetCoordinator
+
+DEVICE_ID = 2
+
+
+class FakeModbusDevice:
+    """Holding registers of a device, shared by the clients connected to it."""
+
+    def __init__(self) -> None:
+        self.registers: dict[int, int] = {4312: 12, 4318: 3}
+        # Reads and writes the device received, as (address, count) and
+        # (address, values)
+        self.reads: list[tuple[int, int]] = []
+        self.writes: list[tuple[int, list[int]]] = []
+        # Requests are not answered while False
+        self.responding = True
+        # Number of the next requests whose response is lost
+        self.lost = 0
+        # Registers whose writes are answered with an exception code
+        self.rejected_writes: Container[int] = ()
+        # Raised by writes instead of sending them, like by a bug in the client
+        self.write_error: Exception | None = None
+        # Requests are held until it is set
+        self.released = asyncio.Event()
+        self.released.set()
+
+    async def respond(self) -> None:
+        """Wait until the request is answered, like a device on the network."""
+        await self.released.wait()
+        if not self.responding or self.lost:
+            self.lost = max(0, self.lost - 1)
+            await asyncio.Future()
+
+
+class FakeModbusClient:
+    """Client of the fake device, with the requests of a pymodbus client."""
+
+    def __init__(self, device: FakeModbusDevice) -> None:
+        self.device = device
+        self.connected = False
+
+    async def connect(self) -> bool:
+        self.connected = True
+        return True
+
+    def close(self) -> None:
+        self.connected = False
+
+    async def read_holding_registers(
+        self, address: int, *, count: int = 1, device_id: int = 1
+    ) -> ModbusPDU:
+        self.device.reads.append((address, count))
+        await self.device.respond()
+        return ReadHoldingRegistersResponse(
+            registers=[
+                self.device.registers.get(register, 0)
+                for register in range(address, address + count)
+            ]
+        )
+
+    async def write_register(
+        self, address: int, value: int, *, device_id: int = 1
+    ) -> ModbusPDU:
+        return await self.write_registers(address, [value], device_id=device_id)
+
+    async def write_registers(
+        self, address: int, values: list[int], *, device_id: int = 1
+    ) -> ModbusPDU:
+        if self.device.write_error is not None:
+            raise self.device.write_error
+        self.device.writes.append((address, values))
+        await self.device.respond()
+        if any(
+            register in self.device.rejected_writes
+            for register in range(address, address + len(values))
+        ):
+            return ExceptionResponse(0x10, ExcCodes.ILLEGAL_VALUE)
+        for offset, value in enumerate(values):
+            self.device.registers[address + offset] = value
+        if len(values) == 1:
+            return WriteSingleRegisterResponse(address=address, registers=values)
+        return WriteMultipleRegistersResponse(address=address, count=len(values))
+
+
+@pytest.fixture
+def device(monkeypatch: pytest.MonkeyPatch) -> FakeModbusDevice:
+    """Return the device the Modbus clients of the integration connect to."""
+    device = FakeModbusDevice()
+    monkeypatch.setattr(
+        bus, "build_client", lambda data, trace_packet=None: FakeModbusClient(device)
+    )
+    return device
+
+
+@pytest.fixture
+async def hass(tmp_path) -> AsyncIterator[HomeAssistant]:
+    """Return a Home Assistant instance that is not started."""
+    hass = HomeAssistant(str(tmp_path))
+    yield hass
+    await hass.async_stop(force=True)
+
+
+@pytest.fixture
+def config_entry() -> ConfigEntry:
+    """Return the config entry of a device connected over TCP."""
+    return ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Clivet",
+        data={
+            CONF_HOST: "127.0.0.1",
+            CONF_PORT: 502,
+            CONF_PROTOCOL: "tcp",
+            CONF_SLAVE: DEVICE_ID,
+        },
+        options={},
+        source="user",
+        unique_id=None,
+        discovery_keys=MappingProxyType({}),
+        subentries_data=None,
+    )
+
+
+@pytest.fixture
+async def coordinator(
+    hass: HomeAssistant, config_entry: ConfigEntry, device: FakeModbusDevice
+) -> AsyncIterator[ClivetCoordinator]:
+    """Return the coordinator of the fake device."""
+    coordinator = ClivetCoordinator(
+        hass, config_entry, logging.getLogger("custom_components.clivet")
+    )
+    yield coordinator
+    device.released.set()
+    await coordinator.async_shutdown()
@@ -0,0 +1,40 @@
+"""Tests of the connections shared by the devices on a transport."""
+
+import asyncio
+
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_PROTOCOL
+
+from custom_components.clivet.bus import ModbusBus
+
+from conftest import FakeModbusDevice
+
+DATA = {CONF_HOST: "127.0.0.1", CONF_PORT: 502, CONF_PROTOCOL: "tcp"}
+
+
+async def test_devices_keep_to_their_own_pipeline_depth(
+    device: FakeModbusDevice,
+) -> None:
+    bus = ModbusBus("tcp://127.0.0.1:502", DATA)
+    bus.add_owner("sequential", 1)
+    bus.add_owner("pipelined", 3)
+    assert bus.depth == 3
+    assert bus.owner_depth("sequential") == 1
+
+    async def read(owner: str) -> None:
+        async with bus.transaction(owner):
+            await device.released.wait()
+
+    device.released.clear()
+    reads = [asyncio.create_task(read("sequential")) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert bus._in_flight == {"sequential": 1}
+    assert len(bus._idle) == 2
+
+    reads += [asyncio.create_task(read("pipelined")) for _ in range(2)]
+    await asyncio.sleep(0)
+    assert bus._in_flight == {"sequential": 1, "pipelined": 2}
+
+    device.released.set()
+    await asyncio.gather(*reads)
+    assert not bus._in_flight
+    assert len(bus._idle) == 3
@@ -0,0 +1,184 @@
+"""Tests of the coordinator against a fake Modbus device."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.clivet import bus
+from custom_components.clivet.bus import RTT_MIN_SAMPLES
+from custom_components.clivet.coordinator import ClivetCoordinator, ConnectionState
+from custom_components.clivet.exceptions import CommunicationException
+
+from conftest import FakeModbusDevice
+
+
+async def _wait_for_read(device: FakeModbusDevice) -> None:
+    """Wait until the device received a read."""
+    reads = len(device.reads)
+    while len(device.reads) == reads:
+        await asyncio.sleep(0)
+
+
+async def test_listeners_are_updated_when_their_register_changes(
+    coordinator: ClivetCoordinator, device: FakeModbusDevice
+) -> None:
+    calls: list[str] = []
+    coordinator.async_add_listener(lambda: calls.append("water"), (4210,))
+    coordinator.async_add_listener(lambda: calls.append("outdoor"), (4211,))
+    await coordinator.async_refresh()
+    calls.clear()
+
+    device.registers[4210] = 350
+    await coordinator.async_refresh()
+    assert calls == ["water"]
+
+
+async def test_listener_added_during_a_refresh_gets_its_state(
+    coordinator: ClivetCoordinator, device: FakeModbusDevice
+) -> None:
+    coordinator.async_add_listener(lambda: None, (4210,))
+    await coordinator.async_refresh()
+
+    # The register is read with the model, so its value does not change
+    device.released.clear()
+    refresh = asyncio.create_task(coordinator.async_refresh())
+    await _wait_for_read(device)
+    calls: list[None] = []
+    coordinator.async_add_listener(lambda: calls.append(None), (4313,))
+    device.released.set()
+    await refresh
+
+    await coordinator.async_refresh()
+    assert calls == [None]
+
+
+async def test_bit_changes_are_written_together(
+    coordinator: ClivetCoordinator, device: FakeModbusDevice
+) -> None:
+    device.registers[2700] = 0b0100
+    coordinator.async_add_listener(lambda: None, (2700,))
+    await coordinator.async_refresh()
+
+    await asyncio.gather(
+        coordinator.set_modbus_bit(2700, 0, True),
+        coordinator.set_modbus_bit(2700, 2, False),
+        coordinator.set_modbus_bit(2700, 3, True),
+    )
+    assert device.writes == [(2700, [0b1001])]
+    assert coordinator.data[2700] == 0b1001
+
+
+async def test_bit_changes_get_any_error_of_their_write(
+    coordinator: ClivetCoordinator, device: FakeModbusDevice
+) -> None:
+    coordinator.async_add_listener(lambda: None, (2700,))
+    await coordinator.async_refresh()
+
+    device.write_error = ValueError("Invalid request")
+    with pytest.raises(ValueError):
+        await asyncio.wait_for(
+            asyncio.gather(
+                coordinator.set_modbus_bit(2700, 0, True),
+                coordinator.set_modbus_bit(2700, 1, True),
+            ),
+            timeout=1,
+        )
+
+    # The next bit change is written on its own
+    device.write_error = None
+    await coordinator.set_modbus_bit(2700, 2, True)
+    assert device.writes == [(2700, [0b0100])]
+
+
+async def test_bit_changes_are_cancelled_when_the_entry_unloads(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    coordinator: ClivetCoordinator,
+    device: FakeModbusDevice,
+) -> None:
+    device.released.clear()
+    change = asyncio.create_task(coordinator.set_modbus_bit(2700, 0, True))
+    await _wait_for_read(device)
+
+    await config_entry._async_process_on_unload(hass)
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(change, timeout=1)
+
+
+async def test_failed_write_restores_the_registers_to_the_values_read(
+    coordinator: ClivetCoordinator, device: FakeModbusDevice
+) -> None:
+    device.registers.update({2700: 0b0101, 2709: 0})
+    coordinator.async_add_listener(lambda: None, (2700, 2709))
+    await coordinator.async_refresh()
+    coordinator.cache_max_age = 0
+
+    # Changed on the unit after the last update
+    device.registers[2700] = 0b1101
+    device.rejected_writes = {2709}
+    with pytest.raises(CommunicationException):
+        await coordinator.set_modbus_bits({2700: {1: True}, 2709: {0: True}})
+    assert device.writes[0] == (2700, [0b1111])
+    assert device.registers[2700] == 0b1101
+    assert coordinator.data[2700] == 0b1101
+
+
+async def test_bits_of_several_registers_are_written_together(
+    coordinator: ClivetCoordinator, device: FakeModbusDevice
+) -> None:
+    device.registers.update({2700: 0b0101, 2701: 0b0001})
+    coordinator.async_add_listener(lambda: None, (2700, 2701))
+    await coordinator.async_refresh()
+
+    await coordinator.set_modbus_bits({2700: {0: False}, 2701: {1: True}})
+    assert device.writes == [(2700, [0b0100, 0b0011])]
+    assert coordinator.data[2700] == 0b0100
+    assert coordinator.data[2701] == 0b0011
+
+
+async def test_device_that_does_not_respond_at_start_is_offline(
+    coordinator: ClivetCoordinator, device: FakeModbusDevice
+) -> None:
+    coordinator.async_add_listener(lambda: None, (2600, 4210))
+    coordinator.update_interval = timedelta(seconds=0.5)
+    device.responding = False
+
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert coordinator.connection_state is ConnectionState.OFFLINE
+
+
+async def test_lost_response_only_fails_its_block(
+    coordinator: ClivetCoordinator, device: FakeModbusDevice
+) -> None:
+    device.registers.update({2600: 1, 4210: 215})
+    coordinator.async_add_listener(lambda: None, (2600, 4210))
+    # Measure the round trips
+    for _ in range(RTT_MIN_SAMPLES):
+        await coordinator.async_refresh()
+
+    device.registers.update({2600: 2, 4210: 216})
+    device.lost = 1
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.connection_state is ConnectionState.ONLINE
+    assert coordinator.data[2600] == 1
+    assert coordinator.data[4210] == 216
+
+
+async def test_write_to_a_device_that_does_not_respond_times_out(
+    monkeypatch: pytest.MonkeyPatch,
+    coordinator: ClivetCoordinator,
+    device: FakeModbusDevice,
+) -> None:
+    monkeypatch.setattr(bus, "REQUEST_TIMEOUT", 0.1)
+    coordinator.async_add_listener(lambda: None, (2701,))
+    await coordinator.async_refresh()
+
+    device.responding = False
+    with pytest.raises(CommunicationException):
+        await asyncio.wait_for(coordinator.set_modbus_register(2701, 480), timeout=1)
@@ -0,0 +1,22 @@
+"""Tests of the register table."""
+
+from homeassistant.const import Platform
+
+from custom_components.clivet.register_map import REGISTERS
+from custom_components.clivet.registers import MODEL_ADDRESSES, RegisterTier
+
+
+def test_settings_are_polled_on_every_update() -> None:
+    # Settings can also be changed on the unit or by another Modbus master
+    for description in REGISTERS.platforms[Platform.NUMBER]:
+        assert REGISTERS.tier(description.address) is RegisterTier.FAST
+
+
+def test_counters_are_polled_on_the_slow_tier() -> None:
+    assert REGISTERS.tier(4227) is RegisterTier.SLOW
+    assert REGISTERS.tier(2806) is RegisterTier.SLOW
+
+
+def test_model_is_read_once() -> None:
+    for address in MODEL_ADDRESSES:
+        assert REGISTERS.tier(address) is RegisterTier.STATIC
@@ -0,0 +1,190 @@
+"""Tests of the read planner, the register snapshot and the device layout."""
+
+from custom_components.clivet.registers import (
+    ALL_BITS,
+    MODBUS_MAX_READ_COUNT,
+    MODBUS_MAX_WRITE_COUNT,
+    NO_VALUE,
+    DeviceLayout,
+    ReadBlock,
+    RegisterSnapshot,
+    RegisterTier,
+    build_read_plan,
+    build_write_plan,
+)
+
+
+def _plan(addresses, *, max_gap=10, max_count=100, tiers=None, unreadable=()):
+    return build_read_plan(
+        addresses,
+        max_gap=max_gap,
+        max_count=max_count,
+        tiers=tiers or {},
+        unreadable=unreadable,
+    )
+
+
+def test_read_plan_merges_addresses_within_max_gap() -> None:
+    assert _plan([100, 105, 116, 140], max_gap=10) == [
+        ReadBlock(100, 17),
+        ReadBlock(140, 1),
+    ]
+
+
+def test_read_plan_ignores_duplicates_and_order() -> None:
+    assert _plan([3, 1, 2, 2, 1]) == [ReadBlock(1, 3)]
+
+
+def test_read_plan_respects_max_count() -> None:
+    assert _plan(range(100, 110), max_count=4) == [
+        ReadBlock(100, 4),
+        ReadBlock(104, 4),
+        ReadBlock(108, 2),
+    ]
+
+
+def test_read_plan_groups_by_tier() -> None:
+    tiers = {200: RegisterTier.SLOW, 201: RegisterTier.SLOW, 300: RegisterTier.STATIC}
+    assert _plan([100, 101, 200, 201, 300], tiers=tiers, max_gap=200) == [
+        ReadBlock(100, 2),
+        ReadBlock(200, 2, RegisterTier.SLOW),
+        ReadBlock(300, 1, RegisterTier.STATIC),
+    ]
+
+
+def test_read_plan_reads_slower_registers_with_a_faster_block() -> None:
+    tiers = {101: RegisterTier.STATIC}
+    assert _plan([100, 101, 102], tiers=tiers) == [ReadBlock(100, 3)]
+
+
+def test_read_plan_blocks_never_overlap() -> None:
+    tiers = {105: RegisterTier.SLOW, 120: RegisterTier.SLOW}
+    plan = _plan([100, 105, 110, 120], tiers=tiers, max_gap=20)
+    assert plan == [
+        ReadBlock(100, 11),
+        ReadBlock(120, 1, RegisterTier.SLOW),
+    ]
+
+
+def test_read_plan_leaves_out_and_never_spans_unreadable_registers() -> None:
+    assert _plan([100, 102, 104, 106], unreadable={102, 105}) == [
+        ReadBlock(100, 1),
+        ReadBlock(104, 1),
+        ReadBlock(106, 1),
+    ]
+
+
+def test_read_plan_leaves_out_registers_a_scan_found_unreadable() -> None:
+    layout = DeviceLayout(scanned=[(100, 10)], readable=[(100, 3)])
+    assert _plan([100, 102, 105, 120], unreadable=layout) == [
+        ReadBlock(100, 3),
+        ReadBlock(120, 1),
+    ]
+
+
+def test_snapshot_reports_all_bits_of_new_registers() -> None:
+    snapshot = RegisterSnapshot()
+    assert snapshot.update_block(10, [1, 2, 3], 1.0) == {
+        10: ALL_BITS,
+        11: ALL_BITS,
+        12: ALL_BITS,
+    }
+    assert snapshot.as_dict() == {10: 1, 11: 2, 12: 3}
+
+
+def test_snapshot_reports_the_bits_that_flipped() -> None:
+    snapshot = RegisterSnapshot()
+    snapshot.update_block(10, [0b0001, 0b0110, 7], 1.0)
+    assert snapshot.update_block(10, [0b0001, 0b0011, 7], 2.0) == {11: 0b0101}
+    assert snapshot[11] == 0b0011
+
+
+def test_snapshot_reports_nothing_when_the_block_did_not_change() -> None:
+    snapshot = RegisterSnapshot()
+    snapshot.update_block(10, [1, 2], 1.0)
+    assert snapshot.update_block(10, [1, 2], 2.0) == {}
+    assert snapshot.age(10, now=5.0) == 3.0
+
+
+def test_snapshot_keeps_values_of_registers_that_move_to_another_block() -> None:
+    snapshot = RegisterSnapshot()
+    snapshot.update_block(10, [1, 2], 1.0)
+    assert snapshot.update_block(10, [1, 2, 3], 2.0) == {12: ALL_BITS}
+
+
+def test_snapshot_decodes_numeric_registers() -> None:
+    snapshot = RegisterSnapshot({10: (0.1, True), 11: (1, False), 12: (0.1, False)})
+    snapshot.update_block(10, [0xFFF6, 42, NO_VALUE, 5], 1.0)
+    assert snapshot.decoded[10] == -1.0
+    assert snapshot.decoded[11] == 42
+    assert snapshot.decoded[12] is None
+    # Registers without an encoding are not decoded
+    assert 13 not in snapshot.decoded
+    assert snapshot[13] == 5
+
+
+def test_snapshot_has_no_value_before_a_register_is_read() -> None:
+    snapshot = RegisterSnapshot()
+    assert 10 not in snapshot
+    assert snapshot.get(10) is None
+    assert snapshot.age(10) is None
+    assert len(snapshot) == 0
+
+
+def test_write_plan_writes_contiguous_registers_at_once() -> None:
+    assert build_write_plan({2709: 4, 2700: 1, 2701: 2, 2703: 3}) == [
+        (2700, [1, 2]),
+        (2703, [3]),
+        (2709, [4]),
+    ]
+
+
+def test_write_plan_splits_runs_at_the_maximum_write_count() -> None:
+    values = {address: address for address in range(MODBUS_MAX_WRITE_COUNT + 2)}
+    plan = build_write_plan(values)
+    assert [(address, len(run)) for address, run in plan] == [
+        (0, MODBUS_MAX_WRITE_COUNT),
+        (MODBUS_MAX_WRITE_COUNT, 2),
+    ]
+
+
+def test_layout_round_trips_through_its_stored_form() -> None:
+    layout = DeviceLayout(
+        unreadable={7, 3},
+        max_count=40,
+        scanned=[(0, 100)],
+        readable=[(0, 10), (50, 5)],
+    )
+    data = layout.as_dict()
+    assert data == {
+        "unreadable": [3, 7],
+        "max_count": 40,
+        "scanned": [[0, 100]],
+        "readable": [[0, 10], [50, 5]],
+    }
+    assert DeviceLayout.from_dict(data) == layout
+
+
+def test_layout_defaults_for_missing_keys() -> None:
+    assert DeviceLayout.from_dict({}) == DeviceLayout()
+    assert DeviceLayout().max_count == MODBUS_MAX_READ_COUNT
+
+
+def test_layout_contains_unreadable_and_unscanned_registers() -> None:
+    layout = DeviceLayout(unreadable={5}, scanned=[(100, 10)], readable=[(100, 3)])
+    assert 5 in layout
+    assert 100 not in layout
+    assert 105 in layout
+    # Registers outside the scanned ranges are assumed readable
+    assert 200 not in layout
+    assert "5" not in layout
+
+
+def test_layout_forgets_what_it_learned_but_keeps_scans() -> None:
+    layout = DeviceLayout(
+        unreadable={5}, max_count=10, scanned=[(100, 10)], readable=[(100, 3)]
+    )
+    assert layout.learned
+    layout.forget_learned()
+    assert not layout.learned
+    assert layout == DeviceLayout(scanned=[(100, 10)], readable=[(100, 3)])
@@ -0,0 +1,145 @@
+"""Tests of register scans and of learning why a device rejects a block."""
+
+import asyncio
+from collections.abc import Container
+
+import pytest
+
+from custom_components.clivet.exceptions import CommunicationException
+from custom_components.clivet.scanner import (
+    SCAN_ATTEMPTS,
+    BlockLayout,
+    ScanResult,
+    learn_block_layout,
+    merge_ranges,
+    scan_registers,
+    subtract_range,
+)
+
+
+class FakeDevice:
+    """Device rejecting unreadable registers and requests that are too large."""
+
+    def __init__(
+        self,
+        *,
+        unreadable: Container[int] = (),
+        max_count: int = 125,
+        reject_once: Container[tuple[int, int]] = (),
+        fail: Container[tuple[int, int]] = (),
+        fail_once: Container[tuple[int, int]] = (),
+    ) -> None:
+        self.unreadable = unreadable
+        self.max_count = max_count
+        # Requests rejected the first time only, like after a bad response
+        self.reject_once = set(reject_once)
+        # Requests that fail without a rejection, like a timeout
+        self.fail = fail
+        self.fail_once = set(fail_once)
+        self.requests: list[tuple[int, int]] = []
+
+    async def read(self, address: int, count: int) -> list[int] | None:
+        self.requests.append((address, count))
+        if (address, count) in self.fail:
+            raise CommunicationException
+        if (address, count) in self.fail_once:
+            self.fail_once.remove((address, count))
+            raise CommunicationException
+        if (address, count) in self.reject_once:
+            self.reject_once.remove((address, count))
+            return None
+        if count > self.max_count or any(
+            register in self.unreadable for register in range(address, address + count)
+        ):
+            return None
+        return list(range(address, address + count))
+
+
+def _learn(device: FakeDevice, address: int, count: int) -> BlockLayout:
+    return asyncio.run(learn_block_layout(device.read, address, count))
+
+
+def _scan(device: FakeDevice, start: int, end: int, **kwargs) -> ScanResult:
+    return asyncio.run(scan_registers(device.read, start, end, **kwargs))
+
+
+def test_learn_finds_unreadable_registers() -> None:
+    device = FakeDevice(unreadable={103, 110})
+    assert _learn(device, 100, 16) == BlockLayout([103, 110], None)
+
+
+def test_learn_finds_the_largest_accepted_count() -> None:
+    device = FakeDevice(max_count=11)
+    assert _learn(device, 100, 50) == BlockLayout([], 11)
+
+
+def test_learn_confirms_unreadable_registers() -> None:
+    # The register is rejected while splitting, but read when checked again
+    device = FakeDevice(reject_once={(103, 1), (102, 2), (100, 4)})
+    assert _learn(device, 100, 8) == BlockLayout([], None)
+
+
+def test_learn_confirms_the_largest_accepted_count() -> None:
+    # The whole block was rejected once, but every part of it can be read
+    device = FakeDevice()
+    assert _learn(device, 100, 40) == BlockLayout([], None)
+    assert device.requests[-1] == (100, 40)
+
+
+def test_learn_does_not_take_other_failures_for_rejections() -> None:
+    device = FakeDevice(unreadable={101}, fail={(100, 1)})
+    with pytest.raises(CommunicationException):
+        _learn(device, 100, 4)
+
+
+def test_learn_does_not_collapse_on_repeated_rejections_of_the_same_block() -> None:
+    device = FakeDevice(max_count=60)
+    assert _learn(device, 0, 100).max_count == 60
+    # Learning again from the learned size finds nothing new
+    assert _learn(device, 0, 60) == BlockLayout([], None)
+
+
+def test_scan_finds_readable_ranges() -> None:
+    device = FakeDevice(unreadable={5, 6, 20})
+    assert _scan(device, 0, 32, max_count=16) == ScanResult(
+        [(0, 5), (7, 13), (21, 11)], []
+    )
+
+
+def test_scan_of_a_dense_range_takes_one_request_per_block() -> None:
+    device = FakeDevice()
+    assert _scan(device, 0, 250, max_count=125) == ScanResult([(0, 250)], [])
+    assert device.requests == [(0, 125), (125, 125)]
+
+
+def test_scan_tries_failed_requests_again() -> None:
+    device = FakeDevice(fail_once={(0, 16)})
+    assert _scan(device, 0, 32, max_count=16) == ScanResult([(0, 32)], [])
+    assert device.requests == [(0, 16), (0, 16), (16, 16)]
+
+
+def test_scan_skips_registers_whose_requests_keep_failing() -> None:
+    # A timeout is not a rejection, so the registers are not unreadable
+    device = FakeDevice(unreadable={40}, fail={(16, 16)})
+    assert _scan(device, 0, 48, max_count=16) == ScanResult(
+        [(0, 16), (32, 8), (41, 7)], [(16, 16)]
+    )
+    assert device.requests.count((16, 16)) == SCAN_ATTEMPTS
+
+
+def test_scan_gives_up_when_requests_in_a_row_keep_failing() -> None:
+    device = FakeDevice(fail={(0, 16), (16, 16), (32, 16)})
+    with pytest.raises(CommunicationException):
+        _scan(device, 0, 64, max_count=16)
+
+
+def test_merge_ranges_merges_overlapping_and_touching_ranges() -> None:
+    assert merge_ranges([(10, 5), (0, 5), (5, 2), (12, 10), (30, 1)]) == [
+        (0, 7),
+        (10, 12),
+        (30, 1),
+    ]
+
+
+def test_subtract_range_keeps_the_parts_outside() -> None:
+    assert subtract_range([(0, 10), (20, 5), (30, 10)], 5, 35) == [(0, 5), (35, 5)]
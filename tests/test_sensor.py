@@ -0,0 +1,44 @@
+"""Tests of the sensors derived from the registers."""
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.clivet.coordinator import ClivetCoordinator
+from custom_components.clivet.sensor import DERIVED_SENSORS, ClivetDerivedSensorEntity
+
+from conftest import FakeModbusDevice
+
+
+async def test_windowed_metrics_are_written_after_every_update(
+    monkeypatch: pytest.MonkeyPatch,
+    hass: HomeAssistant,
+    coordinator: ClivetCoordinator,
+    device: FakeModbusDevice,
+) -> None:
+    await coordinator.async_refresh()
+    writes: dict[str, int] = {}
+    for description in DERIVED_SENSORS:
+        entity = ClivetDerivedSensorEntity(
+            description=description, coordinator=coordinator
+        )
+        entity.hass = hass
+        entity.entity_id = f"sensor.{description.key}"
+        writes[description.key] = 0
+        monkeypatch.setattr(
+            entity,
+            "async_write_ha_state",
+            lambda key=description.key: writes.__setitem__(key, writes[key] + 1),
+        )
+        await entity.async_added_to_hass()
+    await coordinator.async_refresh()
+
+    # None of the registers changed, but the window of the rolling COP moved
+    writes = dict.fromkeys(writes, 0)
+    await coordinator.async_refresh()
+    assert writes == {
+        "electrical_power": 0,
+        "thermal_power": 0,
+        "cop": 0,
+        "rolling_cop": 1,
+    }
@@ -0,0 +1,87 @@
+"""Scan a Clivet heat pump for readable holding registers.
+
+Connects directly to a Modbus TCP gateway, or a simulator, and prints the
+readable ranges, and the ranges whose requests kept failing, as JSON (address,
+count) pairs. The Home Assistant
+integration must not be polling the same gateway at the same time. From Home
+Assistant, use the clivet.scan_registers service instead.
+
+Run from the repository root in an environment with Home Assistant installed:
+
+    python tools/scan_registers.py 192.168.1.10 --slave 1 --start 2000 --end 8000
+"""
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import sys
+import time
+
+from pymodbus import ModbusException
+from pymodbus.client import AsyncModbusTcpClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.clivet.exceptions import (  # noqa: E402
+    REJECTED_EXCEPTION_CODES,
+    CommunicationException,
+    ErrorResponseException,
+)
+from custom_components.clivet.scanner import scan_registers  # noqa: E402
+
+
+async def main(args: argparse.Namespace) -> None:
+    client = AsyncModbusTcpClient(host=args.host, port=args.port, timeout=args.timeout)
+    if not await client.connect():
+        sys.exit(f"Could not connect to {args.host}:{args.port}")
+
+    requests = 0
+
+    async def _read(address: int, count: int) -> list[int] | None:
+        nonlocal requests
+        requests += 1
+        try:
+            result = await client.read_holding_registers(
+                address, count=count, device_id=args.slave
+            )
+        except ModbusException as e:
+            raise CommunicationException from e
+        if not result.isError():
+            return result.registers
+        if (
+            code := getattr(result, "exception_code", None)
+        ) in REJECTED_EXCEPTION_CODES:
+            return None
+        raise ErrorResponseException(f"Exception code {code}", code)
+
+    started_at = time.perf_counter()
+    result = await scan_registers(
+        _read, args.start, args.end, max_count=args.max_count, pace=args.pace
+    )
+    client.close()
+    print(
+        json.dumps(
+            {
+                "start": args.start,
+                "end": args.end,
+                "requests": requests,
+                "seconds": round(time.perf_counter() - started_at, 3),
+                "readable": result.readable,
+                "skipped": result.skipped,
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("host")
+    parser.add_argument("--port", type=int, default=502)
+    parser.add_argument("--slave", type=int, default=1)
+    parser.add_argument("--start", type=int, default=0)
+    parser.add_argument("--end", type=int, default=10000)
+    parser.add_argument("--max-count", type=int, default=125)
+    parser.add_argument("--pace", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=3.0)
+    asyncio.run(main(parser.parse_args()))
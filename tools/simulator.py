@@ -0,0 +1,573 @@
+"""Simulate a Clivet Sphera-T heat pump on a local Modbus port.
+
+Serves the holding registers of the register table over Modbus TCP, UDP or RTU
+on a serial port, and updates them over time following an operating profile:
+the compressor ramps up and down, the outdoor unit defrosts and the DHW tank is
+heated. Faults seen with real gateways can be injected: latency, lost
+responses, error responses, registers the model does not have and outages
+during which connections are dropped and nothing answers.
+
+Run from the repository root in an environment with Home Assistant installed,
+then add the integration with the printed host and port:
+
+    python tools/simulator.py --profile winter --port 5020 --speed 10
+    python tools/simulator.py --protocol rtu --pty --latency 0.02 --loss 0.01
+"""
+
+import argparse
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+import logging
+import math
+import os
+from pathlib import Path
+import random
+import sys
+import time
+import tty
+
+from pymodbus.constants import ExcCodes
+from pymodbus.datastore import (
+    ModbusDeviceContext,
+    ModbusSequentialDataBlock,
+    ModbusServerContext,
+)
+from pymodbus.server import ModbusSerialServer, ModbusTcpServer, ModbusUdpServer
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.clivet.register_map import REGISTERS  # noqa: E402
+from custom_components.clivet.registers import NO_VALUE  # noqa: E402
+
+_LOGGER = logging.getLogger(__name__)
+
+READ_HOLDING_REGISTERS = 3
+
+# Seconds of simulated time between updates of the registers
+TICK = 1.0
+
+# Compressor frequency change per second
+RAMP_RATE = 1.0
+DEFROST_DURATION = 300.0
+DEFROST_FREQUENCY = 50
+MIN_FREQUENCY = 20
+MAX_FREQUENCY = 90
+DHW_FREQUENCY = 70
+HEATING_SETPOINT = 35.0
+DHW_SETPOINT = 50.0
+DHW_BAND = 5.0
+
+# Model identification, a 7 kW monobloc
+DEVICE_SIZE = 7
+MODEL_TYPE = 3
+
+
+@dataclass(frozen=True, slots=True)
+class Profile:
+    """Operating pattern of the simulated heat pump."""
+
+    description: str
+    outdoor: float
+    heating: bool = False
+    # Seconds between DHW runs and between defrost cycles, None for never
+    dhw_interval: float | None = None
+    defrost_interval: float | None = None
+
+
+PROFILES = {
+    "idle": Profile("Standby, no demand", outdoor=15.0),
+    "heating": Profile(
+        "Space heating with defrost cycles",
+        outdoor=2.0,
+        heating=True,
+        defrost_interval=2700.0,
+    ),
+    "dhw": Profile("Regular DHW runs only", outdoor=12.0, dhw_interval=1800.0),
+    "winter": Profile(
+        "Space heating, DHW runs and frequent defrost cycles",
+        outdoor=-3.0,
+        heating=True,
+        dhw_interval=7200.0,
+        defrost_interval=2400.0,
+    ),
+}
+
+
+def _approach(value: float, target: float, tau: float, dt: float) -> float:
+    """Move a value towards a target with a first order time constant."""
+    return target + (value - target) * math.exp(-dt / tau)
+
+
+def encode_value(address: int, value: float | None) -> int:
+    """Return the raw register value of a numeric value in engineering units."""
+    if value is None:
+        return NO_VALUE
+    scale, signed = REGISTERS.encodings.get(address, (1, False))
+    raw = round(value / scale)
+    return raw & 0xFFFF if signed else max(0, min(raw, 0xFFFF))
+
+
+class HeatPumpModel:
+    """Register values of a heat pump following a profile over time."""
+
+    def __init__(self, profile: Profile, seed: int | None = None) -> None:
+        self.profile = profile
+        self._random = random.Random(seed)
+        self.elapsed = 0.0
+        self.mode = "idle"
+        self.mode_since = 0.0
+        self.frequency = 0.0
+        self.supply = self.ret = 25.0
+        self.dhw = 42.0
+        self.operating_hours = 1200.0
+        self.starts = 800
+        self._last_dhw = self._last_defrost = 0.0
+        # Control registers written by the integration
+        self.control = {2600: 0b101, 2601: 0, 2602: 0}
+
+    @property
+    def running(self) -> bool:
+        return self.frequency > 0
+
+    def _next_mode(self) -> str:
+        profile = self.profile
+        if not self.control[2600] & 1:
+            return "idle"
+        if self.mode == "defrost":
+            if self.elapsed - self.mode_since < DEFROST_DURATION:
+                return "defrost"
+            self._last_defrost = self.elapsed
+        elif (
+            profile.defrost_interval is not None
+            and self.mode == "heating"
+            and self.elapsed - self._last_defrost >= profile.defrost_interval
+        ):
+            return "defrost"
+        if self.mode == "dhw" and self.dhw < DHW_SETPOINT:
+            return "dhw"
+        if (
+            profile.dhw_interval is not None
+            and self.elapsed - self._last_dhw >= profile.dhw_interval
+            and self.dhw < DHW_SETPOINT - DHW_BAND
+        ):
+            self._last_dhw = self.elapsed
+            return "dhw"
+        return "heating" if profile.heating else "idle"
+
+    def step(self, dt: float) -> None:
+        """Advance the simulation by dt seconds."""
+        self.elapsed += dt
+        if (mode := self._next_mode()) != self.mode:
+            _LOGGER.info("%.0fs: %s -> %s", self.elapsed, self.mode, mode)
+            self.mode, self.mode_since = mode, self.elapsed
+
+        match self.mode:
+            case "heating":
+                target = max(
+                    MIN_FREQUENCY,
+                    min(MAX_FREQUENCY, 45 + 4 * (HEATING_SETPOINT - self.supply)),
+                )
+                supply = HEATING_SETPOINT + 1
+            case "dhw":
+                target, supply = DHW_FREQUENCY, DHW_SETPOINT + 5
+            case "defrost":
+                target, supply = DEFROST_FREQUENCY, 20.0
+            case _:
+                target, supply = 0, 25.0
+        was_running = self.running
+        if self.frequency < target:
+            self.frequency = min(target, self.frequency + RAMP_RATE * dt)
+        else:
+            self.frequency = max(target, self.frequency - RAMP_RATE * dt)
+        if self.running and not was_running:
+            self.starts += 1
+        if self.running:
+            self.operating_hours += dt / 3600
+
+        load = self.frequency / MAX_FREQUENCY
+        self.supply = _approach(self.supply, supply if self.running else 25.0, 300, dt)
+        self.ret = self.supply - 5 * load
+        if self.mode == "dhw":
+            self.dhw = min(DHW_SETPOINT + 1, self.dhw + 0.02 * load * dt)
+        else:
+            self.dhw = _approach(self.dhw, 20.0, 200_000, dt)
+
+    def _noise(self, value: float, sigma: float) -> float:
+        return value + self._random.gauss(0, sigma)
+
+    def registers(self) -> dict[int, int]:
+        """Return the raw values of all simulated registers."""
+        mode, frequency, running = self.mode, round(self.frequency), self.running
+        load = self.frequency / MAX_FREQUENCY
+        power = 0.2 + 2.3 * load if running else 0.0
+        flowing = running or mode == "dhw"
+        operating_mode = {"heating": 3, "defrost": 3, "dhw": 5}.get(mode, 0)
+        outdoor = self._noise(self.profile.outdoor, 0.05)
+        values: dict[int, float | None] = {
+            2614: 10,
+            2702: 5,
+            2704: 65,
+            2706: 10080,
+            2804: DHW_SETPOINT,
+            2805: 150,
+            2806: 320,
+            4200: HEATING_SETPOINT,
+            4201: HEATING_SETPOINT - self.supply,
+            4202: self.elapsed % 600,
+            4203: self.elapsed % 900,
+            4204: 0.0,
+            4205: 0.0,
+            4207: 0.0,
+            4208: 0.0,
+            4209: 0.0,
+            4210: self._noise(self.ret, 0.05),
+            4211: self._noise(self.supply, 0.05),
+            4213: outdoor,
+            4215: self._noise(self.dhw, 0.05),
+            4216: 100.0 if flowing else 0.0,
+            4219: 10 + 15 * load if running else 8.0,
+            4220: 8 - 3 * load if running else 8.0,
+            4221: 0.0,
+            4223: None,
+            4225: 100 * load,
+            4226: 100 * load,
+            4227: int(self.operating_hours),
+            4228: self.starts,
+            4235: power,
+            4236: power * 1000 / 230,
+            4237: round(self._noise(230, 1)),
+            4238: self.frequency,
+            4248: self._noise(self.ret, 0.05),
+            4249: self._noise(40 + 50 * load if running else self.supply, 0.1),
+            4252: 40 * load,
+            4262: 80 * load,
+            4266: DHW_SETPOINT,
+            4273: self._noise(20, 0.1) if flowing else 0.0,
+            4275: self._noise(12, 0.1) if mode == "dhw" else 0.0,
+            4276: 52_000 + self.elapsed / 60,
+            4300: operating_mode,
+            4301: round(self.frequency) if running else 0,
+            4302: frequency,
+            4303: operating_mode,
+            4304: 80 * load,
+            4305: self._noise(self.profile.outdoor - 5 * load, 0.05),
+            4306: outdoor,
+            4307: self._noise(40 + 50 * load if running else self.supply, 0.1),
+            4308: 0,
+            4309: round(power * 1000 / 230),
+            4310: round(self._noise(230, 1)),
+            4311: 0.0,
+            4312: DEVICE_SIZE,
+            4313: 0,
+            4315: self._noise(self.profile.outdoor - 8 * load, 0.05),
+            4316: 10 + 15 * load if running else 8.0,
+            4317: 8 - 3 * load if running else 8.0,
+            4318: MODEL_TYPE,
+            7000: MIN_FREQUENCY,
+            7001: MAX_FREQUENCY,
+            7002: frequency,
+            7003: frequency,
+            7004: frequency,
+            7005: DEFROST_FREQUENCY,
+        }
+        registers = {
+            address: encode_value(address, value) for address, value in values.items()
+        }
+        registers.update(self.control)
+        registers[2801] = 0
+        registers[2803] = 0b10 if mode == "dhw" else 0
+        registers[4222] = 0
+        registers[4263] = (
+            running
+            | (mode in ("heating", "defrost")) << 1
+            | (mode == "dhw") << 4
+            | (mode == "defrost") << 5
+            | (mode == "dhw") << 8
+        )
+        registers[4264] = (mode == "dhw") << 4 | flowing << 8
+        registers[4314] = running | (mode == "defrost") << 1
+        return registers
+
+
+@dataclass(slots=True)
+class Faults:
+    """Faults injected in the responses of the simulator."""
+
+    # Seconds added to every request, and the standard deviation around it
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Probability that a response is lost
+    loss: float = 0.0
+    # Probability that a request is answered with `error_code`
+    errors: float = 0.0
+    error_code: ExcCodes = ExcCodes.GATEWAY_NO_RESPONSE
+    # Registers answered with an illegal address error, like on other models
+    unreadable: set[int] = field(default_factory=set)
+    # Seconds between outages and how long they last, 0 for none
+    outage_interval: float = 0.0
+    outage_duration: float = 0.0
+
+
+class SimulatorDeviceContext(ModbusDeviceContext):
+    """Holding registers of the simulated heat pump, with faults injected."""
+
+    def __init__(self, model: HeatPumpModel, faults: Faults) -> None:
+        super().__init__(
+            di=ModbusSequentialDataBlock.create(),
+            co=ModbusSequentialDataBlock.create(),
+            ir=ModbusSequentialDataBlock.create(),
+            hr=ModbusSequentialDataBlock(1, [0] * 10000),
+        )
+        self.model = model
+        self.faults = faults
+        self.requests = 0
+        self.update_registers(model.registers())
+
+    def update_registers(self, registers: dict[int, int]) -> None:
+        """Write register values to the datastore."""
+        for address, value in registers.items():
+            self.setValues(READ_HOLDING_REGISTERS, address, [value])
+
+    async def _delay(self) -> None:
+        faults = self.faults
+        if faults.latency or faults.jitter:
+            await asyncio.sleep(max(0.0, random.gauss(faults.latency, faults.jitter)))
+
+    async def async_getValues(self, fc_as_hex: int, address: int, count: int = 1):
+        self.requests += 1
+        await self._delay()
+        if any(
+            register in self.faults.unreadable
+            for register in range(address, address + count)
+        ):
+            return ExcCodes.ILLEGAL_ADDRESS
+        if random.random() < self.faults.errors:
+            return self.faults.error_code
+        return self.getValues(fc_as_hex, address, count)
+
+    async def async_setValues(self, fc_as_hex: int, address: int, values):
+        self.requests += 1
+        await self._delay()
+        if random.random() < self.faults.errors:
+            return self.faults.error_code
+        result = self.setValues(fc_as_hex, address, values)
+        for offset, value in enumerate(values):
+            if address + offset in self.model.control:
+                self.model.control[address + offset] = value
+        return result
+
+
+class Simulator:
+    """Simulated heat pumps served on a Modbus port.
+
+    Several units share the port with consecutive device IDs, like heat pumps
+    behind the same gateway or on the same RS-485 bus.
+    """
+
+    def __init__(
+        self,
+        profile: Profile,
+        faults: Faults | None = None,
+        *,
+        device_id: int = 2,
+        units: int = 1,
+        speed: float = 1.0,
+        seed: int | None = None,
+    ) -> None:
+        self.faults = faults or Faults()
+        self.contexts = {
+            unit_device_id: SimulatorDeviceContext(
+                HeatPumpModel(profile, None if seed is None else seed + unit),
+                self.faults,
+            )
+            for unit, unit_device_id in enumerate(range(device_id, device_id + units))
+        }
+        self.speed = speed
+        self.server: ModbusTcpServer | ModbusUdpServer | ModbusSerialServer | None = (
+            None
+        )
+        self.lost = 0
+        self._outage_until = 0.0
+        self._tasks: list[asyncio.Task] = []
+
+    def _trace_packet(self, sending: bool, data: bytes) -> bytes:
+        """Drop responses that are lost, or sent during an outage."""
+        if not sending:
+            return data
+        if time.monotonic() < self._outage_until or random.random() < self.faults.loss:
+            self.lost += 1
+            return b""
+        return data
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests answered or dropped so far."""
+        return sum(context.requests for context in self.contexts.values())
+
+    async def start(
+        self, protocol: str, *, host: str = "127.0.0.1", port: int | str = 5020
+    ) -> None:
+        """Start serving on a TCP or UDP port, or on a serial port for RTU."""
+        context = ModbusServerContext(devices=self.contexts, single=False)
+        match protocol:
+            case "tcp":
+                self.server = ModbusTcpServer(
+                    context, address=(host, port), trace_packet=self._trace_packet
+                )
+            case "udp":
+                self.server = ModbusUdpServer(
+                    context, address=(host, port), trace_packet=self._trace_packet
+                )
+            case "rtu":
+                self.server = ModbusSerialServer(
+                    context, port=port, baudrate=9600, trace_packet=self._trace_packet
+                )
+            case _:
+                raise ValueError(f"Unknown protocol {protocol}")
+        await self.server.serve_forever(background=True)
+        self._tasks.append(asyncio.create_task(self._run_model()))
+        if self.faults.outage_interval:
+            self._tasks.append(asyncio.create_task(self._run_outages()))
+
+    async def stop(self) -> None:
+        """Stop serving and updating the registers."""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        if self.server is not None:
+            await self.server.shutdown()
+            self.server = None
+
+    async def _run_model(self) -> None:
+        while True:
+            await asyncio.sleep(TICK / self.speed)
+            for context in self.contexts.values():
+                context.model.step(TICK)
+                context.update_registers(context.model.registers())
+
+    async def _run_outages(self) -> None:
+        while True:
+            await asyncio.sleep(self.faults.outage_interval)
+            _LOGGER.info("Outage for %ss", self.faults.outage_duration)
+            self._outage_until = time.monotonic() + self.faults.outage_duration
+            if self.server is not None:
+                for connection in list(self.server.active_connections.values()):
+                    connection.close()
+
+
+@asynccontextmanager
+async def pty_pair() -> AsyncIterator[tuple[str, str]]:
+    """Create two pseudo terminals connected like a null modem cable.
+
+    Yields the paths of both ends, one for the simulator and one for the
+    client.
+    """
+    loop = asyncio.get_running_loop()
+    ends = [os.openpty() for _ in range(2)]
+    for _, follower in ends:
+        tty.setraw(follower)
+
+    def _forward(source: int, target: int) -> None:
+        try:
+            os.write(target, os.read(source, 4096))
+        except OSError:
+            pass
+
+    (first, _), (second, _) = ends
+    loop.add_reader(first, _forward, first, second)
+    loop.add_reader(second, _forward, second, first)
+    try:
+        yield os.ttyname(ends[0][1]), os.ttyname(ends[1][1])
+    finally:
+        loop.remove_reader(first)
+        loop.remove_reader(second)
+        for descriptors in ends:
+            for descriptor in descriptors:
+                os.close(descriptor)
+
+
+def _parse_addresses(values: Iterable[str]) -> set[int]:
+    """Parse addresses and inclusive ranges like 4221-4225."""
+    addresses: set[int] = set()
+    for value in values:
+        start, _, end = value.partition("-")
+        addresses.update(range(int(start), int(end or start) + 1))
+    return addresses
+
+
+async def serve(
+    simulator: Simulator, args: argparse.Namespace, port: int | str, shown: str
+) -> None:
+    """Serve until interrupted."""
+    await simulator.start(args.protocol, host=args.host, port=port)
+    print(
+        f"Simulating '{args.profile}' over {args.protocol} on {shown}, "
+        f"slaves {', '.join(map(str, simulator.contexts))}"
+    )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+
+async def main(args: argparse.Namespace) -> None:
+    faults = Faults(
+        latency=args.latency,
+        jitter=args.jitter,
+        loss=args.loss,
+        errors=args.errors,
+        unreadable=_parse_addresses(args.unreadable),
+        outage_interval=args.outage_interval,
+        outage_duration=args.outage_duration,
+    )
+    simulator = Simulator(
+        PROFILES[args.profile],
+        faults,
+        device_id=args.slave,
+        units=args.units,
+        speed=args.speed,
+        seed=args.seed,
+    )
+    if not args.pty:
+        await serve(simulator, args, args.port, f"{args.host}:{args.port}")
+        return
+    async with pty_pair() as (port, client_port):
+        await serve(simulator, args, port, client_port)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", choices=PROFILES, default="heating")
+    parser.add_argument("--protocol", choices=("tcp", "udp", "rtu"), default="tcp")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", default=5020, help="TCP/UDP port or serial port")
+    parser.add_argument(
+        "--pty", action="store_true", help="serve RTU on a new pseudo terminal pair"
+    )
+    parser.add_argument("--slave", type=int, default=2)
+    parser.add_argument(
+        "--units", type=int, default=1, help="heat pumps with consecutive slave IDs"
+    )
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="simulated seconds per second"
+    )
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--loss", type=float, default=0.0)
+    parser.add_argument("--errors", type=float, default=0.0)
+    parser.add_argument(
+        "--unreadable", nargs="*", default=[], help="addresses or ranges like 4221-4225"
+    )
+    parser.add_argument("--outage-interval", type=float, default=0.0)
+    parser.add_argument("--outage-duration", type=float, default=10.0)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    if args.pty:
+        args.protocol = "rtu"
+    elif args.protocol != "rtu":
+        args.port = int(args.port)
+    asyncio.run(main(args))